@@ -0,0 +1,55 @@
+import logging
+from typing import List, Optional
+
+from rabbitmqbaselibrary.aio.client import AsyncBrokerClient
+from rabbitmqbaselibrary.bindings.bindings import BINDING_COLUMNS, Binding, BindingIndex
+from rabbitmqbaselibrary.common.handlers import handle_rest_response, handle_rest_response_with_body
+from rabbitmqbaselibrary.common.listing import listing_params
+
+
+async def create_binding(broker: AsyncBrokerClient, vhost: str, binding: Binding) -> None:
+    url = 'https://{}/api/bindings/{}/{}'.format(broker['host'], vhost, binding.path())
+    body = binding.body()
+    response = await broker.request('POST', url, json=body)
+    handle_rest_response_with_body(response=response, url=url, body=body)
+
+
+async def delete_binding(broker: AsyncBrokerClient, vhost: str, binding: Binding) -> None:
+    url = 'https://{}/api/bindings/{}/{}/{}'.format(broker['host'], vhost, binding.path(), binding.properties_key)
+    response = await broker.request('DELETE', url)
+    handle_rest_response(response=response, url=url)
+
+
+async def is_present(broker: AsyncBrokerClient, vhost: str, binding: Binding,
+                     index: Optional[BindingIndex] = None) -> bool:
+    if index is not None:
+        return binding in index
+    existing = await get_bindings_from_source(broker=broker, vhost=vhost, source=binding.source)
+    return any(it.equals(binding) for it in existing)
+
+
+async def get_bindings_from_source(broker: AsyncBrokerClient, vhost: str, source: str) -> List[Binding]:
+    url = 'https://{}/api/exchanges/{}/{}/bindings/source'.format(broker['host'], vhost, source)
+    response = await broker.request('GET', url, params=listing_params(BINDING_COLUMNS, disable_stats=False))
+    handle_rest_response(response=response, url=url)
+    return [Binding(i) for i in response.json()]
+
+
+async def get_bindings(broker: AsyncBrokerClient, vhost: str) -> List[Binding]:
+    url = 'https://{}/api/bindings/{}'.format(broker['host'], vhost)
+    response = await broker.request('GET', url, params=listing_params(BINDING_COLUMNS, disable_stats=False))
+    handle_rest_response(response=response, url=url)
+    return [Binding(i) for i in response.json()]
+
+
+async def safe_create_binding(broker: AsyncBrokerClient, vhost: str, binding: Binding,
+                              index: Optional[BindingIndex] = None) -> None:
+    if not await is_present(broker=broker, vhost=vhost, binding=binding, index=index):
+        await create_binding(broker=broker, vhost=vhost, binding=binding)
+        if index is not None:
+            index.add(binding)
+    else:
+        logging.debug(
+            'binding between {} and {} already existing, skipping'.format(
+                binding.source, binding.destination)
+        )
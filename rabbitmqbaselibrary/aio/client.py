@@ -0,0 +1,94 @@
+import asyncio
+import time
+from typing import Any, Optional
+
+import aiohttp
+import requests
+
+from rabbitmqbaselibrary.common.throttling import RETRYABLE_STATUS, AsyncAdaptiveLimiter, RetryPolicy
+
+
+class AsyncBrokerClient(dict):
+    """Broker dict owning a pooled aiohttp session; ``concurrency`` caps the requests in flight.
+
+    An optional ``limiter`` adapts the requests in flight below that cap to how the broker copes.
+
+    Responses are read fully and handed back as requests.Response objects, so the coroutines
+    raise exactly the exceptions of common.handlers.
+    """
+
+    def __init__(self, broker: dict, concurrency: int = 10, pool_size: int = 100, timeout: Optional[float] = None,
+                 retry: Optional[RetryPolicy] = None, limiter: Optional[AsyncAdaptiveLimiter] = None):
+        super().__init__(broker)
+        self.retry = retry
+        self.limiter = limiter
+        self.concurrency = concurrency
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.__semaphore: Optional[asyncio.Semaphore] = None
+
+    async def request(self, method: str, url: str, params: Optional[dict] = None,
+                      json: Optional[object] = None) -> requests.Response:
+        attempt = 0
+        while True:
+            try:
+                response = await self.__send(method, url, params=params, json=json)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if self.retry is None or not self.retry.can_retry(method=method, attempt=attempt):
+                    raise
+            else:
+                if self.retry is None or not self.retry.should_retry(method, attempt, response.status_code):
+                    return response
+            await asyncio.sleep(self.retry.delay(attempt))
+            attempt += 1
+
+    async def __send(self, method: str, url: str, params: Optional[dict], json: Optional[object]) -> requests.Response:
+        if self.limiter is None:
+            return await self.__read(method, url, params=params, json=json)
+        await self.limiter.acquire()
+        start = time.monotonic()
+        failed = True
+        try:
+            response = await self.__read(method, url, params=params, json=json)
+            failed = response.status_code in RETRYABLE_STATUS
+            return response
+        finally:
+            await self.limiter.release(latency=time.monotonic() - start, failed=failed, url=url)
+
+    async def __read(self, method: str, url: str, params: Optional[dict], json: Optional[object]) -> requests.Response:
+        session = self.__session()
+        query = None if params is None else {k: str(v) for k, v in params.items()}
+        async with self.__limit():
+            async with session.request(method, url, params=query, json=json) as response:
+                result = requests.Response()
+                result.status_code = response.status
+                result.reason = response.reason or ''
+                result.url = str(response.url)
+                result.encoding = response.charset
+                result._content = await response.read()
+                return result
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self) -> 'AsyncBrokerClient':
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    def __limit(self) -> asyncio.Semaphore:
+        if self.__semaphore is None:
+            self.__semaphore = asyncio.Semaphore(self.concurrency)
+        return self.__semaphore
+
+    def __session(self) -> aiohttp.ClientSession:
+        if self.session is None:
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            self.session = aiohttp.ClientSession(auth=aiohttp.BasicAuth(self['user'], self['passwd']),
+                                                 connector=aiohttp.TCPConnector(limit=self.pool_size),
+                                                 timeout=timeout)
+        return self.session
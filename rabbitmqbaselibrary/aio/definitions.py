@@ -0,0 +1,15 @@
+from rabbitmqbaselibrary.aio.client import AsyncBrokerClient
+from rabbitmqbaselibrary.common.handlers import handle_rest_response, handle_rest_response_with_body
+
+
+async def get_definitions(broker: AsyncBrokerClient, vhost: str) -> dict:
+    url = 'https://{}/api/definitions/{}'.format(broker['host'], vhost)
+    response = await broker.request('GET', url)
+    handle_rest_response(response, url)
+    return response.json()
+
+
+async def load_definitions(broker: AsyncBrokerClient, vhost: str, definitions: dict) -> None:
+    url = 'https://{}/api/definitions/{}'.format(broker['host'], vhost)
+    response = await broker.request('POST', url, json=definitions)
+    handle_rest_response_with_body(response, url, definitions)
@@ -0,0 +1,50 @@
+from typing import List, Optional
+
+from rabbitmqbaselibrary.aio.client import AsyncBrokerClient
+from rabbitmqbaselibrary.common.exceptions import NotFoundException
+from rabbitmqbaselibrary.common.handlers import handle_rest_response, handle_rest_response_with_body
+from rabbitmqbaselibrary.common.listing import listing_params, to_record
+from rabbitmqbaselibrary.exchanges.exchanges import ExchangeRecord
+
+
+async def is_present(broker: AsyncBrokerClient, vhost: str, name: str) -> bool:
+    try:
+        await get_exchange_by_name(broker=broker, vhost=vhost, name=name, columns=['name'])
+        return True
+    except NotFoundException:
+        return False
+
+
+async def get_exchange_by_name(broker: AsyncBrokerClient, vhost: str, name: str,
+                               columns: Optional[List[str]] = None) -> dict:
+    url = 'https://{}/api/exchanges/{}/{}'.format(broker['host'], vhost, name)
+    params = None if columns is None else {'columns': ','.join(columns)}
+    response = await broker.request('GET', url, params=params)
+    handle_rest_response(response=response, url=url)
+    return response.json()
+
+
+async def get_exchanges(broker: AsyncBrokerClient, vhost: str) -> List[str]:
+    url = 'https://{}/api/exchanges/{}'.format(broker['host'], vhost)
+    response = await broker.request('GET', url, params=listing_params(['name']))
+    handle_rest_response(response=response, url=url)
+    return [i['name'] for i in response.json()]
+
+
+async def list_exchanges(broker: AsyncBrokerClient, vhost: str) -> List[ExchangeRecord]:
+    url = 'https://{}/api/exchanges/{}'.format(broker['host'], vhost)
+    response = await broker.request('GET', url, params=listing_params(ExchangeRecord._fields))
+    handle_rest_response(response=response, url=url)
+    return [to_record(ExchangeRecord, i) for i in response.json()]
+
+
+async def create_exchange(broker: AsyncBrokerClient, vhost: str, name: str, exchange: dict) -> None:
+    url = 'https://{}/api/exchanges/{}/{}'.format(broker['host'], vhost, name)
+    response = await broker.request('PUT', url, json=exchange)
+    handle_rest_response_with_body(response=response, url=url, body=exchange)
+
+
+async def delete_exchange(broker: AsyncBrokerClient, vhost: str, name: str) -> None:
+    url = 'https://{}/api/exchanges/{}/{}'.format(broker['host'], vhost, name)
+    response = await broker.request('DELETE', url)
+    handle_rest_response(response=response, url=url)
@@ -0,0 +1,41 @@
+from typing import List, Optional
+
+from rabbitmqbaselibrary.aio.client import AsyncBrokerClient
+from rabbitmqbaselibrary.common.exceptions import NotFoundException
+from rabbitmqbaselibrary.common.handlers import handle_rest_response, handle_rest_response_with_body
+
+
+async def is_present(broker: AsyncBrokerClient, vhost: str, name: str) -> bool:
+    try:
+        await get_policy_by_name(broker=broker, vhost=vhost, name=name, columns=['name'])
+        return True
+    except NotFoundException:
+        return False
+
+
+async def get_policy_by_name(broker: AsyncBrokerClient, vhost: str, name: str,
+                             columns: Optional[List[str]] = None) -> dict:
+    url = 'https://{}/api/policies/{}/{}'.format(broker['host'], vhost, name)
+    params = None if columns is None else {'columns': ','.join(columns)}
+    response = await broker.request('GET', url, params=params)
+    handle_rest_response(response=response, url=url)
+    return response.json()
+
+
+async def get_policies(broker: AsyncBrokerClient, vhost: str) -> List[str]:
+    url = 'https://{}/api/policies/{}'.format(broker['host'], vhost)
+    response = await broker.request('GET', url)
+    handle_rest_response(response=response, url=url)
+    return [i['name'] for i in response.json()]
+
+
+async def create_policy(broker: AsyncBrokerClient, vhost: str, name: str, policy: dict) -> None:
+    url = 'https://{}/api/policies/{}/{}'.format(broker['host'], vhost, name)
+    response = await broker.request('PUT', url, json=policy)
+    handle_rest_response_with_body(response=response, body=policy, url=url)
+
+
+async def delete_policy(broker: AsyncBrokerClient, vhost: str, name: str) -> None:
+    url = 'https://{}/api/policies/{}/{}'.format(broker['host'], vhost, name)
+    response = await broker.request('DELETE', url)
+    handle_rest_response(response=response, url=url)
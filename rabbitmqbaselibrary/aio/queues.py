@@ -0,0 +1,50 @@
+from typing import List, Optional
+
+from rabbitmqbaselibrary.aio.client import AsyncBrokerClient
+from rabbitmqbaselibrary.common.exceptions import NotFoundException
+from rabbitmqbaselibrary.common.handlers import handle_rest_response, handle_rest_response_with_body
+from rabbitmqbaselibrary.common.listing import listing_params, to_record
+from rabbitmqbaselibrary.queues.queues import QueueRecord
+
+
+async def is_present(broker: AsyncBrokerClient, vhost: str, name: str) -> bool:
+    try:
+        await get_queue_by_name(broker=broker, vhost=vhost, name=name, columns=['name'])
+        return True
+    except NotFoundException:
+        return False
+
+
+async def get_queue_by_name(broker: AsyncBrokerClient, vhost: str, name: str,
+                            columns: Optional[List[str]] = None) -> dict:
+    url = 'https://{}/api/queues/{}/{}'.format(broker['host'], vhost, name)
+    params = None if columns is None else {'columns': ','.join(columns)}
+    response = await broker.request('GET', url, params=params)
+    handle_rest_response(response=response, url=url)
+    return response.json()
+
+
+async def get_queues(broker: AsyncBrokerClient, vhost: str) -> List[str]:
+    url = 'https://{}/api/queues/{}'.format(broker['host'], vhost)
+    response = await broker.request('GET', url, params=listing_params(['name']))
+    handle_rest_response(response=response, url=url)
+    return [i['name'] for i in response.json()]
+
+
+async def list_queues(broker: AsyncBrokerClient, vhost: str) -> List[QueueRecord]:
+    url = 'https://{}/api/queues/{}'.format(broker['host'], vhost)
+    response = await broker.request('GET', url, params=listing_params(QueueRecord._fields, queue_totals=True))
+    handle_rest_response(response=response, url=url)
+    return [to_record(QueueRecord, i) for i in response.json()]
+
+
+async def create_queue(broker: AsyncBrokerClient, vhost: str, name: str, queue: dict) -> None:
+    url = 'https://{}/api/queues/{}/{}'.format(broker['host'], vhost, name)
+    response = await broker.request('PUT', url, json=queue)
+    handle_rest_response_with_body(response=response, url=url, body=queue)
+
+
+async def delete_queue(broker: AsyncBrokerClient, vhost: str, name: str) -> None:
+    url = 'https://{}/api/queues/{}/{}'.format(broker['host'], vhost, name)
+    response = await broker.request('DELETE', url)
+    handle_rest_response(response=response, url=url)
@@ -0,0 +1,76 @@
+from typing import Any, List
+
+from pyramda import keys
+
+from rabbitmqbaselibrary.aio.client import AsyncBrokerClient
+from rabbitmqbaselibrary.common.exceptions import NotValidPermissions, NotFoundException, UserAlreadyExists
+from rabbitmqbaselibrary.common.handlers import handle_rest_response_with_body, handle_rest_response
+from rabbitmqbaselibrary.common.listing import listing_params
+from rabbitmqbaselibrary.users.users import autogenerate_password, salt_hashing_passwd
+
+
+async def is_present(broker: AsyncBrokerClient, name: str) -> bool:
+    try:
+        result = await get_user_by_name(broker=broker, name=name)
+        return True if result.get('name') == name else False
+    except NotFoundException:
+        return False
+
+
+async def get_user_by_name(broker: AsyncBrokerClient, name: str) -> dict:
+    url = 'https://{}/api/users/{}'.format(broker['host'], name)
+    response = await broker.request('GET', url)
+    handle_rest_response(response=response, url=url)
+    return response.json()
+
+
+async def get_users(broker: AsyncBrokerClient) -> List[str]:
+    url = 'https://{}/api/users'.format(broker['host'])
+    response = await broker.request('GET', url, params=listing_params(['name'], disable_stats=False))
+    handle_rest_response(response=response, url=url)
+    return [i['name'] for i in response.json()]
+
+
+async def create_user(broker: AsyncBrokerClient, name: str, pass_flag: bool, **kwargs: Any) -> str:
+    passwd: str = autogenerate_password() if pass_flag is True else str(kwargs.get('password'))
+    url = 'https://{}/api/users/{}'.format(broker['host'], name)
+    tags = '' if kwargs.get('tags') is None else kwargs.get('tags')
+    body = {'password_hash': salt_hashing_passwd(passwd=passwd), 'tags': tags}
+    response = await broker.request('PUT', url, json=body)
+    handle_rest_response_with_body(response=response, url=url, body=body)
+    return passwd
+
+
+async def delete_user(broker: AsyncBrokerClient, name: str) -> None:
+    url = 'https://{}/api/users/{}'.format(broker['host'], name)
+    response = await broker.request('DELETE', url)
+    handle_rest_response(response=response, url=url)
+
+
+async def add_permissions(broker: AsyncBrokerClient, vhost: str, user: str, permissions: dict) -> None:
+    kk = keys(permissions)
+    if not ('write' in kk and 'read' in kk and 'configure' in kk):
+        raise NotValidPermissions('permissions are not complete', permissions)
+    url = 'https://{}/api/permissions/{}/{}'.format(broker['host'], vhost, user)
+    response = await broker.request('PUT', url, json=permissions)
+    handle_rest_response_with_body(response=response, url=url, body=permissions)
+
+
+async def delete_permissions(broker: AsyncBrokerClient, vhost: str, user: str) -> None:
+    url = 'https://{}/api/permissions/{}/{}'.format(broker['host'], vhost, user)
+    response = await broker.request('DELETE', url)
+    handle_rest_response(response=response, url=url)
+
+
+async def get_permissions(broker: AsyncBrokerClient, vhost: str, user: str) -> dict:
+    url = 'https://{}/api/permissions/{}/{}'.format(broker['host'], vhost, user)
+    response = await broker.request('GET', url)
+    handle_rest_response(response=response, url=url)
+    return response.json()
+
+
+async def safe_create_user(broker: AsyncBrokerClient, name: str, pass_flag: bool, **kwargs: Any) -> str:
+    if not await is_present(broker=broker, name=name):
+        return await create_user(broker=broker, name=name, pass_flag=pass_flag, **kwargs)
+    else:
+        raise UserAlreadyExists(user=name)
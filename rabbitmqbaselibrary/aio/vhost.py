@@ -0,0 +1,46 @@
+from typing import List, Optional
+
+from rabbitmqbaselibrary.aio.client import AsyncBrokerClient
+from rabbitmqbaselibrary.common.exceptions import ServerErrorException, VhostNotFound, VhostAlreadyExists, \
+    NotFoundException
+from rabbitmqbaselibrary.common.handlers import handle_rest_response
+
+
+async def is_present(broker: AsyncBrokerClient, vhost: str) -> bool:
+    try:
+        await get_vhost_by_name(broker=broker, vhost=vhost, columns=['name'])
+        return True
+    except NotFoundException:
+        return False
+
+
+async def get_vhost_by_name(broker: AsyncBrokerClient, vhost: str, columns: Optional[List[str]] = None) -> dict:
+    url = 'https://{}/api/vhosts/{}'.format(broker['host'], vhost)
+    params = None if columns is None else {'columns': ','.join(columns)}
+    response = await broker.request('GET', url, params=params)
+    handle_rest_response(response=response, url=url)
+    return response.json()
+
+
+async def get_vhosts(broker: AsyncBrokerClient) -> List[str]:
+    url = 'https://{}/api/vhosts'.format(broker['host'])
+    response = await broker.request('GET', url)
+    if not response.ok:
+        raise ServerErrorException(str(response.status_code), url=url)
+    return [i['name'] for i in response.json()]
+
+
+async def create_vhost(broker: AsyncBrokerClient, vhost: str) -> None:
+    if await is_present(broker=broker, vhost=vhost):
+        raise VhostAlreadyExists(vhost)
+    url = 'https://{}/api/vhosts/{}'.format(broker['host'], vhost)
+    response = await broker.request('PUT', url)
+    handle_rest_response(response=response, url=url)
+
+
+async def delete_vhost(broker: AsyncBrokerClient, vhost: str) -> None:
+    if not await is_present(broker=broker, vhost=vhost):
+        raise VhostNotFound(vhost)
+    url = 'https://{}/api/vhosts/{}'.format(broker['host'], vhost)
+    response = await broker.request('DELETE', url)
+    handle_rest_response(response=response, url=url)
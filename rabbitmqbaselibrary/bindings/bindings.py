@@ -1,13 +1,20 @@
 import logging
-from typing import List, Text
+from typing import Iterable, Iterator, List, Optional, Set, Text
 
-import requests
 from pyramda import map
 
+from rabbitmqbaselibrary.common.client import get_json, http, invalidate
 from rabbitmqbaselibrary.common.handlers import handle_rest_response, handle_rest_response_with_body
+from rabbitmqbaselibrary.common.keys import freeze
+from rabbitmqbaselibrary.common.listing import listing_params
+from rabbitmqbaselibrary.common.pagination import iter_listing
+from rabbitmqbaselibrary.common.snapshot import TopologySnapshot
+
+BINDING_COLUMNS = ['source', 'destination', 'destination_type', 'routing_key', 'arguments', 'properties_key']
 
 
 class Binding(object):
+    __slots__ = ('source', 'destination', 'destination_type', 'routing_key', 'arguments', 'properties_key')
 
     def __init__(self, obj: dict):
         self.source: Text = str(obj.get('source'))
@@ -36,56 +43,124 @@ class Binding(object):
         binding_type = 'e' if self.destination_type == 'exchange' else 'q'
         return 'e/{}/{}/{}'.format(self.source, binding_type, self.destination)
 
+    def key(self) -> tuple:
+        # the API lists bindings without arguments as {}, definitions files may omit them
+        return self.source, self.destination, self.destination_type, self.routing_key, freeze(self.arguments or {})
+
     def equals(self, other: object) -> bool:
         if not isinstance(other, Binding):
             return NotImplemented
-        return self.source == other.source and self.destination == other.destination \
-               and self.routing_key == other.routing_key and self.destination_type == other.destination_type \
-               and self.arguments == other.arguments  # noqa: E127
+        return self.key() == other.key()
+
+    def __eq__(self, other: object) -> bool:
+        return self.equals(other)
+
+    def __hash__(self) -> int:
+        return hash(self.key())
+
+
+class BindingIndex(object):
+    """Set of binding keys answering membership in O(1), usually built from a single get_bindings call."""
+
+    def __init__(self, bindings: Iterable[Binding]):
+        self.__keys: Set[tuple] = set(b.key() for b in bindings)
+
+    def __contains__(self, binding: object) -> bool:
+        return isinstance(binding, Binding) and binding.key() in self.__keys
+
+    def __len__(self) -> int:
+        return len(self.__keys)
+
+    def add(self, binding: Binding) -> None:
+        self.__keys.add(binding.key())
+
+    def discard(self, binding: Binding) -> None:
+        self.__keys.discard(binding.key())
 
 
 def create_binding(broker: dict, vhost: str, binding: Binding) -> None:
     url = 'https://{}/api/bindings/{}/{}'.format(broker['host'], vhost, binding.path())
     body = binding.body()
-    response = requests.post(url=url, auth=(broker['user'], broker['passwd']), json=body)
+    response = http(broker).post(url=url, auth=(broker['user'], broker['passwd']), json=body)
     handle_rest_response_with_body(response=response, url=url, body=body)
+    invalidate(broker, *_cached_urls(broker=broker, vhost=vhost, binding=binding))
 
 
 def delete_binding(broker: dict, vhost: str, binding: Binding) -> None:
     url = 'https://{}/api/bindings/{}/{}/{}'.format(broker['host'],
                                                     vhost, binding.path(), binding.properties_key)
-    response = requests.delete(url=url, auth=(broker['user'], broker['passwd']))
+    response = http(broker).delete(url=url, auth=(broker['user'], broker['passwd']))
     handle_rest_response(response=response, url=url)
+    invalidate(broker, *_cached_urls(broker=broker, vhost=vhost, binding=binding))
 
 
-def is_present(broker: dict, vhost: str, binding: Binding) -> bool:
+def is_present(broker: dict, vhost: str, binding: Binding, index: Optional[BindingIndex] = None,
+               snapshot: Optional[TopologySnapshot] = None) -> bool:
+    if snapshot is not None:
+        return snapshot.contains('bindings', dict(binding.to_dict(), vhost=vhost))
+    if index is not None:
+        return binding in index
     existing: List[Binding] = get_bindings_from_source(broker=broker, vhost=vhost, source=binding.source)
-    result: bool = False
-    for it in existing:
-        result = True if it.equals(binding) else result
-    return result
+    return any(it.equals(binding) for it in existing)
 
 
 def get_bindings_from_source(broker: dict, vhost: str, source: str) -> List[Binding]:
     url = 'https://{}/api/exchanges/{}/{}/bindings/source'.format(broker['host'], vhost, source)
-    response = requests.get(url=url, auth=(broker['user'], broker['passwd']))
-    handle_rest_response(response=response, url=url)
-    return map(lambda i: Binding(i), response.json())
+    params = listing_params(BINDING_COLUMNS, disable_stats=False)
+    return map(lambda i: Binding(i), get_json(broker=broker, url=url, params=params))
 
 
 # noinspection PyDeepBugsSwappedArgs,PyDeepBugsSwappedArgs
 def get_bindings(broker: dict, vhost: str) -> List[Binding]:
     url = 'https://{}/api/bindings/{}'.format(broker['host'], vhost)
-    response = requests.get(url=url, auth=(broker['user'], broker['passwd']))
-    handle_rest_response(response=response, url=url)
-    return map(lambda i: Binding(i), response.json())
+    params = listing_params(BINDING_COLUMNS, disable_stats=False)
+    return map(lambda i: Binding(i), get_json(broker=broker, url=url, params=params))
+
+
+def iter_bindings(broker: dict, vhost: str) -> Iterator[Binding]:
+    url = 'https://{}/api/bindings/{}'.format(broker['host'], vhost)
+    for item in iter_listing(broker=broker, url=url, params=listing_params(BINDING_COLUMNS, disable_stats=False)):
+        yield Binding(item)
 
 
-def safe_create_binding(broker: dict, vhost: str, binding: Binding) -> None:
-    if not is_present(broker=broker, vhost=vhost, binding=binding):
+def get_binding_index(broker: dict, vhost: str) -> BindingIndex:
+    return BindingIndex(iter_bindings(broker=broker, vhost=vhost))
+
+
+def safe_create_binding(broker: dict, vhost: str, binding: Binding, index: Optional[BindingIndex] = None,
+                        snapshot: Optional[TopologySnapshot] = None) -> None:
+    if not is_present(broker=broker, vhost=vhost, binding=binding, index=index, snapshot=snapshot):
         create_binding(broker=broker, vhost=vhost, binding=binding)
+        if index is not None:
+            index.add(binding)
+        if snapshot is not None:
+            snapshot.add('bindings', dict(binding.to_dict(), vhost=vhost))
     else:
         logging.debug(
             'binding between {} and {} already existing, skipping'.format(
                 binding.source, binding.destination)
         )
+
+
+def safe_create_bindings(broker: dict, vhost: str, bindings: Iterable[Binding], index: Optional[BindingIndex] = None,
+                         snapshot: Optional[TopologySnapshot] = None) -> List[Binding]:
+    if snapshot is None and index is None:
+        index = get_binding_index(broker=broker, vhost=vhost)
+    created: List[Binding] = []
+    for binding in bindings:
+        if is_present(broker=broker, vhost=vhost, binding=binding, index=index, snapshot=snapshot):
+            continue
+        create_binding(broker=broker, vhost=vhost, binding=binding)
+        if index is not None:
+            index.add(binding)
+        if snapshot is not None:
+            snapshot.add('bindings', dict(binding.to_dict(), vhost=vhost))
+        created.append(binding)
+    logging.debug('{} bindings created in {}'.format(len(created), vhost))
+    return created
+
+
+def _cached_urls(broker: dict, vhost: str, binding: Binding) -> List[str]:
+    return ['https://{}/api/bindings/{}'.format(broker['host'], vhost),
+            'https://{}/api/exchanges/{}/{}/bindings'.format(broker['host'], vhost, binding.source),
+            'https://{}/api/definitions/{}'.format(broker['host'], vhost)]
@@ -0,0 +1,83 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from rabbitmqbaselibrary.bindings.bindings import Binding, create_binding, delete_binding
+from rabbitmqbaselibrary.exchanges.exchanges import create_exchange, delete_exchange
+from rabbitmqbaselibrary.queues.queues import create_queue, delete_queue
+
+MAX_WORKERS = 8
+
+
+class ItemResult(NamedTuple):
+    kind: str
+    name: str
+    error: Optional[Exception]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+Task = Tuple[str, str, Callable[[], Any]]
+
+
+def apply_bulk(broker: dict, vhost: str, queues: Optional[Mapping[str, dict]] = None,
+               exchanges: Optional[Mapping[str, dict]] = None, bindings: Optional[Iterable[Binding]] = None,
+               max_workers: int = MAX_WORKERS) -> List[ItemResult]:
+    """Create exchanges and queues concurrently, then the bindings between them.
+
+    Every item gets its own result; a failure never stops the rest of the batch. Pass a
+    BrokerClient with ``pool_maxsize >= max_workers`` so the workers share warm connections.
+    """
+    entities: List[Task] = []
+    for name, exchange in (exchanges or {}).items():
+        entities.append(('exchange', name, _call(create_exchange, broker=broker, vhost=vhost, name=name,
+                                                 exchange=exchange)))
+    for name, queue in (queues or {}).items():
+        entities.append(('queue', name, _call(create_queue, broker=broker, vhost=vhost, name=name, queue=queue)))
+    links: List[Task] = [('binding', _binding_name(b), _call(create_binding, broker=broker, vhost=vhost, binding=b))
+                         for b in bindings or []]
+    return _run_phases([entities, links], max_workers=max_workers)
+
+
+def remove_bulk(broker: dict, vhost: str, queues: Optional[Iterable[str]] = None,
+                exchanges: Optional[Iterable[str]] = None, bindings: Optional[Iterable[Binding]] = None,
+                max_workers: int = MAX_WORKERS) -> List[ItemResult]:
+    """Delete bindings first, then queues and exchanges concurrently, collecting a result per item."""
+    links: List[Task] = [('binding', _binding_name(b), _call(delete_binding, broker=broker, vhost=vhost, binding=b))
+                         for b in bindings or []]
+    entities: List[Task] = []
+    for name in exchanges or []:
+        entities.append(('exchange', name, _call(delete_exchange, broker=broker, vhost=vhost, name=name)))
+    for name in queues or []:
+        entities.append(('queue', name, _call(delete_queue, broker=broker, vhost=vhost, name=name)))
+    return _run_phases([links, entities], max_workers=max_workers)
+
+
+def _run_phases(phases: List[List[Task]], max_workers: int) -> List[ItemResult]:
+    results: List[ItemResult] = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for phase in phases:
+            results.extend(executor.map(_execute, phase))
+    failed = len([r for r in results if not r.ok])
+    logging.info('bulk operation finished: {} items, {} failed'.format(len(results), failed))
+    return results
+
+
+def _execute(task: Task) -> ItemResult:
+    kind, name, action = task
+    try:
+        action()
+        return ItemResult(kind=kind, name=name, error=None)
+    except Exception as e:
+        logging.debug('bulk {} {} failed: {}'.format(kind, name, e))
+        return ItemResult(kind=kind, name=name, error=e)
+
+
+def _call(func: Callable[..., Any], **kwargs: Any) -> Callable[[], Any]:
+    return lambda: func(**kwargs)
+
+
+def _binding_name(binding: Binding) -> str:
+    return '{}->{}'.format(binding.source, binding.destination)
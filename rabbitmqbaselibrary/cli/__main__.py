@@ -0,0 +1,5 @@
+import sys
+
+from rabbitmqbaselibrary.cli.cli import main
+
+sys.exit(main())
@@ -0,0 +1,94 @@
+import argparse
+import json
+import logging
+import sys
+from typing import Callable, Dict, List, Optional, TextIO
+
+from rabbitmqbaselibrary.common.client import BrokerClient
+from rabbitmqbaselibrary.common.config import Config
+from rabbitmqbaselibrary.common.environments import Environments
+from rabbitmqbaselibrary.common.keys import RESOURCE_CLASSES
+from rabbitmqbaselibrary.diff.diff import ADDED, REMOVED, Entry, compare
+from rabbitmqbaselibrary.export.export import MAX_WORKERS, export_dir, export_vhosts, restore_vhost
+
+MARKS = {ADDED: '+', REMOVED: '-'}
+
+
+def diff_command(args: argparse.Namespace, out: TextIO) -> int:
+    envs = Environments(args.environments)
+    entries = compare(left_broker=envs.get_env(args.left), right_broker=envs.get_env(args.right), vhost=args.vhost,
+                      right_vhost=args.right_vhost, kinds=args.kinds)
+    found = 0
+    for entry in entries:
+        found += 1
+        out.write(_json_line(entry) if args.format == 'json' else _text_line(entry))
+    logging.info('{} differences between {} and {}'.format(found, args.left, args.right))
+    return 1 if found else 0
+
+
+def export_command(args: argparse.Namespace, out: TextIO) -> int:
+    env = Environments(args.environments).get_env(args.env)
+    with BrokerClient(env, pool_maxsize=args.workers) as broker:
+        path = args.path or export_dir(config=Config(args.config), broker=broker)
+        compression = None if args.compression == 'none' else args.compression
+        manifest = export_vhosts(broker=broker, path=path, compression=compression, max_workers=args.workers)
+    out.write('{} vhosts exported to {}\n'.format(len(manifest['vhosts']), path))
+    return 0
+
+
+def restore_command(args: argparse.Namespace, out: TextIO) -> int:
+    restore_vhost(broker=Environments(args.environments).get_env(args.env), path=args.path, vhost=args.vhost)
+    out.write('vhost {} restored from {}\n'.format(args.vhost, args.path))
+    return 0
+
+
+COMMANDS: Dict[str, Callable[[argparse.Namespace, TextIO], int]] = {
+    'diff': diff_command,
+    'export': export_command,
+    'restore': restore_command,
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='rabbitmq-base', description='rabbitmq and cloudamqp provisioning tools')
+    parser.add_argument('--environments', required=True, help='environments json file with host, user and passwd')
+    parser.add_argument('--logging-level', default='WARNING')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+    diff = commands.add_parser('diff', help='compare the definitions of a vhost in two environments')
+    diff.add_argument('left')
+    diff.add_argument('right')
+    diff.add_argument('--vhost', required=True)
+    diff.add_argument('--right-vhost', help='vhost on the right environment, when named differently')
+    diff.add_argument('--kinds', nargs='+', choices=RESOURCE_CLASSES, help='resource classes to compare')
+    diff.add_argument('--format', choices=['text', 'json'], default='text')
+    export = commands.add_parser('export', help='export the definitions of every vhost into sharded files')
+    export.add_argument('env')
+    export.add_argument('--config', default='app.ini', help='config whose history_files path receives the export')
+    export.add_argument('--path', help='export folder, instead of a new one under history_files')
+    export.add_argument('--compression', choices=['gz', 'zst', 'none'], default='gz')
+    export.add_argument('--workers', type=int, default=MAX_WORKERS)
+    restore = commands.add_parser('restore', help='load the definitions of one vhost from an export')
+    restore.add_argument('env')
+    restore.add_argument('--vhost', required=True)
+    restore.add_argument('--path', required=True, help='export folder holding the manifest')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None, out: TextIO = sys.stdout) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(format='%(levelname)s:%(message)s', level=args.logging_level)
+    return COMMANDS[args.command](args, out)
+
+
+def _text_line(entry: Entry) -> str:
+    if entry.status in MARKS:
+        return '{} {} {}\n'.format(MARKS[entry.status], entry.kind, entry.name)
+    changes = ', '.join('{}: {} -> {}'.format(f, json.dumps(v[0]), json.dumps(v[1])) for f, v in entry.fields.items())
+    return '~ {} {} {}\n'.format(entry.kind, entry.name, changes)
+
+
+def _json_line(entry: Entry) -> str:
+    record = {'status': entry.status, 'kind': entry.kind, 'name': entry.name, 'left': entry.left, 'right': entry.right,
+              'fields': {f: list(v) for f, v in entry.fields.items()}}
+    return json.dumps(record) + '\n'
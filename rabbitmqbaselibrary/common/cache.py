@@ -0,0 +1,65 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+from urllib.parse import urlencode
+
+MISSING = object()
+
+
+class TopologyCache(object):
+    """Parsed GET responses kept for ``ttl`` seconds, evicting the least recently used past ``max_entries``.
+
+    Entries are keyed by URL, so a write invalidates a resource collection by its URL prefix.
+    Cached values are shared between callers and must not be mutated. Every invalidation bumps
+    ``generation``; a read started before it passes the generation it saw to ``put`` and is dropped.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.__entries: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self.__generation
+
+    def get(self, key: str) -> Any:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return MISSING
+            if entry[0] < time.monotonic():
+                del self.__entries[key]
+                return MISSING
+            self.__entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, value: Any, generation: Optional[int] = None) -> None:
+        with self.__lock:
+            if generation is not None and generation != self.__generation:
+                return
+            self.__entries[key] = (time.monotonic() + self.ttl, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+
+    def invalidate(self, url: str) -> None:
+        with self.__lock:
+            self.__generation += 1
+            for key in [k for k in self.__entries if k == url or k.startswith((url + '/', url + '?'))]:
+                del self.__entries[key]
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__generation += 1
+            self.__entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+
+def cache_key(url: str, params: Optional[dict] = None) -> str:
+    return url if not params else '{}?{}'.format(url, urlencode(sorted(params.items())))
@@ -0,0 +1,139 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from rabbitmqbaselibrary.common.cache import MISSING, TopologyCache, cache_key
+from rabbitmqbaselibrary.common.handlers import handle_rest_response
+from rabbitmqbaselibrary.common.singleflight import SingleFlight
+from rabbitmqbaselibrary.common.throttling import RETRYABLE_STATUS, AdaptiveLimiter, RetryPolicy
+
+VHOST_RESOURCES = ['queues', 'exchanges', 'bindings', 'policies', 'permissions', 'definitions']
+
+_flights = SingleFlight()
+# bumped by every write to a host, so reads issued after it never join a GET started before it
+_generations: Dict[str, int] = {}
+_generations_lock = threading.Lock()
+
+
+class BrokerSession(requests.Session):
+
+    def __init__(self, timeout: Optional[float] = None, retry: Optional[RetryPolicy] = None,
+                 limiter: Optional[AdaptiveLimiter] = None):
+        super().__init__()
+        self.timeout = timeout
+        self.retry = retry
+        self.limiter = limiter
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+        if self.timeout is not None:
+            kwargs.setdefault('timeout', self.timeout)
+        attempt = 0
+        while True:
+            try:
+                response = self.__send(method, url, *args, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if self.retry is None or not self.retry.can_retry(method=method, attempt=attempt):
+                    raise
+                logging.debug('{} {} failed with {}, retrying'.format(method, url, e))
+            else:
+                if self.retry is None or not self.retry.should_retry(method, attempt, response.status_code):
+                    return response
+                logging.debug('{} {} answered {}, retrying'.format(method, url, response.status_code))
+                response.close()
+            time.sleep(self.retry.delay(attempt))
+            attempt += 1
+
+    def __send(self, method: str, url: str, *args: Any, **kwargs: Any) -> requests.Response:
+        if self.limiter is None:
+            return super().request(method, url, *args, **kwargs)
+        self.limiter.acquire()
+        start = time.monotonic()
+        failed = True
+        try:
+            response = super().request(method, url, *args, **kwargs)
+            failed = response.status_code in RETRYABLE_STATUS
+            return response
+        finally:
+            self.limiter.release(latency=time.monotonic() - start, failed=failed, url=url)
+
+
+class BrokerClient(dict):
+    """Broker dict that owns a pooled, keep-alive session to the management API.
+
+    It is accepted anywhere a ``broker`` dict is, and the module functions then reuse
+    its pooled connections (and so their TLS sessions) instead of opening a new one per call.
+    ``retry`` and ``limiter`` (see common.throttling) make it back off when the broker struggles,
+    and an opt-in ``cache`` answers repeated reads until a create or delete invalidates them.
+    """
+
+    def __init__(self, broker: dict, pool_connections: int = 10, pool_maxsize: int = 10,
+                 pool_block: bool = False, timeout: Optional[float] = None, retry: Optional[RetryPolicy] = None,
+                 limiter: Optional[AdaptiveLimiter] = None, cache: Optional[TopologyCache] = None):
+        super().__init__(broker)
+        self.cache = cache
+        self.session = BrokerSession(timeout=timeout, retry=retry, limiter=limiter)
+        self.session.auth = (broker['user'], broker['passwd'])
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> 'BrokerClient':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+def http(broker: dict) -> Any:
+    return broker.session if isinstance(broker, BrokerClient) else requests
+
+
+def get_json(broker: dict, url: str, params: Optional[dict] = None,
+             handler: Callable[[requests.Response, str], None] = handle_rest_response) -> Any:
+    """GET and parse ``url``, answering from the broker's cache when enabled.
+
+    Identical GETs already in flight from other threads are coalesced into a single request,
+    whose parsed result is shared and must not be mutated. A GET started before a write to the
+    broker is not shared with reads issued after it.
+    """
+    cache = broker.cache if isinstance(broker, BrokerClient) else None
+    key = cache_key(url, params)
+    generation = None
+    if cache is not None:
+        # taken before the GET, so that a write invalidating meanwhile keeps its stale answer out
+        generation = cache.generation
+        cached = cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+    def fetch() -> Any:
+        kwargs = {} if params is None else {'params': params}
+        response = http(broker).get(url=url, auth=(broker['user'], broker['passwd']), **kwargs)
+        handler(response, url)
+        result = response.json()
+        if cache is not None:
+            cache.put(key, result, generation=generation)
+        return result
+
+    flight = '{}@{}#{}'.format(broker['user'], key, _generations.get(broker['host'], 0))
+    return _flights.do(flight, fetch)
+
+
+def invalidate(broker: dict, *urls: str) -> None:
+    with _generations_lock:
+        _generations[broker['host']] = _generations.get(broker['host'], 0) + 1
+    cache = broker.cache if isinstance(broker, BrokerClient) else None
+    if cache is not None:
+        for url in urls:
+            cache.invalidate(url)
+
+
+def invalidate_vhost(broker: dict, vhost: str) -> None:
+    invalidate(broker, *['https://{}/api/{}/{}'.format(broker['host'], r, vhost) for r in VHOST_RESOURCES])
@@ -0,0 +1,69 @@
+import gzip
+import io
+import json
+import os
+from typing import IO, Any, List
+
+JSON_SUFFIXES = ['.json', '.json.gz', '.json.zst']
+
+
+def open_text(path: str) -> IO[str]:
+    """Open a text file for reading, decompressing on the fly when it ends with ``.gz`` or ``.zst``."""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    if path.endswith('.zst'):
+        return io.TextIOWrapper(_zstandard().ZstdDecompressor().stream_reader(open(path, 'rb')), encoding='utf-8')
+    return open(path)
+
+
+def read_text(path: str) -> str:
+    with open_text(path) as f:
+        return f.read()
+
+
+def write_text(path: str, text: str) -> None:
+    """Write a text file, compressing it when the name ends with ``.gz`` or ``.zst``."""
+    if path.endswith('.gz'):
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            f.write(text)
+    elif path.endswith('.zst'):
+        with open(path, 'wb') as raw:
+            raw.write(_zstandard().ZstdCompressor().compress(text.encode('utf-8')))
+    else:
+        with open(path, 'w') as f:
+            f.write(text)
+
+
+def open_bytes_writer(path: str) -> IO[bytes]:
+    """Open a file for writing bytes, compressing them on the fly when it ends with ``.gz`` or ``.zst``."""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'wb')
+    if path.endswith('.zst'):
+        return _zstandard().ZstdCompressor().stream_writer(open(path, 'wb'))
+    return open(path, 'wb')
+
+
+def load_json_file(path: str) -> Any:
+    return json.loads(read_text(path))
+
+
+def dump_json_file(path: str, obj: Any) -> None:
+    write_text(path, json.dumps(obj))
+
+
+def find_json_file(base: str) -> str:
+    """Path of ``base`` with the first JSON suffix found on disk, the plain ``.json`` one otherwise."""
+    candidates: List[str] = ['{}{}'.format(base, suffix) for suffix in JSON_SUFFIXES]
+    return next((c for c in candidates if os.path.exists(c)), candidates[0])
+
+
+def gzip_json(obj: Any) -> bytes:
+    return gzip.compress(json.dumps(obj).encode('utf-8'))
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError('zstandard is required for .zst files, install rabbitmq-base-library[zstd]')
+    return zstandard
@@ -1,6 +1,9 @@
 import configparser
-import json
 import os
+from typing import Iterator, Tuple
+
+from rabbitmqbaselibrary.common.compression import load_json_file
+from rabbitmqbaselibrary.common.streaming import iter_definitions_file
 
 
 class Config(object):
@@ -20,5 +23,7 @@ class Config(object):
         return os.path.join(self.get_path(key=key), file_name)
 
     def get_json_file(self, key: str, file_name: str) -> dict:
-        with open(self.get_file_path(key=key, file_name=file_name)) as json_file:
-            return json.load(json_file)
+        return load_json_file(self.get_file_path(key=key, file_name=file_name))
+
+    def iter_definitions_file(self, key: str, file_name: str) -> Iterator[Tuple[str, dict]]:
+        return iter_definitions_file(self.get_file_path(key=key, file_name=file_name))
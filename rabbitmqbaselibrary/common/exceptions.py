@@ -47,3 +47,13 @@ class NotValidPermissions(BaseException):
 class UserAlreadyExists(BaseException):
     def __init__(self, user: str):
         self.user = user
+
+
+class PoolExhausted(Exception):
+    def __init__(self, message: str):
+        self.message = message
+
+
+class CodecNotFound(Exception):
+    def __init__(self, message: str):
+        self.message = message
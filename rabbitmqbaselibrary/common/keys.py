@@ -0,0 +1,46 @@
+import hashlib
+import json
+from typing import Any, Callable, Dict, Hashable, Iterable
+
+
+def freeze(value: Any) -> Any:
+    """Hashable, order independent copy of a JSON value, so resources can be compared and indexed by key."""
+    if isinstance(value, dict):
+        return frozenset((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+NATURAL_KEYS: Dict[str, Callable[[dict], Hashable]] = {
+    'vhosts': lambda i: i.get('name'),
+    'users': lambda i: i.get('name'),
+    'permissions': lambda i: (i.get('user'), i.get('vhost')),
+    'topic_permissions': lambda i: (i.get('user'), i.get('vhost'), i.get('exchange')),
+    'exchanges': lambda i: (i.get('vhost'), i.get('name')),
+    'queues': lambda i: (i.get('vhost'), i.get('name')),
+    'bindings': lambda i: (i.get('vhost'), i.get('source'), i.get('destination'), i.get('destination_type'),
+                           i.get('routing_key'), freeze(i.get('arguments') or {})),
+    'policies': lambda i: (i.get('vhost'), i.get('name')),
+    'parameters': lambda i: (i.get('vhost'), i.get('component'), i.get('name')),
+    'global_parameters': lambda i: i.get('name'),
+}
+
+# order in which resource classes can be created; deletes go the other way round
+RESOURCE_CLASSES = ['vhosts', 'users', 'permissions', 'topic_permissions', 'parameters', 'global_parameters',
+                    'exchanges', 'queues', 'bindings', 'policies']
+
+
+def natural_key(kind: str, item: dict) -> Hashable:
+    return NATURAL_KEYS[kind](item)
+
+
+def index_resources(kind: str, items: Iterable[dict]) -> Dict[Hashable, dict]:
+    return {natural_key(kind, i): i for i in items}
+
+
+def content_hash(definitions: dict) -> str:
+    """SHA-256 of the resources in a definitions document, independent of resource and key order."""
+    canonical = {kind: sorted(json.dumps(i, sort_keys=True) for i in items)
+                 for kind, items in definitions.items() if isinstance(items, list)}
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode('utf-8')).hexdigest()
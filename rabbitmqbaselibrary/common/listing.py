@@ -0,0 +1,19 @@
+from typing import Any, Sequence, Type, TypeVar
+
+T = TypeVar('T')
+
+
+def listing_params(columns: Sequence[str], disable_stats: bool = True, queue_totals: bool = False) -> dict:
+    """Query string asking the broker to project ``columns`` and skip the per-object stats it would compute."""
+    params = {'columns': ','.join(columns)}
+    if disable_stats:
+        params.update({'disable_stats': 'true'})
+    if queue_totals:
+        params.update({'enable_queue_totals': 'true'})
+    return params
+
+
+def to_record(record_type: Type[T], item: dict) -> T:
+    fields: Sequence[str] = getattr(record_type, '_fields')
+    values: Any = [item.get(field) for field in fields]
+    return record_type(*values)
@@ -0,0 +1,51 @@
+import re
+from typing import Iterator, Optional
+
+from rabbitmqbaselibrary.common.client import http
+from rabbitmqbaselibrary.common.handlers import handle_rest_response
+
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def iter_pages(broker: dict, url: str, page_size: int = PAGE_SIZE, name: Optional[str] = None,
+               use_regex: bool = False, params: Optional[dict] = None) -> Iterator[dict]:
+    """Yield the items of a paginated management API listing one page at a time.
+
+    ``name`` (optionally a regex) is sent to the broker so filtering happens server side.
+    """
+    if not 0 < page_size <= MAX_PAGE_SIZE:
+        raise ValueError('page_size must be between 1 and {}'.format(MAX_PAGE_SIZE))
+    page = 1
+    while True:
+        query = dict(params or {})
+        query.update({'page': page, 'page_size': page_size})
+        if name is not None:
+            query.update({'name': name, 'use_regex': 'true' if use_regex else 'false'})
+        response = http(broker).get(url=url, auth=(broker['user'], broker['passwd']), params=query)
+        handle_rest_response(response=response, url=url)
+        content = response.json()
+        for item in content['items']:
+            yield item
+        if page >= content['page_count']:
+            break
+        page += 1
+
+
+def iter_listing(broker: dict, url: str, name: Optional[str] = None, use_regex: bool = False,
+                 params: Optional[dict] = None) -> Iterator[dict]:
+    """Yield the items of a listing the management API cannot paginate (users, policies, bindings).
+
+    The broker has no server side filter for these endpoints, so ``name`` is applied locally.
+    """
+    response = http(broker).get(url=url, auth=(broker['user'], broker['passwd']), params=params)
+    handle_rest_response(response=response, url=url)
+    for item in response.json():
+        if name is None or _matches(item.get('name'), name, use_regex):
+            yield item
+
+
+def _matches(value: Optional[str], name: str, use_regex: bool) -> bool:
+    if value is None:
+        return False
+    return re.search(name, value) is not None if use_regex else value == name
@@ -0,0 +1,43 @@
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class _Call(object):
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight(object):
+    """Runs one call per key at a time; concurrent callers with the same key wait and share its outcome."""
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self.__lock:
+            call = self.__calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self.__calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+            call.done.set()
+
+    def __len__(self) -> int:
+        return len(self.__calls)
@@ -0,0 +1,45 @@
+from typing import Dict, Hashable, Optional
+from urllib.parse import unquote
+
+from rabbitmqbaselibrary.common.keys import NATURAL_KEYS, natural_key
+
+# resource classes whose items belong to a vhost
+VHOST_SCOPED = ['permissions', 'topic_permissions', 'exchanges', 'queues', 'bindings', 'policies', 'parameters']
+
+
+class TopologySnapshot(object):
+    """Hash indexes over one definitions document, answering presence checks without a request.
+
+    A snapshot of a single vhost's definitions must be given that ``vhost``, as the broker leaves it
+    out of the items. Vhost names are compared decoded, so ``%2F`` and ``/`` are the same vhost.
+    The snapshot only changes through ``add`` and ``discard``; writes made elsewhere leave it stale.
+    """
+
+    def __init__(self, definitions: dict, vhost: Optional[str] = None):
+        self.__indexes: Dict[str, Dict[Hashable, dict]] = {kind: {} for kind in NATURAL_KEYS}
+        for kind in NATURAL_KEYS:
+            for item in definitions.get(kind) or []:
+                self.add(kind, item if vhost is None or 'vhost' in item else dict(item, vhost=vhost))
+
+    def find(self, kind: str, item: dict) -> Optional[dict]:
+        return self.__indexes[kind].get(self.__key(kind, item))
+
+    def contains(self, kind: str, item: dict) -> bool:
+        return self.__key(kind, item) in self.__indexes[kind]
+
+    def add(self, kind: str, item: dict) -> None:
+        self.__indexes[kind][self.__key(kind, item)] = item
+
+    def discard(self, kind: str, item: dict) -> None:
+        self.__indexes[kind].pop(self.__key(kind, item), None)
+
+    def count(self, kind: str) -> int:
+        return len(self.__indexes[kind])
+
+    @staticmethod
+    def __key(kind: str, item: dict) -> Hashable:
+        if kind in VHOST_SCOPED and item.get('vhost') is not None:
+            item = dict(item, vhost=unquote(item['vhost']))
+        if kind == 'vhosts':
+            item = dict(item, name=unquote(item['name']))
+        return natural_key(kind, item)
@@ -0,0 +1,106 @@
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+from rabbitmqbaselibrary.common.compression import open_text
+
+READ_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+
+
+class _Reader(object):
+    """Buffer over a stream of text chunks, keeping only the part not parsed yet."""
+
+    def __init__(self, chunks: Iterable[Union[str, bytes]]):
+        self.__chunks = iter(chunks)
+        self.__utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.__buffer = ''
+        self.__pos = 0
+        self.__eof = False
+
+    def peek(self) -> str:
+        while True:
+            while self.__pos < len(self.__buffer) and self.__buffer[self.__pos].isspace():
+                self.__pos += 1
+            if self.__pos < len(self.__buffer):
+                return self.__buffer[self.__pos]
+            if not self.__more():
+                raise ValueError('definitions document ended unexpectedly')
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError('expected {!r} but found {!r} in definitions document'.format(char, found))
+        self.__pos += 1
+
+    def skip(self, char: str) -> bool:
+        if self.peek() == char:
+            self.__pos += 1
+            return True
+        return False
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.__buffer, self.__pos)
+                # a value touching the end of the buffer may still continue, e.g. a number
+                if end < len(self.__buffer) or self.__eof:
+                    self.__pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.__eof:
+                    raise
+            self.__more()
+
+    def __more(self) -> bool:
+        chunk = next(self.__chunks, None)
+        if chunk is None:
+            self.__eof = True
+            return False
+        text = self.__utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+        self.__buffer = self.__buffer[self.__pos:] + text
+        self.__pos = 0
+        return True
+
+
+def iter_definitions(chunks: Iterable[Union[str, bytes]]) -> Iterator[Tuple[str, dict]]:
+    """Parse a definitions document incrementally, yielding ``(resource class, resource)`` pairs.
+
+    Only one resource is held in memory at a time; top-level values that are not lists,
+    like ``rabbit_version``, are skipped.
+    """
+    reader = _Reader(chunks)
+    reader.expect('{')
+    if reader.skip('}'):
+        return
+    while True:
+        kind = reader.value()
+        reader.expect(':')
+        if reader.skip('['):
+            if not reader.skip(']'):
+                while True:
+                    yield kind, reader.value()
+                    if reader.skip(']'):
+                        break
+                    reader.expect(',')
+        else:
+            reader.value()
+        if reader.skip('}'):
+            return
+        reader.expect(',')
+
+
+def iter_definitions_file(path: str) -> Iterator[Tuple[str, dict]]:
+    """Stream the resources of a definitions file, which may be compressed like in load_json_file."""
+    with open_text(path) as f:
+        yield from iter_definitions(iter(lambda: f.read(READ_SIZE), ''))
+
+
+def collect_definitions(resources: Iterable[Tuple[str, dict]]) -> Dict[str, List[dict]]:
+    """Group streamed ``(resource class, resource)`` pairs back into the lists of a definitions document."""
+    definitions: Dict[str, List[dict]] = {}
+    for kind, resource in resources:
+        definitions.setdefault(kind, []).append(resource)
+    return definitions
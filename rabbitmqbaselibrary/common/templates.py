@@ -1,6 +1,7 @@
 import json
 import os
 
+from rabbitmqbaselibrary.common.compression import find_json_file, load_json_file, read_text
 from rabbitmqbaselibrary.common.exceptions import TemplateException
 
 basename = os.path.abspath(os.path.join(os.path.dirname(__file__), '../resources/templates'))
@@ -14,8 +15,7 @@ class Template(object):
     # noinspection PyDeepBugsSwappedArgs
     def load_template(self, name: str) -> dict:
         try:
-            with open('{}/{}.json'.format(self.__basename, name)) as json_file:
-                return json.load(json_file)
+            return load_json_file(find_json_file('{}/{}'.format(self.__basename, name)))
         except FileNotFoundError as e:
             raise e
         except Exception as e:
@@ -24,8 +24,7 @@ class Template(object):
 
     def load_template_with_args(self, name: str, args: dict) -> dict:
         try:
-            with open('{}/{}.json'.format(self.__basename, name), 'r') as file:
-                template = file.read()
+            template = read_text(find_json_file('{}/{}'.format(self.__basename, name)))
             # noinspection StrFormat
             filed = template.format(**args)
             return json.loads(filed)
@@ -0,0 +1,127 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+RETRYABLE_STATUS = (500, 502, 503, 504)
+LARGE_ENDPOINTS = ('/api/definitions',)
+
+
+class RetryPolicy(object):
+    """Jittered exponential backoff for idempotent verbs answered with a 5xx or a connection error."""
+
+    def __init__(self, retries: int = 3, backoff: float = 0.2, max_backoff: float = 5.0,
+                 statuses: Iterable[int] = RETRYABLE_STATUS, methods: Iterable[str] = IDEMPOTENT_METHODS):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(m.upper() for m in methods)
+
+    def can_retry(self, method: str, attempt: int) -> bool:
+        return method.upper() in self.methods and attempt < self.retries
+
+    def should_retry(self, method: str, attempt: int, status_code: int) -> bool:
+        return status_code in self.statuses and self.can_retry(method=method, attempt=attempt)
+
+    def delay(self, attempt: int) -> float:
+        # full jitter keeps parallel callers from retrying in lock step
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))  # nosec
+
+
+class _Aimd(object):
+    """AIMD concurrency limit: grows by one slot per window of healthy calls, shrinks on errors or slow calls.
+
+    It shrinks at most once per congestion window: calls started before the last decrease were sent under
+    the old limit, so their failures say nothing new. The latency of ``exempt`` endpoints, which are
+    legitimately slow like definitions, is not held against ``latency_target``.
+    """
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 64, latency_target: float = 2.0,
+                 decrease_ratio: float = 0.5, exempt: Iterable[str] = LARGE_ENDPOINTS):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target = latency_target
+        self.decrease_ratio = decrease_ratio
+        self.exempt = tuple(exempt)
+        self._limit = float(max(minimum, min(initial, maximum)))
+        self._in_flight = 0
+        self._last_decrease = float('-inf')
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _record(self, latency: float, failed: bool, url: Optional[str]) -> None:
+        self._in_flight -= 1
+        slow = latency > self.latency_target and not (url is not None and any(e in url for e in self.exempt))
+        if not failed and not slow:
+            self._limit = min(float(self.maximum), self._limit + 1.0 / self._limit)
+            return
+        now = time.monotonic()
+        if now - latency >= self._last_decrease:
+            self._limit = max(float(self.minimum), self._limit * self.decrease_ratio)
+            self._last_decrease = now
+
+
+class AdaptiveLimiter(_Aimd):
+    """Thread blocking AIMD limiter for BrokerClient."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.__condition = threading.Condition()
+
+    def acquire(self) -> None:
+        with self.__condition:
+            while self._in_flight >= int(self._limit):
+                self.__condition.wait()
+            self._in_flight += 1
+
+    def release(self, latency: float, failed: bool, url: Optional[str] = None) -> None:
+        with self.__condition:
+            self._record(latency=latency, failed=failed, url=url)
+            self.__condition.notify_all()
+
+
+class AsyncAdaptiveLimiter(_Aimd):
+    """AIMD limiter for AsyncBrokerClient, waiting on the event loop instead of blocking its thread."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.__condition: Optional[asyncio.Condition] = None
+
+    async def acquire(self) -> None:
+        condition = self.__get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self._in_flight < int(self._limit))
+            self._in_flight += 1
+
+    async def release(self, latency: float, failed: bool, url: Optional[str] = None) -> None:
+        condition = self.__get_condition()
+        async with condition:
+            self._record(latency=latency, failed=failed, url=url)
+            condition.notify_all()
+
+    def __get_condition(self) -> asyncio.Condition:
+        # created on first use so that it binds to the running loop
+        if self.__condition is None:
+            self.__condition = asyncio.Condition()
+        return self.__condition
+
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter_for(host: str, **kwargs: Any) -> AdaptiveLimiter:
+    """Limiter shared by every client talking to ``host``; ``kwargs`` only apply when it is first created."""
+    with _limiters_lock:
+        if host not in _limiters:
+            _limiters[host] = AdaptiveLimiter(**kwargs)
+        return _limiters[host]
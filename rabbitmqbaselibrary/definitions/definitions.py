@@ -1,19 +1,180 @@
-# noinspection PyDeepBugsSwappedArgs
-import requests
+import hashlib
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterator, List, NamedTuple, Optional, Set, Tuple
 
+from rabbitmqbaselibrary.common.client import get_json, http, invalidate, invalidate_vhost
 from rabbitmqbaselibrary.common.handlers import handle_rest_response, handle_rest_response_with_body
+from rabbitmqbaselibrary.common.keys import content_hash
+from rabbitmqbaselibrary.common.snapshot import TopologySnapshot
+from rabbitmqbaselibrary.common.streaming import READ_SIZE, collect_definitions, iter_definitions
+from rabbitmqbaselibrary.history.history import History
+
+CHUNK_SIZE = 1000
+MAX_WORKERS = 4
+
+# resource classes grouped by dependency; a phase only starts once the previous one is imported
+IMPORT_PHASES = [['vhosts'], ['users'], ['permissions', 'topic_permissions'], ['exchanges', 'queues'], ['bindings'],
+                 ['policies', 'parameters', 'global_parameters']]
+
+
+class Chunk(NamedTuple):
+    id: str
+    kind: str
+    definitions: dict
 
 
 # noinspection PyDeepBugsSwappedArgs
 def get_definitions(broker: dict, vhost: str) -> dict:
+    # requests asks for gzip by default and inflates the response transparently
     url = 'https://{}/api/definitions/{}'.format(broker['host'], vhost)
-    response = requests.get(url=url, auth=(broker['user'], broker['passwd']))
-    handle_rest_response(response, url)
-    return response.json()
+    return get_json(broker=broker, url=url)
+
+
+def get_topology_snapshot(broker: dict, vhost: Optional[str] = None) -> TopologySnapshot:
+    """Snapshot of one vhost, or of the whole broker including vhosts, users and permissions, from a single GET."""
+    url = 'https://{}/api/definitions'.format(broker['host'])
+    url = url if vhost is None else '{}/{}'.format(url, vhost)
+    return TopologySnapshot(get_json(broker=broker, url=url), vhost=vhost)
+
+
+# noinspection PyDeepBugsSwappedArgs
+def download_definitions(broker: dict, vhost: str) -> Iterator[bytes]:
+    """Body of a vhost's definitions, chunk by chunk as it arrives, bypassing the cache and singleflight."""
+    url = 'https://{}/api/definitions/{}'.format(broker['host'], vhost)
+    response = http(broker).get(url=url, auth=(broker['user'], broker['passwd']), stream=True)
+    try:
+        handle_rest_response(response=response, url=url)
+        yield from response.iter_content(chunk_size=READ_SIZE)
+    finally:
+        response.close()
+
+
+def stream_definitions(broker: dict, vhost: str) -> Iterator[Tuple[str, dict]]:
+    """Yield ``(resource class, resource)`` pairs of a vhost's definitions as the response body arrives.
+
+    Unlike get_definitions the document is never held in memory as a whole, nor cached.
+    """
+    yield from iter_definitions(download_definitions(broker=broker, vhost=vhost))
+
+
+def read_definitions(broker: dict, vhost: str) -> dict:
+    """Resource lists of a vhost's live definitions, parsed from the stream and never cached.
+
+    Only the parsed resources are held, not the response text as well; top-level values
+    like ``rabbit_version`` are left out.
+    """
+    return collect_definitions(stream_definitions(broker=broker, vhost=vhost))
 
 
 # noinspection PyDeepBugsSwappedArgs
 def load_definitions(broker: dict, vhost: str, definitions: dict) -> None:
     url = 'https://{}/api/definitions/{}'.format(broker['host'], vhost)
-    response = requests.post(url=url, auth=(broker['user'], broker['passwd']), json=definitions)
+    _post_definitions(broker=broker, url=url, definitions=definitions)
+    invalidate_vhost(broker=broker, vhost=vhost)
+
+
+def live_fingerprint(broker: dict, vhost: str) -> str:
+    """Cheap summary of a vhost's live state: queue and exchange totals from one-item pages and the policy count."""
+    counts = []
+    for resource in ['queues', 'exchanges']:
+        url = 'https://{}/api/{}/{}'.format(broker['host'], resource, vhost)
+        counts.append(get_json(broker=broker, url=url, params={'page': 1, 'page_size': 1, 'columns': 'name'})['total_count'])
+    url = 'https://{}/api/policies/{}'.format(broker['host'], vhost)
+    counts.append(len(get_json(broker=broker, url=url, params={'columns': 'name'})))
+    return ':'.join(str(c) for c in counts)
+
+
+def load_definitions_if_changed(broker: dict, vhost: str, definitions: dict, history: History) -> bool:
+    """Upload definitions unless the same document was the last one applied and the vhost still looks the same.
+
+    Returns whether an upload happened.
+    """
+    digest = content_hash(definitions)
+    applied = history.get_applied_definitions(broker=broker['host'], vhost=vhost)
+    if applied is not None and applied[0] == digest and applied[1] == live_fingerprint(broker=broker, vhost=vhost):
+        logging.info('definitions for {} unchanged since last upload, skipping'.format(vhost))
+        return False
+    load_definitions(broker=broker, vhost=vhost, definitions=definitions)
+    history.save_applied_definitions(broker=broker['host'], vhost=vhost, content_hash=digest,
+                                     fingerprint=live_fingerprint(broker=broker, vhost=vhost))
+    return True
+
+
+def split_definitions(definitions: dict, chunk_size: int = CHUNK_SIZE) -> List[List[Chunk]]:
+    """Split a definitions document into phases of chunks holding at most ``chunk_size`` resources.
+
+    Chunk ids are derived from their content, so splitting the same document again gives the same ids.
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be positive, got {}'.format(chunk_size))
+    known = [kind for phase in IMPORT_PHASES for kind in phase]
+    extra = [k for k, v in definitions.items() if isinstance(v, list) and k not in known]
+    phases: List[List[Chunk]] = []
+    for kinds in IMPORT_PHASES[:-1] + [IMPORT_PHASES[-1] + extra]:
+        chunks: List[Chunk] = []
+        for kind in kinds:
+            items = definitions.get(kind) or []
+            for index, start in enumerate(range(0, len(items), chunk_size)):
+                part = items[start:start + chunk_size]
+                digest = hashlib.sha1(json.dumps(part, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+                chunks.append(Chunk(id='{}-{}-{}'.format(kind, index, digest), kind=kind, definitions={kind: part}))
+        if chunks:
+            phases.append(chunks)
+    return phases
+
+
+def load_definitions_chunked(broker: dict, vhost: Optional[str], definitions: dict, chunk_size: int = CHUNK_SIZE,
+                             max_workers: int = MAX_WORKERS, completed: Optional[Set[str]] = None,
+                             progress: Optional[Callable[[Chunk, int, int], None]] = None) -> Set[str]:
+    """Import a large definitions document as bounded chunks, in dependency order.
+
+    Chunks of one phase are uploaded concurrently by ``max_workers`` threads. Ids of imported chunks
+    are added to ``completed`` (also returned); passing it back after a failure resumes the import
+    where it stopped. ``progress`` is called from the calling thread as ``(chunk, done, total)``.
+    Pass ``vhost=None`` to import through the broker-wide endpoint, which also accepts vhosts,
+    users and permissions.
+    """
+    done = set() if completed is None else completed
+    phases = split_definitions(definitions, chunk_size=chunk_size)
+    total = sum(len(chunks) for chunks in phases)
+    finished = len([c for chunks in phases for c in chunks if c.id in done])
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for chunks in phases:
+                pending = {executor.submit(_post_chunk, broker, vhost, c): c for c in chunks if c.id not in done}
+                errors: List[BaseException] = []
+                for future in as_completed(pending):
+                    chunk = pending[future]
+                    error = future.exception()
+                    if error is not None:
+                        logging.debug('definitions chunk {} failed: {}'.format(chunk.id, error))
+                        errors.append(error)
+                        continue
+                    done.add(chunk.id)
+                    finished += 1
+                    if progress is not None:
+                        progress(chunk, finished, total)
+                if errors:
+                    raise errors[0]
+    finally:
+        if vhost is None:
+            invalidate(broker, 'https://{}/api'.format(broker['host']))
+        else:
+            invalidate_vhost(broker=broker, vhost=vhost)
+    logging.info('{} definitions chunks imported'.format(total))
+    return done
+
+
+# noinspection PyDeepBugsSwappedArgs
+def _post_chunk(broker: dict, vhost: Optional[str], chunk: Chunk) -> None:
+    url = 'https://{}/api/definitions'.format(broker['host'])
+    url = url if vhost is None else '{}/{}'.format(url, vhost)
+    _post_definitions(broker=broker, url=url, definitions=chunk.definitions)
+
+
+def _post_definitions(broker: dict, url: str, definitions: dict) -> None:
+    # sent uncompressed: the management plugin does not inflate gzip request bodies
+    response = http(broker).post(url=url, auth=(broker['user'], broker['passwd']), json=definitions)
     handle_rest_response_with_body(response, url, definitions)
@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, Iterator, List, NamedTuple, Optional, Tuple
+
+from rabbitmqbaselibrary.common.keys import RESOURCE_CLASSES, index_resources
+from rabbitmqbaselibrary.definitions.definitions import read_definitions
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+
+
+class Entry(NamedTuple):
+    status: str
+    kind: str
+    key: Hashable
+    left: Optional[dict]
+    right: Optional[dict]
+    fields: Dict[str, Tuple[Any, Any]]
+
+    @property
+    def name(self) -> str:
+        item: dict = self.right if self.right is not None else self.left  # type: ignore
+        if self.kind == 'bindings':
+            return '{}->{} ({})'.format(item.get('source'), item.get('destination'), item.get('routing_key'))
+        if self.kind in ('permissions', 'topic_permissions'):
+            return '{}@{}'.format(item.get('user'), item.get('vhost'))
+        return str(item.get('name'))
+
+
+def diff_definitions(left: dict, right: dict, kinds: Optional[List[str]] = None) -> Iterator[Entry]:
+    """Yield what changes from ``left`` to ``right``, one resource at a time, in a single pass per class.
+
+    Resources are matched by natural key; ``changed`` entries carry the differing fields as (left, right).
+    """
+    for kind in kinds or RESOURCE_CLASSES:
+        before = index_resources(kind, left.get(kind, []))
+        after = index_resources(kind, right.get(kind, []))
+        for key, item in before.items():
+            other = after.get(key)
+            if other is None:
+                yield Entry(REMOVED, kind, key, item, None, {})
+            elif other != item:
+                yield Entry(CHANGED, kind, key, item, other, _changed_fields(item, other))
+        for key, item in after.items():
+            if key not in before:
+                yield Entry(ADDED, kind, key, None, item, {})
+
+
+def fetch_definitions(left_broker: dict, right_broker: dict, vhost: str,
+                      right_vhost: Optional[str] = None) -> Tuple[dict, dict]:
+    """Stream the definitions of a vhost from two brokers at the same time."""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        left = executor.submit(read_definitions, broker=left_broker, vhost=vhost)
+        right = executor.submit(read_definitions, broker=right_broker, vhost=right_vhost or vhost)
+        return left.result(), right.result()
+
+
+def compare(left_broker: dict, right_broker: dict, vhost: str, right_vhost: Optional[str] = None,
+            kinds: Optional[List[str]] = None) -> Iterator[Entry]:
+    left, right = fetch_definitions(left_broker=left_broker, right_broker=right_broker, vhost=vhost,
+                                    right_vhost=right_vhost)
+    return diff_definitions(left=left, right=right, kinds=kinds)
+
+
+def _changed_fields(left: dict, right: dict) -> Dict[str, Tuple[Any, Any]]:
+    return {field: (left.get(field), right.get(field))
+            for field in sorted(set(left) | set(right)) if left.get(field) != right.get(field)}
@@ -1,28 +1,73 @@
-import requests
-from pyramda import map, contains
+from typing import Iterator, List, NamedTuple, Optional
 
+from pyramda import map
+
+from rabbitmqbaselibrary.common.client import get_json, http, invalidate
+from rabbitmqbaselibrary.common.exceptions import NotFoundException
 from rabbitmqbaselibrary.common.handlers import handle_rest_response, handle_rest_response_with_body
+from rabbitmqbaselibrary.common.listing import listing_params, to_record
+from rabbitmqbaselibrary.common.pagination import PAGE_SIZE, iter_pages
+from rabbitmqbaselibrary.common.snapshot import TopologySnapshot
+
+
+class ExchangeRecord(NamedTuple):
+    name: str
+    type: str
+    durable: bool
+    auto_delete: bool
+    internal: bool
+
 
+def is_present(broker: dict, vhost: str, name: str, snapshot: Optional[TopologySnapshot] = None) -> bool:
+    if snapshot is not None:
+        return snapshot.contains('exchanges', {'vhost': vhost, 'name': name})
+    try:
+        get_exchange_by_name(broker=broker, vhost=vhost, name=name, columns=['name'])
+        return True
+    except NotFoundException:
+        return False
 
-def is_present(broker: dict, vhost: str, name: str) -> bool:
-    return contains(name, get_exchanges(broker=broker, vhost=vhost))
+
+def get_exchange_by_name(broker: dict, vhost: str, name: str, columns: Optional[List[str]] = None) -> dict:
+    url = 'https://{}/api/exchanges/{}/{}'.format(broker['host'], vhost, name)
+    params = None if columns is None else {'columns': ','.join(columns)}
+    return get_json(broker=broker, url=url, params=params)
 
 
 # noinspection PyDeepBugsSwappedArgs
 def get_exchanges(broker: dict, vhost: str) -> dict:
     url = 'https://{}/api/exchanges/{}'.format(broker['host'], vhost)
-    response = requests.get(url=url, auth=(broker['user'], broker['passwd']))
-    handle_rest_response(response=response, url=url)
-    return map(lambda i: i['name'], response.json())
+    return map(lambda i: i['name'], get_json(broker=broker, url=url, params=listing_params(['name'])))
+
+
+def list_exchanges(broker: dict, vhost: str) -> List[ExchangeRecord]:
+    url = 'https://{}/api/exchanges/{}'.format(broker['host'], vhost)
+    params = listing_params(ExchangeRecord._fields)
+    return map(lambda i: to_record(ExchangeRecord, i), get_json(broker=broker, url=url, params=params))
+
+
+def iter_exchanges(broker: dict, vhost: str, page_size: int = PAGE_SIZE, name: Optional[str] = None,
+                   use_regex: bool = False) -> Iterator[str]:
+    url = 'https://{}/api/exchanges/{}'.format(broker['host'], vhost)
+    for item in iter_pages(broker=broker, url=url, page_size=page_size, name=name, use_regex=use_regex,
+                           params=listing_params(['name'])):
+        yield item['name']
 
 
 def create_exchange(broker: dict, vhost: str, name: str, exchange: dict) -> None:
     url = 'https://{}/api/exchanges/{}/{}'.format(broker['host'], vhost, name)
-    response = requests.put(url=url, auth=(broker['user'], broker['passwd']), json=exchange)
+    response = http(broker).put(url=url, auth=(broker['user'], broker['passwd']), json=exchange)
     handle_rest_response_with_body(response=response, url=url, body=exchange)
+    invalidate(broker, *_cached_urls(broker=broker, vhost=vhost))
 
 
 def delete_exchange(broker: dict, vhost: str, name: str) -> None:
     url = 'https://{}/api/exchanges/{}/{}'.format(broker['host'], vhost, name)
-    response = requests.delete(url=url, auth=(broker['user'], broker['passwd']))
+    response = http(broker).delete(url=url, auth=(broker['user'], broker['passwd']))
     handle_rest_response(response=response, url=url)
+    invalidate(broker, *_cached_urls(broker=broker, vhost=vhost, bindings=True))
+
+
+def _cached_urls(broker: dict, vhost: str, bindings: bool = False) -> List[str]:
+    resources = ['exchanges', 'definitions'] + (['bindings'] if bindings else [])
+    return ['https://{}/api/{}/{}'.format(broker['host'], r, vhost) for r in resources]
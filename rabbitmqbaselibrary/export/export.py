@@ -0,0 +1,87 @@
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import IO, Iterable, Iterator, List, Optional
+from urllib.parse import quote
+
+from rabbitmqbaselibrary.common.compression import load_json_file, open_bytes_writer
+from rabbitmqbaselibrary.common.config import Config
+from rabbitmqbaselibrary.common.streaming import iter_definitions
+from rabbitmqbaselibrary.definitions.definitions import download_definitions, load_definitions
+from rabbitmqbaselibrary.vhost.vhost import get_vhosts
+
+MANIFEST = 'manifest.json'
+MAX_WORKERS = 8
+SUFFIXES = {None: '.json', 'gz': '.json.gz', 'zst': '.json.zst'}
+
+
+def export_dir(config: Config, broker: dict) -> str:
+    """New timestamped folder for an export of ``broker`` under the configured history_files path."""
+    path = os.path.join(config.get_path('history_files'), 'exports', broker['host'],
+                        datetime.now().strftime('%Y%m%dT%H%M%S'))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def export_vhosts(broker: dict, path: str, vhosts: Optional[List[str]] = None, compression: Optional[str] = 'gz',
+                  max_workers: int = MAX_WORKERS) -> dict:
+    """Write the definitions of every vhost into its own file under ``path``, fetching them concurrently.
+
+    A manifest next to the shards maps each vhost to its file and the file's sha256; it is
+    written last, so an interrupted export never leaves a manifest behind. Each response is written
+    to its shard as it arrives, bypassing the topology cache, so a worker never holds a whole document.
+    Pass a BrokerClient with ``pool_maxsize >= max_workers`` to reuse connections between the workers.
+    """
+    if compression not in SUFFIXES:
+        raise ValueError('unknown compression {}, use one of gz, zst or None'.format(compression))
+    names = get_vhosts(broker=broker) if vhosts is None else vhosts
+
+    def export(vhost: str) -> dict:
+        file_name = '{}{}'.format(quote(vhost, safe=''), SUFFIXES[compression])
+        with open_bytes_writer(os.path.join(path, file_name)) as out:
+            chunks = _written(download_definitions(broker=broker, vhost=quote(vhost, safe='')), out)
+            # the resources are counted as the chunks go by, then whatever follows the document is written too
+            resources = sum(1 for _ in iter_definitions(chunks))
+            for _ in chunks:
+                pass
+        logging.debug('vhost {} exported to {}'.format(vhost, file_name))
+        return {'file': file_name, 'sha256': _file_digest(os.path.join(path, file_name)), 'resources': resources}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        shards = dict(zip(names, executor.map(export, names)))
+    manifest = {'broker': broker['host'], 'created': datetime.now().isoformat(), 'vhosts': shards}
+    with open(os.path.join(path, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    logging.info('{} vhosts exported to {}'.format(len(shards), path))
+    return manifest
+
+
+def read_shard(path: str, vhost: str) -> dict:
+    """Definitions of one vhost from an export, checked against the manifest hash."""
+    with open(os.path.join(path, MANIFEST)) as f:
+        shard = json.load(f)['vhosts'][vhost]
+    file_name = os.path.join(path, shard['file'])
+    if _file_digest(file_name) != shard['sha256']:
+        raise ValueError('shard {} does not match its manifest hash'.format(file_name))
+    return load_json_file(file_name)
+
+
+def restore_vhost(broker: dict, path: str, vhost: str) -> None:
+    load_definitions(broker=broker, vhost=quote(vhost, safe=''), definitions=read_shard(path=path, vhost=vhost))
+
+
+def _written(chunks: Iterable[bytes], out: IO[bytes]) -> Iterator[bytes]:
+    for chunk in chunks:
+        out.write(chunk)
+        yield chunk
+
+
+def _file_digest(file_name: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_name, 'rb') as f:
+        for block in iter(lambda: f.read(64 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
@@ -1,10 +1,14 @@
 import getpass
+import gzip
+import json
 import logging
 import os
 import sqlite3
 import uuid
 from datetime import datetime
+from typing import Optional, Tuple
 
+from rabbitmqbaselibrary.common.compression import gzip_json
 from rabbitmqbaselibrary.common.report import Report
 
 
@@ -34,6 +38,38 @@ class History(object):
                                                                                    self.__file_name(output_file), env,
                                                                                    getpass.getuser()))
 
+    def get_applied_definitions(self, broker: str, vhost: str) -> Optional[Tuple[str, str]]:
+        """Content hash and live fingerprint recorded by the last definitions upload to a vhost."""
+        c = self.__conn.cursor()
+        # noinspection SqlResolve
+        c.execute('''SELECT hash, fingerprint FROM Definitions WHERE broker=? AND vhost=?''', (broker, vhost))
+        row = c.fetchone()
+        return None if row is None else (row[0], row[1])
+
+    def save_applied_definitions(self, broker: str, vhost: str, content_hash: str, fingerprint: str) -> None:
+        c = self.__conn.cursor()
+        # noinspection SqlResolve
+        c.execute('''INSERT OR REPLACE INTO Definitions(broker, vhost, hash, fingerprint, timestamp, user)
+                  VALUES (?,?,?,?,?,?)''', (broker, vhost, content_hash, fingerprint, datetime.now(), getpass.getuser()))
+        self.__conn.commit()
+        logging.debug('applied definitions hash recorded for {} in {}'.format(vhost, broker))
+
+    def get_snapshot(self, broker: str, vhost: str) -> Optional[Tuple[dict, str]]:
+        """Definitions last synced to a vhost, with the live fingerprint taken right after."""
+        c = self.__conn.cursor()
+        # noinspection SqlResolve
+        c.execute('''SELECT snapshot, fingerprint FROM Snapshots WHERE broker=? AND vhost=?''', (broker, vhost))
+        row = c.fetchone()
+        return None if row is None else (json.loads(gzip.decompress(row[0])), row[1])
+
+    def save_snapshot(self, broker: str, vhost: str, snapshot: dict, fingerprint: str) -> None:
+        c = self.__conn.cursor()
+        # noinspection SqlResolve
+        c.execute('''INSERT OR REPLACE INTO Snapshots(broker, vhost, snapshot, fingerprint, timestamp, user)
+                  VALUES (?,?,?,?,?,?)''', (broker, vhost, gzip_json(snapshot), fingerprint, datetime.now(), getpass.getuser()))
+        self.__conn.commit()
+        logging.debug('definitions snapshot recorded for {} in {}'.format(vhost, broker))
+
     def __history_file_name(self, prefix: str) -> str:
         return os.path.join(self.__hist_path, '{}/{}.json'.format(prefix, str(uuid.uuid4())))
 
@@ -51,3 +87,19 @@ class History(object):
                 '''CREATE TABLE History (id INTEGER PRIMARY KEY,  input_file varchar(80) NOT NULL,
                  output_file varchar(80), environment varchar(20), timestamp DATETIME, user varchar(20))''')
             logging.info('history database initialised.')
+        # noinspection SqlNoDataSourceInspection
+        c.execute('''SELECT name FROM sqlite_master WHERE type='table' AND name=?''', ('Definitions',))
+        if c.fetchone() is None:
+            # noinspection SqlNoDataSourceInspection
+            c.execute(
+                '''CREATE TABLE Definitions (broker varchar(80) NOT NULL, vhost varchar(80) NOT NULL, hash char(64),
+                 fingerprint varchar(80), timestamp DATETIME, user varchar(20), PRIMARY KEY (broker, vhost))''')
+            logging.info('definitions hash table initialised.')
+        # noinspection SqlNoDataSourceInspection
+        c.execute('''SELECT name FROM sqlite_master WHERE type='table' AND name=?''', ('Snapshots',))
+        if c.fetchone() is None:
+            # noinspection SqlNoDataSourceInspection
+            c.execute(
+                '''CREATE TABLE Snapshots (broker varchar(80) NOT NULL, vhost varchar(80) NOT NULL, snapshot BLOB,
+                 fingerprint varchar(80), timestamp DATETIME, user varchar(20), PRIMARY KEY (broker, vhost))''')
+            logging.info('definitions snapshot table initialised.')
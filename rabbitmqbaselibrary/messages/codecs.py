@@ -0,0 +1,86 @@
+import json
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from rabbitmqbaselibrary.common.exceptions import CodecNotFound
+
+DEFAULT = 'json'
+
+
+class Codec(NamedTuple):
+    name: str
+    content_type: str
+    content_encoding: str
+    encode: Callable[[Any], Any]
+    decode: Callable[[bytes], Any]
+
+    def properties(self) -> dict:
+        return {'content_type': self.content_type, 'content_encoding': self.content_encoding}
+
+
+CODECS: Dict[str, Codec] = {}
+
+
+def register_codec(codec: Codec) -> None:
+    """Make ``codec`` selectable by name on publish; a codec registered later wins the receive lookup."""
+    CODECS[codec.name] = codec
+
+
+def get_codec(name: str) -> Codec:
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise CodecNotFound('no codec named {}'.format(name))
+
+
+def codec_for(content_type: Optional[str], content_encoding: Optional[str] = None) -> Codec:
+    """Pick the decoder for the message properties, messages without a content type are JSON."""
+    if not content_type:
+        return CODECS[DEFAULT]
+    matches = [c for c in CODECS.values() if c.content_type == content_type]
+    exact = [c for c in matches if c.content_encoding == content_encoding]
+    if exact or matches:
+        return (exact or matches)[-1]
+    raise CodecNotFound('no codec for content type {}'.format(content_type))
+
+
+def encode(body: Any, codec: str = DEFAULT) -> Any:
+    return get_codec(codec).encode(body)
+
+
+def decode(message: Any) -> Any:
+    """Decode the body of a rabbitpy message with the codec its ``content_type`` names."""
+    properties = message.properties or {}
+    codec = codec_for(properties.get('content_type'), properties.get('content_encoding'))
+    return codec.decode(message.body)
+
+
+def _raw(body: Any) -> bytes:
+    return body.encode('utf-8') if isinstance(body, str) else bytes(body)
+
+
+def _orjson() -> Any:
+    try:
+        import orjson
+    except ImportError:
+        raise ImportError('orjson is required for the fastjson codec, install rabbitmq-base-library[orjson]')
+    return orjson
+
+
+def _msgpack() -> Any:
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError('msgpack is required for the msgpack codec, install rabbitmq-base-library[msgpack]')
+    return msgpack
+
+
+register_codec(Codec(name='raw', content_type='application/octet-stream', content_encoding='binary',
+                     encode=_raw, decode=bytes))
+register_codec(Codec(name='msgpack', content_type='application/msgpack', content_encoding='binary',
+                     encode=lambda body: _msgpack().packb(body, use_bin_type=True),
+                     decode=lambda body: _msgpack().unpackb(body, raw=False)))
+register_codec(Codec(name='fastjson', content_type='application/json', content_encoding='utf-8',
+                     encode=lambda body: _orjson().dumps(body), decode=lambda body: _orjson().loads(body)))
+# registered last so that plain json, which needs no extra, decodes every application/json message
+register_codec(Codec(name='json', content_type='application/json', content_encoding='utf-8',
+                     encode=json.dumps, decode=json.loads))
@@ -1,25 +1,195 @@
-import json
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Iterable, List, NamedTuple, Optional, Set
 
 import rabbitpy
 
+from rabbitmqbaselibrary.messages.codecs import DEFAULT, decode, get_codec
+from rabbitmqbaselibrary.messages.pool import ChannelPool
+
+WINDOW = 8
+RECEIVE_TIMEOUT = 5.0
+
+
+class PublishResult(NamedTuple):
+    position: int
+    confirmed: bool
+    returned: Optional[str]
+    error: Optional[Exception]
+
+    @property
+    def ok(self) -> bool:
+        return self.confirmed and self.returned is None and self.error is None
+
 
 class AmqpSenderConsumer(object):
+    """Publishes and consumes messages over its own connection, or over a shared one from ``pool``.
+
+    Messages are encoded with the named ``codec`` on publish, which sets their ``content_type`` and
+    ``content_encoding``, and decoded on receive with the codec those properties name.
+    """
+
+    def __init__(self, conn_string: str, pool: Optional[ChannelPool] = None):
+        self.__conn_string = conn_string
+        self.__pool = pool
+        if pool is None:
+            self.__connection = rabbitpy.Connection(conn_string)
+            self.__channel = self.__connection.channel()
+        else:
+            # borrow first, a connection with a channel lent out is never evicted
+            self.__channel = pool.acquire(conn_string)
+            self.__connection = pool.connection(conn_string)
+        self.__amqp = rabbitpy.AMQP(self.__channel)
+
+    def close(self) -> None:
+        """Give the channel back to the pool, or close the connection opened for this sender."""
+        if self.__pool is not None:
+            self.__pool.release(self.__channel)
+        else:
+            self.__connection.close()
+
+    def __enter__(self) -> 'AmqpSenderConsumer':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def publish_message(self, exchange: str, routing_key: str, message: Any, codec: str = DEFAULT) -> None:
+        encoder = get_codec(codec)
+        self.__amqp.basic_publish(exchange=exchange, routing_key=routing_key, body=encoder.encode(message),
+                                  properties=encoder.properties(), mandatory=True)
 
-    def __init__(self, conn_string: str):
-        self.__amqp = rabbitpy.AMQP(rabbitpy.Connection(conn_string).channel())
+    def publish_batch(self, exchange: str, routing_key: str, messages: Iterable[Any], window: int = WINDOW,
+                      mandatory: bool = True, codec: str = DEFAULT) -> List[PublishResult]:
+        """Publish messages with publisher confirms, keeping up to ``window`` of them unconfirmed at a time.
 
-    def publish_message(self, exchange: str, routing_key: str, message: dict) -> None:
-        self.__amqp.basic_publish(exchange=exchange, routing_key=routing_key, body=json.dumps(message), mandatory=True)
+        rabbitpy waits for the confirm of each publish on its channel, so the window is made of
+        that many confirming channels on this connection, each publishing from its own thread; with a
+        pool they are borrowed from it and count against its ``max_channels``.
+        Every message gets a result, in input order: confirmed, nacked, returned or failed.
+        """
+        encoder = get_codec(codec)
+        local = threading.local()
+        channels: List[Any] = []
+        lock = threading.Lock()
 
-    def receive_message(self, queue: str) -> dict:
-        received: dict = {}
+        def publish(index: int, message: Any) -> PublishResult:
+            if not hasattr(local, 'amqp'):
+                channel = self.__open_channel()
+                channel.enable_publisher_confirms()
+                with lock:
+                    channels.append(channel)
+                local.amqp = rabbitpy.AMQP(channel)
+            try:
+                confirmed = local.amqp.basic_publish(exchange=exchange, routing_key=routing_key,
+                                                     body=encoder.encode(message), properties=encoder.properties(),
+                                                     mandatory=mandatory)
+                return PublishResult(position=index, confirmed=bool(confirmed), returned=None, error=None)
+            except rabbitpy.exceptions.MessageReturnedException as e:
+                # the broker still confirms a returned message; consume it so it is not taken for the next one
+                local.amqp.channel.wait_for_confirmation()
+                return PublishResult(position=index, confirmed=False, returned=str(e), error=None)
+            except Exception as e:
+                return PublishResult(position=index, confirmed=False, returned=None, error=e)
+
+        results: List[PublishResult] = []
+        try:
+            with ThreadPoolExecutor(max_workers=window) as executor:
+                pending: Set[Future] = set()
+                for index, message in enumerate(messages):
+                    if len(pending) >= 2 * window:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        results.extend(f.result() for f in done)
+                    pending.add(executor.submit(publish, index, message))
+                results.extend(f.result() for f in wait(pending).done)
+        finally:
+            for channel in channels:
+                self.__close_channel(channel)
+        results.sort(key=lambda r: r.position)
+        logging.debug('{} messages published to {}, {} not confirmed'.format(
+            len(results), exchange, len([r for r in results if not r.ok])))
+        return results
+
+    def receive_message(self, queue: str) -> Any:
+        received: Any = {}
         for message in self.__amqp.basic_consume(queue=queue):
             message.ack()
             self.__amqp.basic_cancel()
-            received = message.json()
+            received = decode(message)
             break
         return received
 
+    def receive_messages(self, queue: str, max_count: int, timeout: float = RECEIVE_TIMEOUT,
+                         prefetch: Optional[int] = None) -> List[Any]:
+        """Receive up to ``max_count`` messages through a single consumer, waiting at most ``timeout`` seconds.
+
+        The consumer runs on its own channel with a prefetch of ``max_count`` unless given, and the
+        messages received are acknowledged with one ``multiple`` ack once it is cancelled. Closing the
+        channel requeues whatever the broker delivered after the cancel.
+        """
+        channel = self.__open_channel()
+        amqp = rabbitpy.AMQP(channel)
+        lock = threading.Lock()
+        cancelled = threading.Event()
+
+        def cancel() -> None:
+            with lock:
+                if not cancelled.is_set():
+                    cancelled.set()
+                    amqp.basic_cancel()
+
+        # basic_consume blocks on the next frame; cancelling from the timer thread interrupts the wait
+        timer = threading.Timer(timeout, cancel)
+        messages: List[Any] = []
+        try:
+            amqp.basic_qos(prefetch_count=prefetch or max_count)
+            timer.start()
+            for message in amqp.basic_consume(queue=queue):
+                if message is None or cancelled.is_set():
+                    break
+                messages.append(message)
+                if len(messages) >= max_count:
+                    cancel()
+                    break
+            if messages:
+                amqp.basic_ack(delivery_tag=messages[-1].delivery_tag, multiple=True)
+        finally:
+            timer.cancel()
+            self.__close_channel(channel)
+        logging.debug('{} messages received from {}'.format(len(messages), queue))
+        return [decode(message) for message in messages]
+
+    def get_messages(self, queue: str, max_count: int) -> List[Any]:
+        """Drain up to ``max_count`` messages with ``basic_get``, without registering a consumer.
+
+        Stops as soon as the queue is empty and acknowledges what was fetched with one ``multiple`` ack.
+        """
+        channel = self.__open_channel()
+        messages: List[Any] = []
+        try:
+            source = rabbitpy.Queue(channel, queue)
+            while len(messages) < max_count:
+                message = source.get(acknowledge=True)
+                if message is None:
+                    break
+                messages.append(message)
+            if messages:
+                messages[-1].ack(all_previous=True)
+        finally:
+            self.__close_channel(channel)
+        logging.debug('{} messages fetched from {}'.format(len(messages), queue))
+        return [decode(message) for message in messages]
+
+    def __open_channel(self) -> Any:
+        return self.__connection.channel() if self.__pool is None else self.__pool.acquire(self.__conn_string)
+
+    def __close_channel(self, channel: Any) -> None:
+        # closed rather than given back idle: it may be confirming or still hold deliveries to requeue
+        channel.close()
+        if self.__pool is not None:
+            self.__pool.release(channel)
+
 
 def build_conn_string(host: str, vhost: str, name: str, passwd: str) -> str:
     return 'amqps://{}:{}@{}/{}'.format(name, passwd, host, vhost)
@@ -0,0 +1,209 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import rabbitpy
+
+from rabbitmqbaselibrary.common.exceptions import PoolExhausted
+
+MAX_CONNECTIONS = 8
+MAX_CHANNELS = 16
+IDLE_TIMEOUT = 60.0
+ACQUIRE_TIMEOUT = 30.0
+
+
+class _Entry(object):
+    """One pooled connection, its idle channels and how many of its channels are lent out.
+
+    ``connection`` is None while it is being opened, the entry only reserving its slot in the pool.
+    """
+
+    def __init__(self) -> None:
+        self.connection: Any = None
+        self.idle: List[Tuple[float, Any]] = []
+        self.borrowed = 0
+        self.used = time.monotonic()
+
+    @property
+    def connecting(self) -> bool:
+        return self.connection is None
+
+    @property
+    def healthy(self) -> bool:
+        return self.connecting or not self.connection.closed
+
+    def close(self) -> None:
+        for _, channel in self.idle:
+            _close(channel)
+        self.idle = []
+        if not self.connecting:
+            _close(self.connection)
+
+
+class ChannelPool(object):
+    """Thread-safe pool of rabbitpy connections keyed by connection string, lending out their channels.
+
+    Callers with the same connection string (see build_conn_string) share one connection, so a new
+    sender costs no TCP and TLS handshake. A connection lends at most ``max_channels`` channels at once
+    and at most ``max_connections`` are open, the least recently used one without lent channels being
+    closed to make room; ``acquire`` waits up to ``timeout`` seconds for room before raising PoolExhausted.
+    Channels and connections unused for ``idle_timeout`` seconds are closed on the next ``acquire`` or
+    by ``evict_idle``, and closed ones are replaced when found. Connections are opened outside the
+    pool's lock, so a slow broker only holds up the callers waiting for that connection.
+    """
+
+    def __init__(self, max_connections: int = MAX_CONNECTIONS, max_channels: int = MAX_CHANNELS,
+                 idle_timeout: float = IDLE_TIMEOUT, timeout: float = ACQUIRE_TIMEOUT):
+        self.max_connections = max_connections
+        self.max_channels = max_channels
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.__entries: Dict[str, _Entry] = {}
+        self.__lent: Dict[int, _Entry] = {}
+        self.__condition = threading.Condition()
+        self.__closed = False
+
+    def connection(self, conn_string: str) -> Any:
+        """The shared connection for ``conn_string``; it stays open while one of its channels is lent out."""
+        with self.__condition:
+            return self.__wait_for(conn_string, lambda entry: True).connection
+
+    def acquire(self, conn_string: str) -> Any:
+        with self.__condition:
+            entry = self.__wait_for(conn_string, lambda e: bool(e.idle) or e.borrowed < self.max_channels)
+            channel = None
+            while entry.idle and channel is None:
+                _, candidate = entry.idle.pop()
+                if candidate.closed:
+                    continue
+                channel = candidate
+            if channel is None:
+                channel = entry.connection.channel()
+            entry.borrowed += 1
+            entry.used = time.monotonic()
+            self.__lent[id(channel)] = entry
+            return channel
+
+    def release(self, channel: Any) -> None:
+        """Give back a channel from ``acquire``; a closed one, or one of a dropped connection, is discarded."""
+        with self.__condition:
+            entry = self.__lent.pop(id(channel), None)
+            if entry is None:
+                return
+            entry.borrowed -= 1
+            entry.used = time.monotonic()
+            pooled = not self.__closed and entry.healthy and any(e is entry for e in self.__entries.values())
+            if pooled and not channel.closed:
+                entry.idle.append((entry.used, channel))
+            else:
+                _close(channel)
+                if not pooled and entry.borrowed == 0:
+                    _close(entry.connection)
+            self.__condition.notify_all()
+
+    @contextmanager
+    def channel(self, conn_string: str) -> Iterator[Any]:
+        channel = self.acquire(conn_string)
+        try:
+            yield channel
+        finally:
+            self.release(channel)
+
+    def evict_idle(self) -> int:
+        """Close the channels and connections unused for ``idle_timeout`` seconds, returning how many."""
+        with self.__condition:
+            return self.__evict(time.monotonic() - self.idle_timeout)
+
+    def close(self) -> None:
+        """Close every pooled connection; channels still lent out are closed with their connection."""
+        with self.__condition:
+            self.__closed = True
+            for entry in self.__entries.values():
+                entry.close()
+            self.__entries.clear()
+            self.__lent.clear()
+            self.__condition.notify_all()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __enter__(self) -> 'ChannelPool':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __wait_for(self, conn_string: str, ready: Callable[[_Entry], bool]) -> _Entry:
+        deadline = time.monotonic() + self.timeout
+        while True:
+            if self.__closed:
+                raise ValueError('channel pool is closed')
+            self.__evict(time.monotonic() - self.idle_timeout)
+            entry = self.__entries.get(conn_string)
+            if entry is not None and not entry.healthy:
+                logging.debug('dropping closed connection to {}'.format(entry.connection.args.get('host')))
+                del self.__entries[conn_string]
+                entry.close()
+                entry = None
+            if entry is None and (len(self.__entries) < self.max_connections or self.__make_room()):
+                self.__connect(conn_string)
+                continue
+            if entry is not None and not entry.connecting and ready(entry):
+                return entry
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise PoolExhausted('no channel available within {}s'.format(self.timeout))
+            self.__condition.wait(remaining)
+
+    def __connect(self, conn_string: str) -> None:
+        """Open a connection without holding the lock, its slot reserved by a placeholder entry meanwhile."""
+        entry = _Entry()
+        self.__entries[conn_string] = entry
+        connection = None
+        self.__condition.release()
+        try:
+            connection = rabbitpy.Connection(conn_string)
+        finally:
+            self.__condition.acquire()
+            # the pool may have been closed, or the placeholder evicted, while connecting
+            if connection is not None and self.__entries.get(conn_string) is entry:
+                entry.connection = connection
+                entry.used = time.monotonic()
+            else:
+                if self.__entries.get(conn_string) is entry:
+                    del self.__entries[conn_string]
+                if connection is not None:
+                    _close(connection)
+            self.__condition.notify_all()
+
+    def __make_room(self) -> bool:
+        unused = [(e.used, k) for k, e in self.__entries.items() if e.borrowed == 0 and not e.connecting]
+        if not unused:
+            return False
+        self.__entries.pop(min(unused)[1]).close()
+        return True
+
+    def __evict(self, before: float) -> int:
+        evicted = 0
+        for key, entry in list(self.__entries.items()):
+            if entry.connecting:
+                continue
+            stale = [channel for used, channel in entry.idle if used < before]
+            entry.idle = [(used, channel) for used, channel in entry.idle if used >= before]
+            for channel in stale:
+                _close(channel)
+            evicted += len(stale)
+            if entry.borrowed == 0 and not entry.idle and entry.used < before:
+                del self.__entries[key]
+                entry.close()
+                evicted += 1
+        return evicted
+
+
+def _close(resource: Any) -> None:
+    try:
+        resource.close()
+    except Exception as e:
+        logging.debug('closing {} failed with {}'.format(type(resource).__name__, e))
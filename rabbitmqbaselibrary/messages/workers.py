@@ -0,0 +1,206 @@
+import logging
+import multiprocessing
+import os
+import queue as queues
+import signal
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import rabbitpy
+
+from rabbitmqbaselibrary.messages.codecs import decode
+
+PREFETCH = 10
+SHUTDOWN_TIMEOUT = 30.0
+POLL_INTERVAL = 0.2
+CANCEL_TIMEOUT = 5.0
+
+
+class WorkerStats(NamedTuple):
+    worker: int
+    processed: int
+    failed: int
+    busy: float
+    max_latency: float
+    error: Optional[str]
+
+
+class ConsumerStats(NamedTuple):
+    workers: List[WorkerStats]
+    elapsed: float
+
+    @property
+    def processed(self) -> int:
+        return sum(w.processed for w in self.workers)
+
+    @property
+    def failed(self) -> int:
+        return sum(w.failed for w in self.workers)
+
+    @property
+    def throughput(self) -> float:
+        """Messages handled per second, whether the handler succeeded or not."""
+        return (self.processed + self.failed) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        handled = self.processed + self.failed
+        return sum(w.busy for w in self.workers) / handled if handled else 0.0
+
+    @property
+    def max_latency(self) -> float:
+        return max((w.max_latency for w in self.workers), default=0.0)
+
+
+class ConsumerPool(object):
+    """Consumes a queue from ``workers`` processes, each with its own connection and ``prefetch``.
+
+    ``handler`` is called with the decoded body of every message; the message is acked when it
+    returns and requeued when it raises. It runs in the worker processes, so with the spawn start
+    method it must be importable, i.e. a module-level function. ``stop`` lets the workers finish the
+    message in hand, requeues what is prefetched and returns the stats gathered from every worker.
+
+    Nothing ever blocks on the shared stop event, only polls it: a process that dies while waiting on a
+    ``multiprocessing.Event`` stays counted as a sleeper and makes the next ``set`` hang forever.
+    ``context`` is the multiprocessing context the workers are started from, the default one if not given.
+    """
+
+    def __init__(self, conn_string: str, queue: str, handler: Callable[[Any], Any], workers: Optional[int] = None,
+                 prefetch: int = PREFETCH, context: Optional[Any] = None):
+        self.conn_string = conn_string
+        self.queue = queue
+        self.handler = handler
+        self.workers = workers or os.cpu_count() or 1
+        self.prefetch = prefetch
+        context = context or multiprocessing.get_context()
+        self.__stop = context.Event()
+        self.__results: Any = context.Queue()
+        self.__processes: List[Any] = []
+        self.__started = 0.0
+        self.__context = context
+
+    def start(self) -> None:
+        self.__started = time.monotonic()
+        for worker in range(self.workers):
+            process = self.__context.Process(target=_work, name='consumer-{}'.format(worker),
+                                             args=(worker, self.conn_string, self.queue, self.handler, self.prefetch,
+                                                   self.__stop, self.__results))
+            process.start()
+            self.__processes.append(process)
+        logging.info('{} consumers started on {}'.format(self.workers, self.queue))
+
+    def stop(self, timeout: float = SHUTDOWN_TIMEOUT) -> ConsumerStats:
+        """Stop the workers, terminating those still running after ``timeout`` seconds."""
+        self.__stop.set()
+        deadline = time.monotonic() + timeout
+        stats: Dict[int, WorkerStats] = {}
+        # read the stats before joining, a worker does not exit while its queue is not flushed
+        while len(stats) < len(self.__processes):
+            try:
+                worker_stats = self.__results.get(timeout=max(deadline - time.monotonic(), 0.01))
+            except queues.Empty:
+                break
+            stats[worker_stats.worker] = worker_stats
+        for worker, process in enumerate(self.__processes):
+            process.join(max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                process.terminate()
+                process.join()
+            if worker not in stats:
+                stats[worker] = WorkerStats(worker=worker, processed=0, failed=0, busy=0.0, max_latency=0.0,
+                                            error='exited with code {}'.format(process.exitcode))
+        result = ConsumerStats(workers=[stats[w] for w in sorted(stats)], elapsed=time.monotonic() - self.__started)
+        self.__processes = []
+        logging.info('{} messages consumed from {} ({} failed), {:.1f}/s, {:.3f}s mean latency'.format(
+            result.processed, self.queue, result.failed, result.throughput, result.mean_latency))
+        return result
+
+    def run(self, duration: Optional[float] = None) -> ConsumerStats:
+        """Consume until ``duration`` elapses, every worker exits, or SIGINT or SIGTERM is received."""
+        # the handler runs on the main thread, possibly while it waits; a thread event cannot deadlock there
+        terminated = threading.Event()
+        previous = None
+        if threading.current_thread() is threading.main_thread():
+            previous = signal.signal(signal.SIGTERM, lambda *args: terminated.set())
+        self.start()
+        deadline = None if duration is None else time.monotonic() + duration
+        try:
+            while not terminated.is_set() and any(p.is_alive() for p in self.__processes):
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                terminated.wait(0.5 if deadline is None else min(0.5, max(deadline - time.monotonic(), 0)))
+        except KeyboardInterrupt:
+            logging.info('interrupted, stopping consumers on {}'.format(self.queue))
+        finally:
+            if previous is not None:
+                signal.signal(signal.SIGTERM, previous)
+        return self.stop()
+
+    def __enter__(self) -> 'ConsumerPool':
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        if self.__processes:
+            self.stop()
+
+
+def _work(worker: int, conn_string: str, queue: str, handler: Callable[[Any], Any], prefetch: int, stop: Any,
+          results: Any) -> None:
+    if threading.current_thread() is threading.main_thread():
+        # the parent stops the workers through ``stop``, a Ctrl-C must not kill them mid-message
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+    tally = {'processed': 0, 'failed': 0, 'busy': 0.0, 'max_latency': 0.0}
+    error = None
+    try:
+        with rabbitpy.Connection(conn_string) as connection:
+            with connection.channel() as channel:
+                source = rabbitpy.Queue(channel, queue)
+                done = threading.Event()
+                threading.Thread(target=_cancel_on, args=(stop, done, source), daemon=True).start()
+                try:
+                    for message in source.consume(prefetch=prefetch):
+                        if stop.is_set():
+                            message.nack(requeue=True)
+                            continue
+                        _handle(message, handler, tally)
+                finally:
+                    done.set()
+    except Exception as e:
+        logging.error('consumer {} on {} failed with {}'.format(worker, queue, e))
+        error = str(e)
+    results.put(WorkerStats(worker=worker, processed=int(tally['processed']), failed=int(tally['failed']),
+                            busy=tally['busy'], max_latency=tally['max_latency'], error=error))
+
+
+def _handle(message: Any, handler: Callable[[Any], Any], tally: Dict[str, float]) -> None:
+    start = time.monotonic()
+    try:
+        handler(decode(message))
+    except Exception as e:
+        logging.warning('handler failed with {}, requeueing message {}'.format(e, message.delivery_tag))
+        message.nack(requeue=True)
+        tally['failed'] += 1
+    else:
+        message.ack()
+        tally['processed'] += 1
+    latency = time.monotonic() - start
+    tally['busy'] += latency
+    tally['max_latency'] = max(tally['max_latency'], latency)
+
+
+def _cancel_on(stop: Any, done: threading.Event, source: Any, timeout: float = CANCEL_TIMEOUT) -> None:
+    # poll rather than wait on ``stop``, see ConsumerPool; ``done`` is set once the worker stops consuming
+    while not stop.is_set():
+        if done.wait(POLL_INTERVAL):
+            return
+    # the consumer may still be registering when stop is set
+    deadline = time.monotonic() + timeout
+    while not source.consuming:
+        if done.wait(POLL_INTERVAL) or time.monotonic() >= deadline:
+            return
+    try:
+        source.stop_consuming()
+    except Exception as e:
+        logging.debug('cancelling consumer failed with {}'.format(e))
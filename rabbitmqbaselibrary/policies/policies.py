@@ -1,29 +1,56 @@
-import requests
-from pyramda import map, contains
+from typing import Iterator, List, Optional
 
+from pyramda import map
+
+from rabbitmqbaselibrary.common.client import get_json, http, invalidate
+from rabbitmqbaselibrary.common.exceptions import NotFoundException
 from rabbitmqbaselibrary.common.handlers import handle_rest_response, handle_rest_response_with_body
+from rabbitmqbaselibrary.common.pagination import iter_listing
+from rabbitmqbaselibrary.common.snapshot import TopologySnapshot
+
 
+def is_present(broker: dict, vhost: str, name: str, snapshot: Optional[TopologySnapshot] = None) -> bool:
+    if snapshot is not None:
+        return snapshot.contains('policies', {'vhost': vhost, 'name': name})
+    try:
+        get_policy_by_name(broker=broker, vhost=vhost, name=name, columns=['name'])
+        return True
+    except NotFoundException:
+        return False
 
-def is_present(broker: dict, vhost: str, name: str) -> bool:
-    return contains(name, get_policies(broker=broker, vhost=vhost))
+
+def get_policy_by_name(broker: dict, vhost: str, name: str, columns: Optional[List[str]] = None) -> dict:
+    url = 'https://{}/api/policies/{}/{}'.format(broker['host'], vhost, name)
+    params = None if columns is None else {'columns': ','.join(columns)}
+    return get_json(broker=broker, url=url, params=params)
 
 
 # noinspection PyDeepBugsSwappedArgs
 def get_policies(broker: dict, vhost: str) -> dict:
     url = 'https://{}/api/policies/{}'.format(broker['host'], vhost)
-    response = requests.get(url=url, auth=(broker['user'], broker['passwd']))
-    handle_rest_response(response=response, url=url)
-    return map(lambda i: i['name'], response.json())
+    return map(lambda i: i['name'], get_json(broker=broker, url=url))
+
+
+def iter_policies(broker: dict, vhost: str, name: Optional[str] = None, use_regex: bool = False) -> Iterator[str]:
+    url = 'https://{}/api/policies/{}'.format(broker['host'], vhost)
+    for item in iter_listing(broker=broker, url=url, name=name, use_regex=use_regex):
+        yield item['name']
 
 
 # noinspection PyDeepBugsSwappedArgs
 def create_policy(broker: dict, vhost: str, name: str, policy: dict) -> None:
     url = 'https://{}/api/policies/{}/{}'.format(broker['host'], vhost, name)
-    response = requests.put(url=url, auth=(broker['user'], broker['passwd']), json=policy)
+    response = http(broker).put(url=url, auth=(broker['user'], broker['passwd']), json=policy)
     handle_rest_response_with_body(response=response, body=policy, url=url)
+    invalidate(broker, *_cached_urls(broker=broker, vhost=vhost))
 
 
 def delete_policy(broker: dict, vhost: str, name: str) -> None:
     url = 'https://{}/api/policies/{}/{}'.format(broker['host'], vhost, name)
-    response = requests.delete(url=url, auth=(broker['user'], broker['passwd']))
+    response = http(broker).delete(url=url, auth=(broker['user'], broker['passwd']))
     handle_rest_response(response=response, url=url)
+    invalidate(broker, *_cached_urls(broker=broker, vhost=vhost))
+
+
+def _cached_urls(broker: dict, vhost: str) -> List[str]:
+    return ['https://{}/api/{}/{}'.format(broker['host'], r, vhost) for r in ['policies', 'definitions']]
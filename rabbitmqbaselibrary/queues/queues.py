@@ -1,28 +1,75 @@
-import requests
-from pyramda import map, contains
+from typing import Iterator, List, NamedTuple, Optional
 
+from pyramda import map
+
+from rabbitmqbaselibrary.common.client import get_json, http, invalidate
+from rabbitmqbaselibrary.common.exceptions import NotFoundException
 from rabbitmqbaselibrary.common.handlers import handle_rest_response, handle_rest_response_with_body
+from rabbitmqbaselibrary.common.listing import listing_params, to_record
+from rabbitmqbaselibrary.common.pagination import PAGE_SIZE, iter_pages
+from rabbitmqbaselibrary.common.snapshot import TopologySnapshot
+
+
+class QueueRecord(NamedTuple):
+    name: str
+    durable: bool
+    auto_delete: bool
+    type: Optional[str]
+    messages: Optional[int]
+    messages_ready: Optional[int]
+    messages_unacknowledged: Optional[int]
+
 
+def is_present(broker: dict, vhost: str, name: str, snapshot: Optional[TopologySnapshot] = None) -> bool:
+    if snapshot is not None:
+        return snapshot.contains('queues', {'vhost': vhost, 'name': name})
+    try:
+        get_queue_by_name(broker=broker, vhost=vhost, name=name, columns=['name'])
+        return True
+    except NotFoundException:
+        return False
 
-def is_present(broker: dict, vhost: str, name: str) -> bool:
-    return contains(name, get_queues(broker=broker, vhost=vhost))
+
+def get_queue_by_name(broker: dict, vhost: str, name: str, columns: Optional[List[str]] = None) -> dict:
+    url = 'https://{}/api/queues/{}/{}'.format(broker['host'], vhost, name)
+    params = None if columns is None else {'columns': ','.join(columns)}
+    return get_json(broker=broker, url=url, params=params)
 
 
 # noinspection PyDeepBugsSwappedArgs
 def get_queues(broker: dict, vhost: str) -> dict:
     url = 'https://{}/api/queues/{}'.format(broker['host'], vhost)
-    response = requests.get(url=url, auth=(broker['user'], broker['passwd']))
-    handle_rest_response(response=response, url=url)
-    return map(lambda i: i['name'], response.json())
+    return map(lambda i: i['name'], get_json(broker=broker, url=url, params=listing_params(['name'])))
+
+
+def list_queues(broker: dict, vhost: str) -> List[QueueRecord]:
+    url = 'https://{}/api/queues/{}'.format(broker['host'], vhost)
+    params = listing_params(QueueRecord._fields, queue_totals=True)
+    return map(lambda i: to_record(QueueRecord, i), get_json(broker=broker, url=url, params=params))
+
+
+def iter_queues(broker: dict, vhost: str, page_size: int = PAGE_SIZE, name: Optional[str] = None,
+                use_regex: bool = False) -> Iterator[str]:
+    url = 'https://{}/api/queues/{}'.format(broker['host'], vhost)
+    for item in iter_pages(broker=broker, url=url, page_size=page_size, name=name, use_regex=use_regex,
+                           params=listing_params(['name'])):
+        yield item['name']
 
 
 def create_queue(broker: dict, vhost: str, name: str, queue: dict) -> None:
     url = 'https://{}/api/queues/{}/{}'.format(broker['host'], vhost, name)
-    response = requests.put(url=url, auth=(broker['user'], broker['passwd']), json=queue)
+    response = http(broker).put(url=url, auth=(broker['user'], broker['passwd']), json=queue)
     handle_rest_response_with_body(response=response, url=url, body=queue)
+    invalidate(broker, *_cached_urls(broker=broker, vhost=vhost))
 
 
 def delete_queue(broker: dict, vhost: str, name: str) -> None:
     url = 'https://{}/api/queues/{}/{}'.format(broker['host'], vhost, name)
-    response = requests.delete(url=url, auth=(broker['user'], broker['passwd']))
+    response = http(broker).delete(url=url, auth=(broker['user'], broker['passwd']))
     handle_rest_response(response=response, url=url)
+    invalidate(broker, *_cached_urls(broker=broker, vhost=vhost, bindings=True))
+
+
+def _cached_urls(broker: dict, vhost: str, bindings: bool = False) -> List[str]:
+    resources = ['queues', 'definitions'] + (['bindings', 'exchanges'] if bindings else [])
+    return ['https://{}/api/{}/{}'.format(broker['host'], r, vhost) for r in resources]
@@ -0,0 +1,215 @@
+import logging
+from typing import Dict, Hashable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from rabbitmqbaselibrary.bindings.bindings import Binding, create_binding, delete_binding, get_bindings
+from rabbitmqbaselibrary.common.keys import freeze, index_resources
+from rabbitmqbaselibrary.definitions.definitions import live_fingerprint, read_definitions
+from rabbitmqbaselibrary.exchanges.exchanges import create_exchange, delete_exchange
+from rabbitmqbaselibrary.history.history import History
+from rabbitmqbaselibrary.policies.policies import create_policy, delete_policy
+from rabbitmqbaselibrary.queues.queues import create_queue, delete_queue
+
+CREATE = 'create'
+UPDATE = 'update'
+RECREATE = 'recreate'
+DELETE = 'delete'
+
+# resource classes a vhost reconcile owns, in creation order
+KINDS = ['exchanges', 'queues', 'bindings', 'policies']
+
+# attributes compared between desired and current state, with the defaults the broker applies
+ATTRIBUTES: Dict[str, Dict[str, object]] = {
+    'exchanges': {'type': 'direct', 'durable': True, 'auto_delete': False, 'internal': False, 'arguments': {}},
+    'queues': {'durable': True, 'auto_delete': False, 'arguments': {}},
+    'bindings': {},
+    'policies': {'pattern': None, 'definition': {}, 'priority': 0, 'apply-to': 'all'},
+}
+
+
+class Change(NamedTuple):
+    action: str
+    kind: str
+    key: Hashable
+    desired: Optional[dict]
+    current: Optional[dict]
+
+    @property
+    def name(self) -> str:
+        item = self.desired if self.desired is not None else self.current
+        if self.kind == 'bindings':
+            return '{}->{}'.format(item['source'], item['destination'])  # type: ignore
+        return str(item['name'])  # type: ignore
+
+
+class Plan(object):
+    """Ordered changes turning the current state of a vhost into the desired one.
+
+    ``conflicts`` holds queues and exchanges whose properties differ but which the broker
+    cannot update in place; they only move into ``changes`` when planning with ``recreate``.
+    """
+
+    def __init__(self, changes: List[Change], conflicts: List[Change]):
+        self.changes = changes
+        self.conflicts = conflicts
+
+    def __iter__(self) -> Iterator[Change]:
+        return iter(self.changes)
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def is_empty(self) -> bool:
+        return not self.changes
+
+    def summary(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for change in self.changes:
+            label = '{} {}'.format(change.action, change.kind)
+            counts[label] = counts.get(label, 0) + 1
+        return counts
+
+
+def diff(desired: dict, current: dict, prune: bool = False, recreate: bool = False) -> Plan:
+    """Compare two definitions documents of one vhost by natural key.
+
+    Resources missing from ``current`` are created and changed ones updated. Resources only in
+    ``current`` are deleted when ``prune`` is set, otherwise left alone.
+    """
+    found: Dict[str, List[Change]] = {kind: [] for kind in KINDS}
+    conflicts: List[Change] = []
+    for kind in KINDS:
+        wanted = index_resources(kind, [_local(i) for i in desired.get(kind, [])])
+        existing = index_resources(kind, [_local(i) for i in current.get(kind, [])])
+        for key, item in wanted.items():
+            present = existing.get(key)
+            if present is None:
+                found[kind].append(Change(CREATE, kind, key, item, None))
+            elif _state(kind, item) != _state(kind, present):
+                if kind == 'policies':
+                    found[kind].append(Change(UPDATE, kind, key, item, present))
+                elif recreate:
+                    found[kind].append(Change(RECREATE, kind, key, item, present))
+                else:
+                    conflicts.append(Change(RECREATE, kind, key, item, present))
+        if prune:
+            found[kind].extend(Change(DELETE, kind, key, None, item)
+                               for key, item in existing.items() if key not in wanted)
+    found['bindings'].extend(_dropped_bindings(desired, current, found))
+    for conflict in conflicts:
+        logging.warning('{} {} differs from desired state and needs recreating'.format(conflict.kind, conflict.name))
+    deletes = [c for kind in reversed(KINDS) for c in found[kind] if c.action == DELETE]
+    others = [c for kind in KINDS for c in found[kind] if c.action != DELETE]
+    return Plan(changes=deletes + others, conflicts=conflicts)
+
+
+def plan(broker: dict, vhost: str, desired: dict, prune: bool = False, recreate: bool = False) -> Plan:
+    current = read_definitions(broker=broker, vhost=vhost)
+    return diff(desired=desired, current=current, prune=prune, recreate=recreate)
+
+
+def apply(broker: dict, vhost: str, changes: Plan) -> None:
+    """Execute a plan in order; the first failing change raises and stops the rest."""
+    deleted = [c for c in changes if c.kind == 'bindings' and c.action == DELETE]
+    keyed: Dict[tuple, Binding] = {b.key(): b for b in get_bindings(broker=broker, vhost=vhost)} if deleted else {}
+    for change in changes:
+        _execute(broker=broker, vhost=vhost, change=change, bindings=keyed)
+    logging.info('{} changes applied to {}'.format(len(changes), vhost))
+
+
+def reconcile(broker: dict, vhost: str, desired: dict, prune: bool = False, recreate: bool = False) -> Plan:
+    changes = plan(broker=broker, vhost=vhost, desired=desired, prune=prune, recreate=recreate)
+    if changes.is_empty():
+        logging.debug('{} already matches desired state'.format(vhost))
+    else:
+        apply(broker=broker, vhost=vhost, changes=changes)
+    return changes
+
+
+def sync(broker: dict, vhost: str, desired: dict, history: History, prune: bool = False,
+         recreate: bool = False) -> Plan:
+    """Reconcile against the snapshot stored by the previous sync instead of the live definitions.
+
+    The snapshot is only trusted while the vhost's live fingerprint still matches the one recorded
+    with it; otherwise, and on the first sync, the live definitions are fetched as in reconcile.
+    """
+    fingerprint = live_fingerprint(broker=broker, vhost=vhost)
+    stored = history.get_snapshot(broker=broker['host'], vhost=vhost)
+    if stored is not None and stored[1] == fingerprint:
+        base = stored[0]
+    else:
+        logging.debug('no usable snapshot for {}, reading live definitions'.format(vhost))
+        base = read_definitions(broker=broker, vhost=vhost)
+    changes = diff(desired=desired, current=base, prune=prune, recreate=recreate)
+    if not changes.is_empty():
+        apply(broker=broker, vhost=vhost, changes=changes)
+        fingerprint = live_fingerprint(broker=broker, vhost=vhost)
+    history.save_snapshot(broker=broker['host'], vhost=vhost, snapshot=_applied_state(desired, base, changes, prune),
+                          fingerprint=fingerprint)
+    return changes
+
+
+def _applied_state(desired: dict, base: dict, changes: Plan, prune: bool) -> dict:
+    """Resources a vhost holds after ``changes`` were applied to ``base``.
+
+    That is the desired ones, except conflicts which stay as they were, plus anything left unpruned.
+    """
+    kept: Dict[Tuple[str, Hashable], dict] = {(c.kind, c.key): c.current for c in changes.conflicts if c.current}
+    state: Dict[str, List[dict]] = {}
+    for kind in KINDS:
+        wanted = index_resources(kind, [_local(i) for i in desired.get(kind, [])])
+        state[kind] = [kept.get((kind, key), item) for key, item in wanted.items()]
+        if not prune:
+            state[kind].extend(item for key, item in index_resources(kind, [_local(i) for i in base.get(kind, [])]).items()
+                               if key not in wanted)
+    return state
+
+
+def _execute(broker: dict, vhost: str, change: Change, bindings: Dict[tuple, Binding]) -> None:
+    if change.kind == 'bindings':
+        if change.action == DELETE:
+            binding = Binding(change.current)  # type: ignore
+            delete_binding(broker=broker, vhost=vhost, binding=bindings.get(binding.key(), binding))
+        else:
+            create_binding(broker=broker, vhost=vhost, binding=Binding(change.desired))  # type: ignore
+        return
+    if change.action in (DELETE, RECREATE):
+        {'exchanges': delete_exchange, 'queues': delete_queue, 'policies': delete_policy}[change.kind](
+            broker=broker, vhost=vhost, name=change.name)
+    if change.action != DELETE:
+        body = _body(change.kind, change.desired)  # type: ignore
+        if change.kind == 'exchanges':
+            create_exchange(broker=broker, vhost=vhost, name=change.name, exchange=body)
+        elif change.kind == 'queues':
+            create_queue(broker=broker, vhost=vhost, name=change.name, queue=body)
+        else:
+            create_policy(broker=broker, vhost=vhost, name=change.name, policy=body)
+
+
+def _dropped_bindings(desired: dict, current: dict, found: Dict[str, List[Change]]) -> List[Change]:
+    """Bindings that already exist but go away with a recreated queue or exchange."""
+    recreated: Set[Tuple[str, str]] = set()
+    for kind, destination_type in (('exchanges', 'exchange'), ('queues', 'queue')):
+        recreated.update((destination_type, c.name) for c in found[kind] if c.action == RECREATE)
+    if not recreated:
+        return []
+    planned = set(c.key for c in found['bindings'])
+    existing = index_resources('bindings', [_local(i) for i in current.get('bindings', [])])
+    dropped: List[Change] = []
+    for key, item in index_resources('bindings', [_local(i) for i in desired.get('bindings', [])]).items():
+        touched = ('exchange', item.get('source')) in recreated or \
+            (item.get('destination_type'), item.get('destination')) in recreated
+        if touched and key in existing and key not in planned:
+            dropped.append(Change(CREATE, 'bindings', key, item, None))
+    return dropped
+
+
+def _local(item: dict) -> dict:
+    return {k: v for k, v in item.items() if k != 'vhost'}
+
+
+def _state(kind: str, item: dict) -> object:
+    return freeze(_body(kind, item))
+
+
+def _body(kind: str, item: dict) -> dict:
+    return {attribute: item.get(attribute, default) for attribute, default in ATTRIBUTES[kind].items()}
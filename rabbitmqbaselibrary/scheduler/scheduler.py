@@ -0,0 +1,218 @@
+import json
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from rabbitmqbaselibrary.bindings.bindings import Binding, create_binding
+from rabbitmqbaselibrary.exchanges.exchanges import create_exchange
+from rabbitmqbaselibrary.policies.policies import create_policy
+from rabbitmqbaselibrary.queues.queues import create_queue
+from rabbitmqbaselibrary.users.users import add_permissions, create_user
+from rabbitmqbaselibrary.vhost.vhost import create_vhost
+
+MAX_WORKERS = 8
+
+
+class Step(NamedTuple):
+    id: str
+    action: Callable[[], Any]
+    depends: Set[str]
+
+
+class StepResult(NamedTuple):
+    id: str
+    started: float
+    finished: float
+    error: Optional[BaseException]
+    result: Any = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started
+
+
+class SkippedStep(Exception):
+    def __init__(self, step: str, failed: str):
+        super().__init__('{} skipped, it depends on failed step {}'.format(step, failed))
+        self.failed = failed
+
+
+class PlanReport(object):
+    def __init__(self, results: Dict[str, StepResult], depends: Dict[str, Set[str]], elapsed: float):
+        self.results = results
+        self.elapsed = elapsed
+        self.__depends = depends
+
+    @property
+    def ok(self) -> bool:
+        return all(r.ok for r in self.results.values())
+
+    def failed(self) -> List[StepResult]:
+        return [r for r in self.results.values() if not r.ok]
+
+    def critical_path(self) -> List[str]:
+        """Chain of dependent steps whose summed durations bound the plan's run time."""
+        longest: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for step in topological_order(self.__depends):
+            before = max(self.__depends[step], key=lambda d: longest[d], default=None)
+            longest[step] = self.results[step].duration + (longest[before] if before is not None else 0.0)
+            previous[step] = before
+        path: List[str] = []
+        last = max(longest, key=lambda s: longest[s], default=None)
+        while last is not None:
+            path.insert(0, last)
+            last = previous[last]
+        return path
+
+
+class ProvisioningPlan(object):
+    """Provisioning steps of one broker, run as a DAG with as much parallelism as their dependencies allow.
+
+    Each step result keeps what its action returned, e.g. the password generated for a user. Bindings wait for their exchanges and queues, permissions for their vhost and user, and every
+    vhost scoped resource for its vhost. A dependency not added to the plan is taken as existing.
+    """
+
+    def __init__(self, broker: dict):
+        self.broker = broker
+        self.__steps: Dict[str, Step] = {}
+
+    def add(self, step_id: str, action: Callable[[], Any], depends: Iterable[str] = ()) -> str:
+        if step_id in self.__steps:
+            raise ValueError('step {} already in plan'.format(step_id))
+        self.__steps[step_id] = Step(id=step_id, action=action, depends=set(depends))
+        return step_id
+
+    def vhost(self, vhost: str) -> str:
+        return self.add('vhost:{}'.format(vhost), lambda: create_vhost(broker=self.broker, vhost=vhost))
+
+    def user(self, name: str, pass_flag: bool, **kwargs: Any) -> str:
+        return self.add('user:{}'.format(name),
+                        lambda: create_user(broker=self.broker, name=name, pass_flag=pass_flag, **kwargs))
+
+    def permissions(self, vhost: str, user: str, permissions: dict) -> str:
+        return self.add('permissions:{}/{}'.format(vhost, user),
+                        lambda: add_permissions(broker=self.broker, vhost=vhost, user=user, permissions=permissions),
+                        depends=['vhost:{}'.format(vhost), 'user:{}'.format(user)])
+
+    def exchange(self, vhost: str, name: str, exchange: dict) -> str:
+        return self.add('exchange:{}/{}'.format(vhost, name),
+                        lambda: create_exchange(broker=self.broker, vhost=vhost, name=name, exchange=exchange),
+                        depends=['vhost:{}'.format(vhost)])
+
+    def queue(self, vhost: str, name: str, queue: dict) -> str:
+        return self.add('queue:{}/{}'.format(vhost, name),
+                        lambda: create_queue(broker=self.broker, vhost=vhost, name=name, queue=queue),
+                        depends=['vhost:{}'.format(vhost)])
+
+    def binding(self, vhost: str, binding: Binding) -> str:
+        destination = 'exchange' if binding.destination_type == 'exchange' else 'queue'
+        # headers exchange bindings may differ by their arguments only
+        arguments = json.dumps(binding.arguments, sort_keys=True) if binding.arguments else ''
+        step_id = 'binding:{}/{}->{}:{}/{}{}'.format(vhost, binding.source, destination, binding.destination,
+                                                     binding.routing_key, arguments)
+        return self.add(step_id,
+                        lambda: create_binding(broker=self.broker, vhost=vhost, binding=binding),
+                        depends=['vhost:{}'.format(vhost), 'exchange:{}/{}'.format(vhost, binding.source),
+                                 '{}:{}/{}'.format(destination, vhost, binding.destination)])
+
+    def policy(self, vhost: str, name: str, policy: dict) -> str:
+        return self.add('policy:{}/{}'.format(vhost, name),
+                        lambda: create_policy(broker=self.broker, vhost=vhost, name=name, policy=policy),
+                        depends=['vhost:{}'.format(vhost)])
+
+    def __len__(self) -> int:
+        return len(self.__steps)
+
+    def run(self, max_workers: int = MAX_WORKERS) -> PlanReport:
+        """Run every step once its dependencies succeeded; dependents of a failed step are skipped."""
+        depends = {s.id: s.depends & set(self.__steps) for s in self.__steps.values()}
+        topological_order(depends)
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = _Execution(self.__steps, depends, executor).run()
+        report = PlanReport(results=results, depends=depends, elapsed=time.monotonic() - start)
+        _log_report(report)
+        return report
+
+
+class _Execution(object):
+    def __init__(self, steps: Dict[str, Step], depends: Dict[str, Set[str]], executor: ThreadPoolExecutor):
+        self.__steps = steps
+        self.__executor = executor
+        self.__waiting = {step: len(requires) for step, requires in depends.items()}
+        self.__dependents: Dict[str, List[str]] = {step: [] for step in depends}
+        for step, requires in depends.items():
+            for required in requires:
+                self.__dependents[required].append(step)
+        self.__running: Dict[Future, str] = {}
+        self.__results: Dict[str, StepResult] = {}
+
+    def run(self) -> Dict[str, StepResult]:
+        for step_id in [s for s, count in self.__waiting.items() if count == 0]:
+            self.__submit(step_id)
+        while self.__running:
+            done, _ = wait(list(self.__running), return_when=FIRST_COMPLETED)
+            for future in done:
+                del self.__running[future]
+                self.__finish(future.result())
+        return self.__results
+
+    def __submit(self, step_id: str) -> None:
+        self.__running[self.__executor.submit(_timed, self.__steps[step_id])] = step_id
+
+    def __finish(self, result: StepResult) -> None:
+        self.__results[result.id] = result
+        for dependent in self.__dependents[result.id]:
+            if not result.ok:
+                self.__skip(dependent, result.id)
+                continue
+            self.__waiting[dependent] -= 1
+            if self.__waiting[dependent] == 0 and dependent not in self.__results:
+                self.__submit(dependent)
+
+    def __skip(self, step_id: str, failed: str) -> None:
+        if step_id in self.__results:
+            return
+        now = time.monotonic()
+        self.__results[step_id] = StepResult(step_id, now, now, SkippedStep(step_id, failed))
+        for dependent in self.__dependents[step_id]:
+            self.__skip(dependent, failed)
+
+
+def _timed(step: Step) -> StepResult:
+    started = time.monotonic()
+    try:
+        result = step.action()
+        return StepResult(step.id, started, time.monotonic(), None, result)
+    except Exception as e:
+        logging.debug('step {} failed: {}'.format(step.id, e))
+        return StepResult(step.id, started, time.monotonic(), e)
+
+
+def topological_order(depends: Dict[str, Set[str]]) -> List[str]:
+    """Steps ordered so each comes after all it depends on; raises ValueError on a cycle."""
+    remaining = {step: set(requires) for step, requires in depends.items()}
+    order: List[str] = []
+    while remaining:
+        ready = [step for step, requires in remaining.items() if not requires]
+        if not ready:
+            raise ValueError('plan has a dependency cycle between {}'.format(', '.join(sorted(remaining))))
+        for step in ready:
+            del remaining[step]
+        for requires in remaining.values():
+            requires.difference_update(ready)
+        order.extend(ready)
+    return order
+
+
+def _log_report(report: PlanReport) -> None:
+    for result in sorted(report.results.values(), key=lambda r: r.started):
+        logging.debug('{} {} in {:.3f}s'.format(result.id, 'done' if result.ok else 'failed', result.duration))
+    logging.info('plan of {} steps ran in {:.3f}s, {} failed, critical path: {}'.format(
+        len(report.results), report.elapsed, len(report.failed()), ' -> '.join(report.critical_path())))
@@ -2,13 +2,16 @@ import base64
 import hashlib
 import os
 import random
-from typing import Any
+from typing import Any, Iterator, List, NamedTuple, Optional, Union
 
-import requests
 from pyramda import map, keys
 
+from rabbitmqbaselibrary.common.client import get_json, http, invalidate
 from rabbitmqbaselibrary.common.exceptions import NotValidPermissions, NotFoundException, UserAlreadyExists
 from rabbitmqbaselibrary.common.handlers import handle_rest_response_with_body, handle_rest_response
+from rabbitmqbaselibrary.common.listing import listing_params, to_record
+from rabbitmqbaselibrary.common.pagination import iter_listing
+from rabbitmqbaselibrary.common.snapshot import TopologySnapshot
 
 AUTOGENERATED = True
 
@@ -17,6 +20,11 @@ pass_chars = "abcdefghijklmnopqrstuvwxyz01234567890ABCDEFGHIJKLMNOPQRSTUVWXYZ!;#
 salt = os.urandom(4)
 
 
+class UserRecord(NamedTuple):
+    name: str
+    tags: Union[str, List[str], None]
+
+
 def autogenerate_password() -> str:
     return "".join(random.sample(pass_chars, 10))
 
@@ -28,7 +36,9 @@ def salt_hashing_passwd(passwd: str) -> str:
     return str(base64.b64encode(salt + tmp1).decode(encoding='UTF-8'))
 
 
-def is_present(broker: dict, name: str) -> bool:
+def is_present(broker: dict, name: str, snapshot: Optional[TopologySnapshot] = None) -> bool:
+    if snapshot is not None:
+        return snapshot.contains('users', {'name': name})
     try:
         result = get_user_by_name(broker=broker, name=name)
         return True if result.get('name') == name else False
@@ -38,16 +48,26 @@ def is_present(broker: dict, name: str) -> bool:
 
 def get_user_by_name(broker: dict, name: str) -> dict:
     url = 'https://{}/api/users/{}'.format(broker['host'], name)
-    response = requests.get(url=url, auth=(broker['user'], broker['passwd']))
-    handle_rest_response(response=response, url=url)
-    return response.json()
+    return get_json(broker=broker, url=url)
 
 
 def get_users(broker: dict) -> dict:
     url = 'https://{}/api/users'.format(broker['host'])
-    response = requests.get(url=url, auth=(broker['user'], broker['passwd']))
-    handle_rest_response(response=response, url=url)
-    return map(lambda i: i['name'], response.json())
+    params = listing_params(['name'], disable_stats=False)
+    return map(lambda i: i['name'], get_json(broker=broker, url=url, params=params))
+
+
+def list_users(broker: dict) -> List[UserRecord]:
+    url = 'https://{}/api/users'.format(broker['host'])
+    params = listing_params(UserRecord._fields, disable_stats=False)
+    return map(lambda i: to_record(UserRecord, i), get_json(broker=broker, url=url, params=params))
+
+
+def iter_users(broker: dict, name: Optional[str] = None, use_regex: bool = False) -> Iterator[str]:
+    url = 'https://{}/api/users'.format(broker['host'])
+    for item in iter_listing(broker=broker, url=url, name=name, use_regex=use_regex,
+                             params=listing_params(['name'], disable_stats=False)):
+        yield item['name']
 
 
 def create_user(broker: dict, name: str, pass_flag: bool, **kwargs: Any) -> str:
@@ -56,15 +76,17 @@ def create_user(broker: dict, name: str, pass_flag: bool, **kwargs: Any) -> str:
     url = 'https://{}/api/users/{}'.format(broker['host'], name)
     tags = '' if kwargs.get('tags') is None else kwargs.get('tags')
     body = {'password_hash': hashed_passwd, 'tags': tags}
-    response = requests.put(url=url, auth=(broker['user'], broker['passwd']), json=body)
+    response = http(broker).put(url=url, auth=(broker['user'], broker['passwd']), json=body)
     handle_rest_response_with_body(response=response, url=url, body=body)
+    invalidate(broker, 'https://{}/api/users'.format(broker['host']))
     return passwd
 
 
 def delete_user(broker: dict, name: str) -> None:
     url = 'https://{}/api/users/{}'.format(broker['host'], name)
-    response = requests.delete(url=url, auth=(broker['user'], broker['passwd']))
+    response = http(broker).delete(url=url, auth=(broker['user'], broker['passwd']))
     handle_rest_response(response=response, url=url)
+    invalidate(broker, 'https://{}/api/users'.format(broker['host']), 'https://{}/api/permissions'.format(broker['host']))
 
 
 def add_permissions(broker: dict, vhost: str, user: str, permissions: dict) -> None:
@@ -72,25 +94,39 @@ def add_permissions(broker: dict, vhost: str, user: str, permissions: dict) -> N
     if not ('write' in kk and 'read' in kk and 'configure' in kk):
         raise NotValidPermissions('permissions are not complete', permissions)
     url = 'https://{}/api/permissions/{}/{}'.format(broker['host'], vhost, user)
-    response = requests.put(url=url, auth=(broker['user'], broker['passwd']), json=permissions)
+    response = http(broker).put(url=url, auth=(broker['user'], broker['passwd']), json=permissions)
     handle_rest_response_with_body(response=response, url=url, body=permissions)
+    invalidate(broker, url, 'https://{}/api/definitions/{}'.format(broker['host'], vhost))
 
 
 def delete_permissions(broker: dict, vhost: str, user: str) -> None:
     url = 'https://{}/api/permissions/{}/{}'.format(broker['host'], vhost, user)
-    response = requests.delete(url=url, auth=(broker['user'], broker['passwd']))
+    response = http(broker).delete(url=url, auth=(broker['user'], broker['passwd']))
     handle_rest_response(response=response, url=url)
+    invalidate(broker, url, 'https://{}/api/definitions/{}'.format(broker['host'], vhost))
+
+
+def has_permissions(broker: dict, vhost: str, user: str, snapshot: Optional[TopologySnapshot] = None) -> bool:
+    if snapshot is not None:
+        return snapshot.contains('permissions', {'vhost': vhost, 'user': user})
+    try:
+        get_permissions(broker=broker, vhost=vhost, user=user)
+        return True
+    except NotFoundException:
+        return False
 
 
 def get_permissions(broker: dict, vhost: str, user: str) -> dict:
     url = 'https://{}/api/permissions/{}/{}'.format(broker['host'], vhost, user)
-    response = requests.get(url=url, auth=(broker['user'], broker['passwd']))
-    handle_rest_response(response=response, url=url)
-    return response.json()
+    return get_json(broker=broker, url=url)
 
 
 def safe_create_user(broker: dict, name: str, pass_flag: bool, **kwargs: Any) -> str:
-    if not is_present(broker=broker, name=name):
-        return create_user(broker=broker, name=name, pass_flag=pass_flag, **kwargs)
+    snapshot: Optional[TopologySnapshot] = kwargs.pop('snapshot', None)
+    if not is_present(broker=broker, name=name, snapshot=snapshot):
+        passwd = create_user(broker=broker, name=name, pass_flag=pass_flag, **kwargs)
+        if snapshot is not None:
+            snapshot.add('users', {'name': name})
+        return passwd
     else:
         raise UserAlreadyExists(user=name)
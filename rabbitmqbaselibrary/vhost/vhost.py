@@ -1,35 +1,65 @@
+from typing import Iterator, List, Optional
+
 import requests
-from pyramda import map, contains
+from pyramda import map
 
-from rabbitmqbaselibrary.common.exceptions import ServerErrorException, VhostNotFound, VhostAlreadyExists
+from rabbitmqbaselibrary.common.client import get_json, http, invalidate, invalidate_vhost
+from rabbitmqbaselibrary.common.exceptions import ServerErrorException, VhostNotFound, VhostAlreadyExists, \
+    NotFoundException
 from rabbitmqbaselibrary.common.handlers import handle_rest_response
+from rabbitmqbaselibrary.common.pagination import PAGE_SIZE, iter_pages
+from rabbitmqbaselibrary.common.snapshot import TopologySnapshot
+
 
+def is_present(broker: dict, vhost: str, snapshot: Optional[TopologySnapshot] = None) -> bool:
+    if snapshot is not None:
+        return snapshot.contains('vhosts', {'name': vhost})
+    try:
+        get_vhost_by_name(broker=broker, vhost=vhost, columns=['name'])
+        return True
+    except NotFoundException:
+        return False
 
-def is_present(broker: dict, vhost: str) -> bool:
-    return contains(vhost, get_vhosts(broker=broker))
+
+def get_vhost_by_name(broker: dict, vhost: str, columns: Optional[List[str]] = None) -> dict:
+    url = 'https://{}/api/vhosts/{}'.format(broker['host'], vhost)
+    params = None if columns is None else {'columns': ','.join(columns)}
+    return get_json(broker=broker, url=url, params=params)
 
 
 def get_vhosts(broker: dict) -> dict:
     url = 'https://{}/api/vhosts'.format(broker['host'])
-    response: requests.Response = requests.get(url=url, auth=(broker['user'], broker['passwd']))
+    return map(lambda i: i['name'], get_json(broker=broker, url=url, handler=_handle_vhosts_response))
+
+
+def _handle_vhosts_response(response: requests.Response, url: str) -> None:
     if not response.ok:
         # noinspection PyTypeChecker
         raise ServerErrorException(str(response.status_code), url=url)
-    return map(lambda i: i['name'], response.json())
+
+
+def iter_vhosts(broker: dict, page_size: int = PAGE_SIZE, name: Optional[str] = None,
+                use_regex: bool = False) -> Iterator[str]:
+    url = 'https://{}/api/vhosts'.format(broker['host'])
+    for item in iter_pages(broker=broker, url=url, page_size=page_size, name=name, use_regex=use_regex):
+        yield item['name']
 
 
 def create_vhost(broker: dict, vhost: str) -> None:
     if is_present(broker=broker, vhost=vhost):
         raise VhostAlreadyExists(vhost)
     url = 'https://{}/api/vhosts/{}'.format(broker['host'], vhost)
-    response = requests.put('https://{}/api/vhosts/{}'.format(broker['host'], vhost),
-                            auth=(broker['user'], broker['passwd']))
+    response = http(broker).put('https://{}/api/vhosts/{}'.format(broker['host'], vhost),
+                                auth=(broker['user'], broker['passwd']))
     handle_rest_response(response=response, url=url)
+    invalidate(broker, 'https://{}/api/vhosts'.format(broker['host']))
 
 
 def delete_vhost(broker: dict, vhost: str) -> None:
     if not is_present(broker=broker, vhost=vhost):
         raise VhostNotFound(vhost)
     url = 'https://{}/api/vhosts/{}'.format(broker['host'], vhost)
-    response = requests.delete(url, auth=(broker['user'], broker['passwd']))
+    response = http(broker).delete(url, auth=(broker['user'], broker['passwd']))
     handle_rest_response(response=response, url=url)
+    invalidate(broker, 'https://{}/api/vhosts'.format(broker['host']))
+    invalidate_vhost(broker=broker, vhost=vhost)
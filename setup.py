@@ -7,15 +7,24 @@ setup(
     url="https://github.com/davengeo/rabbitme-base-library",
     name="rabbitmq-base-library",
     packages=['rabbitmqbaselibrary',
+              'rabbitmqbaselibrary.aio',
               'rabbitmqbaselibrary.history',
               'rabbitmqbaselibrary.bindings',
+              'rabbitmqbaselibrary.bulk',
+              'rabbitmqbaselibrary.cli',
               'rabbitmqbaselibrary.common',
               'rabbitmqbaselibrary.definitions',
+              'rabbitmqbaselibrary.diff',
               'rabbitmqbaselibrary.exchanges',
+              'rabbitmqbaselibrary.export',
               'rabbitmqbaselibrary.messages',
               'rabbitmqbaselibrary.policies',
               'rabbitmqbaselibrary.queues',
+              'rabbitmqbaselibrary.reconcile',
+              'rabbitmqbaselibrary.scheduler',
               'rabbitmqbaselibrary.users',
               'rabbitmqbaselibrary.vhost'],
     install_requires=['requests', 'argparse', 'pyramda', 'rabbitpy'],
+    extras_require={'aio': ['aiohttp'], 'zstd': ['zstandard'], 'orjson': ['orjson'], 'msgpack': ['msgpack']},
+    entry_points={'console_scripts': ['rabbitmq-base=rabbitmqbaselibrary.cli.cli:main']},
 )
@@ -0,0 +1,122 @@
+import asyncio
+from typing import Any, List
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import requests
+from assertpy import assert_that, fail
+
+aiohttp = pytest.importorskip('aiohttp')
+
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+
+from rabbitmqbaselibrary.aio import bindings, queues, vhost  # noqa: E402
+from rabbitmqbaselibrary.aio.client import AsyncBrokerClient  # noqa: E402
+from rabbitmqbaselibrary.bindings.bindings import Binding  # noqa: E402
+from rabbitmqbaselibrary.common.exceptions import BadRequest, VhostAlreadyExists  # noqa: E402
+from rabbitmqbaselibrary.common.throttling import AsyncAdaptiveLimiter  # noqa: E402
+from ..common.fixtures import fake_broker  # noqa: E402
+
+
+def response(status: int, content: bytes = b'{}') -> requests.Response:
+    r = requests.Response()
+    r.status_code = status
+    r._content = content
+    return r
+
+
+def test_should_cap_requests_in_flight() -> None:
+    in_flight: List[int] = [0, 0]
+
+    async def handler(request: web.Request) -> web.Response:
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight)
+        await asyncio.sleep(0.02)
+        in_flight[0] -= 1
+        return web.json_response([{'name': 'one'}])
+
+    async def scenario() -> List[Any]:
+        app = web.Application()
+        app.router.add_get('/api/queues/EA', handler)
+        async with TestServer(app) as server:
+            async with AsyncBrokerClient(fake_broker(), concurrency=2) as client:
+                url = str(server.make_url('/api/queues/EA'))
+                return list(await asyncio.gather(*[client.request('GET', url) for _ in range(6)]))
+
+    results = asyncio.run(scenario())
+    assert_that([r.json() for r in results]).is_equal_to([[{'name': 'one'}]] * 6)
+    assert_that(results[0].ok).is_true()
+    assert_that(in_flight[1]).is_equal_to(2)
+
+
+def test_should_adapt_requests_in_flight_with_limiter() -> None:
+    in_flight: List[int] = [0, 0]
+
+    async def handler(request: web.Request) -> web.Response:
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight)
+        await asyncio.sleep(0.02)
+        in_flight[0] -= 1
+        return web.json_response([], status=503)
+
+    async def scenario() -> AsyncAdaptiveLimiter:
+        app = web.Application()
+        app.router.add_get('/api/queues/EA', handler)
+        limiter = AsyncAdaptiveLimiter(initial=3, maximum=3)
+        async with TestServer(app) as server:
+            async with AsyncBrokerClient(fake_broker(), concurrency=10, limiter=limiter) as client:
+                url = str(server.make_url('/api/queues/EA'))
+                await asyncio.gather(*[client.request('GET', url) for _ in range(6)])
+        return limiter
+
+    limiter = asyncio.run(scenario())
+    assert_that(in_flight[1]).is_equal_to(3)
+    assert_that(limiter.limit).is_less_than(3)
+    assert_that(limiter.in_flight).is_equal_to(0)
+
+
+def test_should_get_queues(mocker: MagicMock) -> None:
+    client = AsyncBrokerClient(fake_broker())
+    request = mocker.patch.object(client, 'request', AsyncMock(return_value=response(200, b'[{"name": "one"}]')))
+    assert_that(asyncio.run(queues.get_queues(broker=client, vhost='EA'))).is_equal_to(['one'])
+    request.assert_awaited_with('GET', 'https://fake-broker/api/queues/EA',
+                                params={'columns': 'name', 'disable_stats': 'true'})
+
+
+def test_should_map_404_to_not_present(mocker: MagicMock) -> None:
+    client = AsyncBrokerClient(fake_broker())
+    mocker.patch.object(client, 'request', AsyncMock(return_value=response(404)))
+    assert_that(asyncio.run(queues.is_present(broker=client, vhost='EA', name='one'))).is_false()
+
+
+def test_should_raise_same_exceptions_as_handlers(mocker: MagicMock) -> None:
+    client = AsyncBrokerClient(fake_broker())
+    mocker.patch.object(client, 'request', AsyncMock(return_value=response(400)))
+    try:
+        asyncio.run(queues.create_queue(broker=client, vhost='EA', name='one', queue={'durable': True}))
+        fail('it should raise exception')
+    except BadRequest as e:
+        assert_that(e.url).is_equal_to('https://fake-broker/api/queues/EA/one')
+        assert_that(e.body).is_equal_to({'durable': True})
+
+
+def test_should_raise_exception_when_create_vhost_but_already_exists(mocker: MagicMock) -> None:
+    client = AsyncBrokerClient(fake_broker())
+    mocker.patch.object(client, 'request', AsyncMock(return_value=response(200, b'{"name": "EA"}')))
+    try:
+        asyncio.run(vhost.create_vhost(broker=client, vhost='EA'))
+        fail('it should raise exception')
+    except VhostAlreadyExists as e:
+        assert_that(e.vhost).is_equal_to('EA')
+
+
+def test_should_skip_existing_binding_when_safe_create(mocker: MagicMock) -> None:
+    client = AsyncBrokerClient(fake_broker())
+    existing = b'[{"source": "s", "destination": "d", "destination_type": "queue", "routing_key": "r", ' \
+               b'"arguments": {}}]'
+    request = mocker.patch.object(client, 'request', AsyncMock(return_value=response(200, existing)))
+    binding = Binding({'source': 's', 'destination': 'd', 'destination_type': 'queue', 'routing_key': 'r',
+                       'arguments': {}})
+    asyncio.run(bindings.safe_create_binding(broker=client, vhost='EA', binding=binding))
+    assert_that(request.await_count).is_equal_to(1)
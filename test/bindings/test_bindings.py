@@ -11,8 +11,11 @@ from ..common.fixtures import mock_response, fake_broker, mock_bad_response_with
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../rabbitmqbaselibrary')))
 from rabbitmqbaselibrary.common.exceptions import NotFoundException, Unauthorised, ServerErrorException, \
     BadRequest  # noqa: E402
+from rabbitmqbaselibrary.common.keys import natural_key  # noqa: E402
 from rabbitmqbaselibrary.bindings.bindings import get_bindings, get_bindings_from_source, create_binding, Binding, \
-    delete_binding, is_present, safe_create_binding  # noqa: E402
+    delete_binding, is_present, safe_create_binding, BindingIndex, safe_create_bindings  # noqa: E402
+
+LISTING = {'columns': 'source,destination,destination_type,routing_key,arguments,properties_key'}
 
 
 def test_should_return_true_when_binding_already_present(mocker: MagicMock) -> None:
@@ -24,7 +27,7 @@ def test_should_return_true_when_binding_already_present(mocker: MagicMock) -> N
     patch = mocker.patch('requests.get', return_value=response)
     result = is_present(broker=fake_broker(), vhost='EA', binding=Binding(bindings[0]))
     assert_that(result).is_true()
-    patch.assert_called_with(url='https://fake-broker/api/exchanges/EA/one-s/bindings/source', auth=('guest', 'guest'))
+    patch.assert_called_with(url='https://fake-broker/api/exchanges/EA/one-s/bindings/source', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_return_false_when_binding_not_present(mocker: MagicMock) -> None:
@@ -37,7 +40,7 @@ def test_should_return_false_when_binding_not_present(mocker: MagicMock) -> None
                                                                            'destination_type': 'queue',
                                                                            'arguments': None}))
     assert_that(result).is_false()
-    patch.assert_called_with(url='https://fake-broker/api/exchanges/EA/one-s/bindings/source', auth=('guest', 'guest'))
+    patch.assert_called_with(url='https://fake-broker/api/exchanges/EA/one-s/bindings/source', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_get_existing_bindings(mocker: MagicMock) -> None:
@@ -49,7 +52,7 @@ def test_should_get_existing_bindings(mocker: MagicMock) -> None:
     patch = mocker.patch('requests.get', return_value=response)
     result = map(lambda i: i.to_dict(), get_bindings(broker=fake_broker(), vhost='EA'))
     assert_that(result).is_equal_to(bindings)
-    patch.assert_called_with(url='https://fake-broker/api/bindings/EA', auth=('guest', 'guest'))
+    patch.assert_called_with(url='https://fake-broker/api/bindings/EA', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_return_empty_list_when_get_bindings_but_no_bindings(mocker: MagicMock) -> None:
@@ -58,7 +61,7 @@ def test_should_return_empty_list_when_get_bindings_but_no_bindings(mocker: Magi
     patch = mocker.patch('requests.get', return_value=response)
     result = map(lambda i: i.to_dict(), get_bindings(broker=fake_broker(), vhost='EA'))
     assert_that(result).is_equal_to([])
-    patch.assert_called_with(url='https://fake-broker/api/bindings/EA', auth=('guest', 'guest'))
+    patch.assert_called_with(url='https://fake-broker/api/bindings/EA', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_raise_exception_when_get_bindings_but_404(mocker: MagicMock) -> None:
@@ -68,7 +71,7 @@ def test_should_raise_exception_when_get_bindings_but_404(mocker: MagicMock) ->
         get_bindings(broker=fake_broker(), vhost='EA')
     except NotFoundException as e:
         assert_that(e.url).is_equal_to('https://fake-broker/api/bindings/EA')
-    patch.assert_called_with(url='https://fake-broker/api/bindings/EA', auth=('guest', 'guest'))
+    patch.assert_called_with(url='https://fake-broker/api/bindings/EA', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_raise_exception_when_get_bindings_but_401(mocker: MagicMock) -> None:
@@ -78,7 +81,7 @@ def test_should_raise_exception_when_get_bindings_but_401(mocker: MagicMock) ->
         get_bindings(broker=fake_broker(), vhost='EA')
     except Unauthorised as e:
         assert_that(e.url).is_equal_to('https://fake-broker/api/bindings/EA')
-    patch.assert_called_with(url='https://fake-broker/api/bindings/EA', auth=('guest', 'guest'))
+    patch.assert_called_with(url='https://fake-broker/api/bindings/EA', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_raise_exception_when_get_bindings_but_500(mocker: MagicMock) -> None:
@@ -88,7 +91,7 @@ def test_should_raise_exception_when_get_bindings_but_500(mocker: MagicMock) ->
         get_bindings(broker=fake_broker(), vhost='EA')
     except ServerErrorException as e:
         assert_that(e.url).is_equal_to('https://fake-broker/api/bindings/EA')
-    patch.assert_called_with(url='https://fake-broker/api/bindings/EA', auth=('guest', 'guest'))
+    patch.assert_called_with(url='https://fake-broker/api/bindings/EA', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_raise_exception_when_get_bindings_but_teapot(mocker: MagicMock) -> None:
@@ -98,7 +101,7 @@ def test_should_raise_exception_when_get_bindings_but_teapot(mocker: MagicMock)
         get_bindings(broker=fake_broker(), vhost='EA')
     except Exception as e:
         assert_that(e.args[0]).is_equal_to(418)
-    patch.assert_called_with(url='https://fake-broker/api/bindings/EA', auth=('guest', 'guest'))
+    patch.assert_called_with(url='https://fake-broker/api/bindings/EA', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_return_get_bindings_from_source(mocker: MagicMock) -> None:
@@ -110,7 +113,7 @@ def test_should_return_get_bindings_from_source(mocker: MagicMock) -> None:
     patch = mocker.patch('requests.get', return_value=response)
     result = map(lambda i: i.to_dict(), get_bindings_from_source(broker=fake_broker(), vhost='EA', source='test'))
     assert_that(result).is_equal_to(bindings)
-    patch.assert_called_with(url='https://fake-broker/api/exchanges/EA/test/bindings/source', auth=('guest', 'guest'))
+    patch.assert_called_with(url='https://fake-broker/api/exchanges/EA/test/bindings/source', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_return_empty_list_when_get_bindings_from_source_but_none(mocker: MagicMock) -> None:
@@ -119,7 +122,7 @@ def test_should_return_empty_list_when_get_bindings_from_source_but_none(mocker:
     patch = mocker.patch('requests.get', return_value=response)
     result = map(lambda i: i.to_dict(), get_bindings_from_source(broker=fake_broker(), vhost='EA', source='test'))
     assert_that(result).is_empty()
-    patch.assert_called_with(url='https://fake-broker/api/exchanges/EA/test/bindings/source', auth=('guest', 'guest'))
+    patch.assert_called_with(url='https://fake-broker/api/exchanges/EA/test/bindings/source', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_raise_exception_when_get_bindings_from_source_but_404(mocker: MagicMock) -> None:
@@ -129,7 +132,7 @@ def test_should_raise_exception_when_get_bindings_from_source_but_404(mocker: Ma
         get_bindings_from_source(broker=fake_broker(), vhost='EA', source='test')
     except NotFoundException as e:
         assert_that(e.url).is_equal_to('https://fake-broker/api/exchanges/EA/test/bindings/source')
-    patch.assert_called_with(url='https://fake-broker/api/exchanges/EA/test/bindings/source', auth=('guest', 'guest'))
+    patch.assert_called_with(url='https://fake-broker/api/exchanges/EA/test/bindings/source', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_raise_exception_when_get_bindings_from_source_but_401(mocker: MagicMock) -> None:
@@ -139,7 +142,7 @@ def test_should_raise_exception_when_get_bindings_from_source_but_401(mocker: Ma
         get_bindings_from_source(broker=fake_broker(), vhost='EA', source='test')
     except Unauthorised as e:
         assert_that(e.url).is_equal_to('https://fake-broker/api/exchanges/EA/test/bindings/source')
-    patch.assert_called_with(url='https://fake-broker/api/exchanges/EA/test/bindings/source', auth=('guest', 'guest'))
+    patch.assert_called_with(url='https://fake-broker/api/exchanges/EA/test/bindings/source', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_raise_exception_when_get_bindings_from_source_but_500(mocker: MagicMock) -> None:
@@ -149,7 +152,7 @@ def test_should_raise_exception_when_get_bindings_from_source_but_500(mocker: Ma
         get_bindings_from_source(broker=fake_broker(), vhost='EA', source='test')
     except ServerErrorException as e:
         assert_that(e.url).is_equal_to('https://fake-broker/api/exchanges/EA/test/bindings/source')
-    patch.assert_called_with(url='https://fake-broker/api/exchanges/EA/test/bindings/source', auth=('guest', 'guest'))
+    patch.assert_called_with(url='https://fake-broker/api/exchanges/EA/test/bindings/source', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_raise_exception_when_get_bindings_from_source_but_teapot(mocker: MagicMock) -> None:
@@ -159,7 +162,7 @@ def test_should_raise_exception_when_get_bindings_from_source_but_teapot(mocker:
         get_bindings_from_source(broker=fake_broker(), vhost='EA', source='test')
     except Exception as e:
         assert_that(e.args[0]).is_equal_to(418)
-    patch.assert_called_with(url='https://fake-broker/api/exchanges/EA/test/bindings/source', auth=('guest', 'guest'))
+    patch.assert_called_with(url='https://fake-broker/api/exchanges/EA/test/bindings/source', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_create_bindings(mocker: MagicMock) -> None:
@@ -351,3 +354,55 @@ def test_should_skip_create_binding_when_safe_create_but_it_exists(mocker: Magic
                'arguments': None}
     safe_create_binding(broker=fake_broker(), vhost='EA', binding=Binding(binding))
     patch.assert_not_called()
+
+
+def test_should_hash_bindings_by_canonical_key() -> None:
+    a = Binding({'source': 'one-s', 'destination': 'one-d', 'routing_key': 'one-r', 'destination_type': 'queue',
+                 'arguments': {'x-match': 'all', 'nested': [1, {'a': 2}]}, 'properties_key': '~'})
+    b = Binding({'source': 'one-s', 'destination': 'one-d', 'routing_key': 'one-r', 'destination_type': 'queue',
+                 'arguments': {'nested': [1, {'a': 2}], 'x-match': 'all'}, 'properties_key': 'EE'})
+    assert_that(a).is_equal_to(b)
+    assert_that(hash(a)).is_equal_to(hash(b))
+    assert_that({a, b}).is_length(1)
+    assert_that(hasattr(a, '__dict__')).is_false()
+
+
+def test_should_answer_membership_from_index() -> None:
+    one = {'source': 'one-s', 'destination': 'one-d', 'routing_key': 'one-r', 'destination_type': 'queue',
+           'arguments': {}}
+    two = {'source': 'two-s', 'destination': 'two-d', 'routing_key': 'two-r', 'destination_type': 'exchange',
+           'arguments': {}}
+    index = BindingIndex([Binding(one)])
+    assert_that(Binding(one) in index).is_true()
+    assert_that(Binding(two) in index).is_false()
+    assert_that('one' in index).is_false()
+    index.add(Binding(two))
+    assert_that(index).is_length(2)
+    index.discard(Binding(one))
+    assert_that(is_present(broker=fake_broker(), vhost='EA', binding=Binding(one), index=index)).is_false()
+
+
+def test_should_create_only_missing_bindings_when_safe_create_bindings(mocker: MagicMock) -> None:
+    existing = [{'source': 'one-s', 'destination': 'one-d', 'routing_key': 'one-r', 'destination_type': 'queue',
+                 'arguments': {}}]
+    get = mocker.patch('requests.get', return_value=mock_response(existing))
+    post = mocker.patch('requests.post', return_value=mock_response([]))
+    wanted = [Binding(existing[0]),
+              Binding({'source': 'one-s', 'destination': 'two-d', 'routing_key': 'two-r',
+                       'destination_type': 'exchange', 'arguments': {}}),
+              Binding({'source': 'one-s', 'destination': 'two-d', 'routing_key': 'two-r',
+                       'destination_type': 'exchange', 'arguments': {}})]
+    created = safe_create_bindings(broker=fake_broker(), vhost='EA', bindings=wanted)
+    assert_that(created).is_length(1)
+    get.assert_called_once_with(url='https://fake-broker/api/bindings/EA', auth=('guest', 'guest'), params=LISTING)
+    post.assert_called_once_with(url='https://fake-broker/api/bindings/EA/e/one-s/e/two-d',
+                                 auth=('guest', 'guest'), json={'routing_key': 'two-r', 'arguments': {}})
+
+
+def test_should_key_bindings_without_arguments_like_empty_ones() -> None:
+    listed = {'vhost': 'EA', 'source': 's', 'destination': 'd', 'destination_type': 'queue', 'routing_key': 'r',
+              'arguments': {}}
+    omitted = {k: v for k, v in listed.items() if k != 'arguments'}
+    assert_that(Binding(dict(omitted, arguments=None)).key()).is_equal_to(Binding(listed).key())
+    assert_that(Binding(omitted) in BindingIndex([Binding(listed)])).is_true()
+    assert_that(natural_key('bindings', omitted)).is_equal_to(natural_key('bindings', listed))
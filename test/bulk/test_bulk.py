@@ -0,0 +1,56 @@
+from typing import Any, Callable, List
+from unittest.mock import MagicMock
+
+from assertpy import assert_that
+
+from rabbitmqbaselibrary.bindings.bindings import Binding
+from rabbitmqbaselibrary.bulk.bulk import apply_bulk, remove_bulk
+from rabbitmqbaselibrary.common.exceptions import BadRequest, ServerErrorException
+from ..common.fixtures import mock_response, mock_bad_response_with_status, fake_broker
+
+
+def binding() -> Binding:
+    return Binding({'source': 'ex-one', 'destination': 'q-one', 'routing_key': '#', 'destination_type': 'queue',
+                    'arguments': {}, 'properties_key': '%23'})
+
+
+def recorder(calls: List[str]) -> Callable[..., Any]:
+    def record(**kwargs: Any) -> Any:
+        calls.append(kwargs['url'])
+        return mock_response({})
+    return record
+
+
+def test_should_create_entities_before_bindings(mocker: MagicMock) -> None:
+    calls: List[str] = []
+    mocker.patch('requests.put', side_effect=recorder(calls))
+    mocker.patch('requests.post', side_effect=recorder(calls))
+    results = apply_bulk(broker=fake_broker(), vhost='EA', queues={'q-one': {'durable': True}},
+                         exchanges={'ex-one': {'type': 'topic'}}, bindings=[binding()], max_workers=4)
+    assert_that([r.ok for r in results]).is_equal_to([True, True, True])
+    assert_that([(r.kind, r.name) for r in results]).is_equal_to(
+        [('exchange', 'ex-one'), ('queue', 'q-one'), ('binding', 'ex-one->q-one')])
+    assert_that(calls[-1]).is_equal_to('https://fake-broker/api/bindings/EA/e/ex-one/q/q-one')
+    assert_that(calls[:2]).contains_only('https://fake-broker/api/queues/EA/q-one',
+                                         'https://fake-broker/api/exchanges/EA/ex-one')
+
+
+def test_should_collect_failures_without_aborting(mocker: MagicMock) -> None:
+    def put(**kwargs: Any) -> Any:
+        return mock_bad_response_with_status(400) if kwargs['url'].endswith('bad') else mock_response({})
+
+    mocker.patch('requests.put', side_effect=put)
+    mocker.patch('requests.post', return_value=mock_bad_response_with_status(500))
+    results = apply_bulk(broker=fake_broker(), vhost='EA', queues={'bad': {}, 'good': {}}, bindings=[binding()])
+    assert_that([r.ok for r in results]).is_equal_to([False, True, False])
+    assert_that(results[0].error).is_instance_of(BadRequest)
+    assert_that(results[2].error).is_instance_of(ServerErrorException)
+
+
+def test_should_delete_bindings_before_entities(mocker: MagicMock) -> None:
+    calls: List[str] = []
+    mocker.patch('requests.delete', side_effect=recorder(calls))
+    results = remove_bulk(broker=fake_broker(), vhost='EA', queues=['q-one'], exchanges=['ex-one'],
+                          bindings=[binding()])
+    assert_that(results).is_length(3)
+    assert_that(calls[0]).is_equal_to('https://fake-broker/api/bindings/EA/e/ex-one/q/q-one/%23')
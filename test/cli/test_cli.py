@@ -0,0 +1,54 @@
+import io
+import json
+import os
+from typing import Any
+from unittest.mock import MagicMock
+
+from assertpy import assert_that
+
+from rabbitmqbaselibrary.cli.cli import main
+from ..common.fixtures import mock_response
+
+environments = os.path.abspath(os.path.join(os.path.dirname(__file__), '../resources/fake_environments.json'))
+
+
+def patch_definitions(mocker: MagicMock) -> None:
+    def get(**kwargs: Any) -> Any:
+        arguments = {'x-max-length': 20} if 'technical-wolf' in kwargs['url'] else {}
+        return mock_response({'queues': [{'name': 'q-one', 'arguments': arguments}]})
+
+    mocker.patch('requests.get', side_effect=get)
+
+
+def test_should_print_differences_between_environments(mocker: MagicMock) -> None:
+    patch_definitions(mocker)
+    out = io.StringIO()
+    code = main(['--environments', environments, 'diff', 'acc', 'prod', '--vhost', 'EA'], out=out)
+    assert_that(code).is_equal_to(1)
+    assert_that(out.getvalue()).is_equal_to('~ queues q-one arguments: {} -> {"x-max-length": 20}\n')
+
+
+def test_should_stream_json_lines(mocker: MagicMock) -> None:
+    patch_definitions(mocker)
+    out = io.StringIO()
+    main(['--environments', environments, 'diff', 'acc', 'prod', '--vhost', 'EA', '--format', 'json'], out=out)
+    record = json.loads(out.getvalue())
+    assert_that(record).contains_entry({'status': 'changed'}, {'name': 'q-one'})
+    assert_that(record['fields']).is_equal_to({'arguments': [{}, {'x-max-length': 20}]})
+
+
+def test_should_exit_clean_without_differences(mocker: MagicMock) -> None:
+    patch_definitions(mocker)
+    code = main(['--environments', environments, 'diff', 'acc', 'dev', '--vhost', 'EA'], out=io.StringIO())
+    assert_that(code).is_equal_to(0)
+
+
+def test_should_export_into_given_path(mocker: MagicMock, tmpdir: str) -> None:
+    def request(method: str, url: str, **kwargs: Any) -> Any:
+        return mock_response([{'name': 'EA'}] if url.endswith('/api/vhosts') else {'queues': []})
+
+    mocker.patch('requests.Session.request', side_effect=request)
+    out = io.StringIO()
+    code = main(['--environments', environments, 'export', 'prod', '--path', str(tmpdir)], out=out)
+    assert_that(code).is_equal_to(0)
+    assert_that(sorted(os.listdir(tmpdir))).is_equal_to(['EA.json.gz', 'manifest.json'])
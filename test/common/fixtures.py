@@ -1,3 +1,4 @@
+import json
 from unittest.mock import MagicMock
 
 
@@ -5,6 +6,7 @@ def mock_response(obj: object) -> object:
     r = MagicMock()
     r.ok = True
     r.json.return_value = obj
+    r.iter_content.return_value = [json.dumps(obj).encode('utf-8')]
     return r
 
 
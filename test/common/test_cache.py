@@ -0,0 +1,90 @@
+from typing import Any
+from unittest.mock import MagicMock
+
+from assertpy import assert_that
+
+from rabbitmqbaselibrary.common.cache import TopologyCache, MISSING, cache_key
+from rabbitmqbaselibrary.common.client import BrokerClient
+from rabbitmqbaselibrary.queues.queues import get_queues, is_present, create_queue
+from rabbitmqbaselibrary.vhost.vhost import get_vhosts, delete_vhost
+from .fixtures import mock_response, fake_broker
+
+
+def test_should_expire_entries_after_ttl(mocker: MagicMock) -> None:
+    clock = mocker.patch('time.monotonic', return_value=100.0)
+    cache = TopologyCache(ttl=10)
+    cache.put('https://fake-broker/api/vhosts', ['EA'])
+    clock.return_value = 109.0
+    assert_that(cache.get('https://fake-broker/api/vhosts')).is_equal_to(['EA'])
+    clock.return_value = 111.0
+    assert_that(cache.get('https://fake-broker/api/vhosts')).is_same_as(MISSING)
+    assert_that(cache).is_length(0)
+
+
+def test_should_evict_least_recently_used() -> None:
+    cache = TopologyCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert_that(cache.get('b')).is_same_as(MISSING)
+    assert_that(cache.get('a')).is_equal_to(1)
+    assert_that(cache.get('c')).is_equal_to(3)
+
+
+def test_should_invalidate_by_url_prefix() -> None:
+    cache = TopologyCache()
+    for key in ['https://h/api/queues/EA', 'https://h/api/queues/EA?columns=name', 'https://h/api/queues/EA/one',
+                'https://h/api/queues/EA2']:
+        cache.put(key, True)
+    cache.invalidate('https://h/api/queues/EA')
+    assert_that(cache).is_length(1)
+    assert_that(cache.get('https://h/api/queues/EA2')).is_true()
+
+
+def test_should_build_stable_keys() -> None:
+    assert_that(cache_key('u', {'b': '2', 'a': '1'})).is_equal_to('u?a=1&b=2')
+    assert_that(cache_key('u')).is_equal_to('u')
+
+
+def test_should_answer_repeated_reads_from_cache(mocker: MagicMock) -> None:
+    patch = mocker.patch('requests.Session.request', return_value=mock_response([{'name': 'one'}]))
+    client = BrokerClient(fake_broker(), cache=TopologyCache())
+    assert_that(get_queues(broker=client, vhost='EA')).is_equal_to(['one'])
+    assert_that(get_queues(broker=client, vhost='EA')).is_equal_to(['one'])
+    assert_that(is_present(broker=client, vhost='EA', name='one')).is_true()
+    assert_that(is_present(broker=client, vhost='EA', name='one')).is_true()
+    assert_that(patch.call_count).is_equal_to(2)
+
+
+def test_should_invalidate_on_create(mocker: MagicMock) -> None:
+    patch = mocker.patch('requests.Session.request', return_value=mock_response([{'name': 'one'}]))
+    client = BrokerClient(fake_broker(), cache=TopologyCache())
+    get_queues(broker=client, vhost='EA')
+    create_queue(broker=client, vhost='EA', name='two', queue={})
+    get_queues(broker=client, vhost='EA')
+    assert_that([c[0][0] for c in patch.call_args_list]).is_equal_to(['GET', 'PUT', 'GET'])
+
+
+def test_should_invalidate_whole_vhost_on_delete(mocker: MagicMock) -> None:
+    patch = mocker.patch('requests.Session.request', return_value=mock_response([{'name': 'EA'}]))
+    cache = TopologyCache()
+    client = BrokerClient(fake_broker(), cache=cache)
+    get_vhosts(broker=client)
+    get_queues(broker=client, vhost='EA')
+    delete_vhost(broker=client, vhost='EA')
+    assert_that(cache).is_length(0)
+    assert_that(patch.call_count).is_equal_to(4)
+
+
+def test_should_not_cache_a_read_that_raced_a_write(mocker: MagicMock) -> None:
+    cache = TopologyCache()
+    client = BrokerClient(fake_broker(), cache=cache)
+
+    def read_during_write(*args: Any, **kwargs: Any) -> Any:
+        cache.invalidate('https://fake-broker/api/queues/EA')
+        return mock_response([{'name': 'stale'}])
+
+    mocker.patch('requests.Session.request', side_effect=read_during_write)
+    assert_that(get_queues(broker=client, vhost='EA')).is_equal_to(['stale'])
+    assert_that(cache).is_length(0)
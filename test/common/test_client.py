@@ -0,0 +1,41 @@
+from unittest.mock import MagicMock
+
+from assertpy import assert_that
+
+from rabbitmqbaselibrary.common.client import BrokerClient, http
+from rabbitmqbaselibrary.queues.queues import get_queues, create_queue
+from .fixtures import mock_response, fake_broker
+
+
+def test_should_behave_as_broker_dict() -> None:
+    client = BrokerClient(fake_broker())
+    assert_that(client).is_equal_to(fake_broker())
+    assert_that(client['host']).is_equal_to('fake-broker')
+    assert_that(client.session.auth).is_equal_to(('guest', 'guest'))
+
+
+def test_should_mount_pooled_adapter() -> None:
+    client = BrokerClient(fake_broker(), pool_connections=3, pool_maxsize=7)
+    adapter = client.session.get_adapter('https://fake-broker/api/queues')
+    # noinspection PyUnresolvedReferences
+    assert_that(adapter._pool_maxsize).is_equal_to(7)  # type: ignore
+    # noinspection PyUnresolvedReferences
+    assert_that(adapter._pool_connections).is_equal_to(3)  # type: ignore
+
+
+def test_should_use_plain_requests_for_plain_dict() -> None:
+    import requests
+    assert_that(http(fake_broker())).is_same_as(requests)
+
+
+def test_should_send_module_calls_through_session(mocker: MagicMock) -> None:
+    patch = mocker.patch('requests.Session.request', return_value=mock_response([{'name': 'one'}]))
+    plain = mocker.patch('requests.get')
+    with BrokerClient(fake_broker(), timeout=5) as client:
+        assert_that(get_queues(broker=client, vhost='EA')).is_equal_to(['one'])
+        create_queue(broker=client, vhost='EA', name='one', queue={'durable': True})
+    plain.assert_not_called()
+    calls = [(c[0], c[1].get('auth'), c[1].get('timeout')) for c in patch.call_args_list]
+    assert_that(calls).is_equal_to([(('GET', 'https://fake-broker/api/queues/EA'), ('guest', 'guest'), 5),
+                                    (('PUT', 'https://fake-broker/api/queues/EA/one'), ('guest', 'guest'), 5)])
+    assert_that(patch.call_args[1].get('json')).is_equal_to({'durable': True})
@@ -0,0 +1,33 @@
+import gzip
+import os
+
+import pytest
+from assertpy import assert_that
+
+from rabbitmqbaselibrary.common.compression import dump_json_file, load_json_file, find_json_file, gzip_json
+
+
+def test_should_round_trip_gzip_files(tmpdir: str) -> None:
+    path = os.path.join(tmpdir, 'definitions.json.gz')
+    dump_json_file(path, {'queues': [{'name': 'one'}] * 100})
+    with open(path, 'rb') as f:
+        assert_that(f.read(2)).is_equal_to(b'\x1f\x8b')
+    assert_that(load_json_file(path)).is_equal_to({'queues': [{'name': 'one'}] * 100})
+
+
+def test_should_round_trip_zstd_files(tmpdir: str) -> None:
+    pytest.importorskip('zstandard')
+    path = os.path.join(tmpdir, 'definitions.json.zst')
+    dump_json_file(path, {'queues': []})
+    assert_that(load_json_file(path)).is_equal_to({'queues': []})
+
+
+def test_should_prefer_plain_json_and_fall_back_to_compressed(tmpdir: str) -> None:
+    base = os.path.join(tmpdir, 'template')
+    assert_that(find_json_file(base)).is_equal_to(base + '.json')
+    dump_json_file(base + '.json.gz', {})
+    assert_that(find_json_file(base)).is_equal_to(base + '.json.gz')
+
+
+def test_should_gzip_json_body() -> None:
+    assert_that(gzip.decompress(gzip_json({'a': 1}))).is_equal_to(b'{"a": 1}')
@@ -0,0 +1,65 @@
+from unittest.mock import MagicMock, call
+
+from assertpy import assert_that, fail
+
+from rabbitmqbaselibrary.common.exceptions import ServerErrorException
+from rabbitmqbaselibrary.common.pagination import iter_pages, iter_listing
+from rabbitmqbaselibrary.queues.queues import iter_queues
+from rabbitmqbaselibrary.users.users import iter_users
+from .fixtures import mock_response, mock_bad_response_with_status, fake_broker
+
+
+def page(items: list, number: int, count: int) -> dict:
+    return {'items': items, 'page': number, 'page_count': count, 'page_size': 2,
+            'filtered_count': 3, 'item_count': len(items), 'total_count': 3}
+
+
+def test_should_iterate_over_all_pages(mocker: MagicMock) -> None:
+    responses = [mock_response(page([{'name': 'one'}, {'name': 'two'}], 1, 2)),
+                 mock_response(page([{'name': 'three'}], 2, 2))]
+    patch = mocker.patch('requests.get', side_effect=responses)
+    result = list(iter_pages(broker=fake_broker(), url='https://fake-broker/api/queues/EA', page_size=2))
+    assert_that(result).is_equal_to([{'name': 'one'}, {'name': 'two'}, {'name': 'three'}])
+    patch.assert_has_calls([
+        call(url='https://fake-broker/api/queues/EA', auth=('guest', 'guest'), params={'page': 1, 'page_size': 2}),
+        call(url='https://fake-broker/api/queues/EA', auth=('guest', 'guest'), params={'page': 2, 'page_size': 2})])
+
+
+def test_should_stop_when_no_pages(mocker: MagicMock) -> None:
+    patch = mocker.patch('requests.get', return_value=mock_response(page([], 1, 0)))
+    assert_that(list(iter_pages(broker=fake_broker(), url='https://fake-broker/api/queues/EA'))).is_empty()
+    patch.assert_called_once()
+
+
+def test_should_send_name_filter_to_server(mocker: MagicMock) -> None:
+    patch = mocker.patch('requests.get', return_value=mock_response(page([{'name': 'one'}], 1, 1)))
+    result = list(iter_queues(broker=fake_broker(), vhost='EA', page_size=50, name='^on', use_regex=True))
+    assert_that(result).is_equal_to(['one'])
+    patch.assert_called_with(url='https://fake-broker/api/queues/EA', auth=('guest', 'guest'),
+                             params={'columns': 'name', 'disable_stats': 'true', 'page': 1, 'page_size': 50,
+                                     'name': '^on', 'use_regex': 'true'})
+
+
+def test_should_reject_page_size_out_of_bounds() -> None:
+    try:
+        next(iter_pages(broker=fake_broker(), url='https://fake-broker/api/queues/EA', page_size=501))
+        fail('it should raise exception')
+    except ValueError as e:
+        assert_that(str(e)).contains('500')
+
+
+def test_should_raise_exception_when_page_but_500(mocker: MagicMock) -> None:
+    mocker.patch('requests.get', return_value=mock_bad_response_with_status(500))
+    try:
+        list(iter_pages(broker=fake_broker(), url='https://fake-broker/api/queues/EA'))
+        fail('it should raise exception')
+    except ServerErrorException as e:
+        assert_that(e.url).is_equal_to('https://fake-broker/api/queues/EA')
+
+
+def test_should_filter_unpaged_listing_locally(mocker: MagicMock) -> None:
+    patch = mocker.patch('requests.get', return_value=mock_response([{'name': 'admin'}, {'name': 'guest'}]))
+    assert_that(list(iter_users(broker=fake_broker(), name='^gu', use_regex=True))).is_equal_to(['guest'])
+    assert_that(list(iter_users(broker=fake_broker(), name='admin'))).is_equal_to(['admin'])
+    patch.assert_called_with(url='https://fake-broker/api/users', auth=('guest', 'guest'), params={'columns': 'name'})
+    assert_that(list(iter_listing(broker=fake_broker(), url='https://fake-broker/api/users'))).is_length(2)
@@ -0,0 +1,79 @@
+import threading
+import time
+from typing import Any, List
+from unittest.mock import MagicMock
+
+from assertpy import assert_that, fail
+
+from rabbitmqbaselibrary.common.singleflight import SingleFlight
+from rabbitmqbaselibrary.queues.queues import create_queue, get_queues
+from .fixtures import mock_response, fake_broker
+
+
+def run_concurrently(count: int, target: Any) -> List[Any]:
+    results: List[Any] = []
+    threads = [threading.Thread(target=lambda: results.append(target())) for _ in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=2)
+    return results
+
+
+def test_should_share_one_call_between_concurrent_callers() -> None:
+    flight = SingleFlight()
+    calls: List[int] = []
+
+    def slow() -> List[str]:
+        calls.append(1)
+        time.sleep(0.1)
+        return ['one']
+
+    results = run_concurrently(5, lambda: flight.do('key', slow))
+    assert_that(calls).is_length(1)
+    assert_that(results).is_equal_to([['one']] * 5)
+    assert_that(flight).is_length(0)
+
+
+def test_should_propagate_error_and_forget_key() -> None:
+    flight = SingleFlight()
+
+    def broken() -> None:
+        raise ValueError('boom')
+
+    try:
+        flight.do('key', broken)
+        fail('it should raise exception')
+    except ValueError as e:
+        assert_that(e.args[0]).is_equal_to('boom')
+    assert_that(flight.do('key', lambda: 'fine')).is_equal_to('fine')
+
+
+def test_should_coalesce_identical_module_gets(mocker: MagicMock) -> None:
+    def slow_get(**kwargs: Any) -> Any:
+        time.sleep(0.1)
+        return mock_response([{'name': 'one'}])
+
+    patch = mocker.patch('requests.get', side_effect=slow_get)
+    results = run_concurrently(4, lambda: get_queues(broker=fake_broker(), vhost='EA'))
+    assert_that(results).is_equal_to([['one']] * 4)
+    patch.assert_called_once()
+
+
+def test_should_not_share_a_get_started_before_a_write(mocker: MagicMock) -> None:
+    started = threading.Event()
+
+    def slow_get(**kwargs: Any) -> Any:
+        started.set()
+        time.sleep(0.1)
+        return mock_response([{'name': 'one'}])
+
+    patch = mocker.patch('requests.get', side_effect=slow_get)
+    mocker.patch('requests.put', return_value=mock_response({}))
+    before = threading.Thread(target=lambda: get_queues(broker=fake_broker(), vhost='EA'))
+    before.start()
+    started.wait(timeout=2)
+    create_queue(broker=fake_broker(), vhost='EA', name='two', queue={})
+    get_queues(broker=fake_broker(), vhost='EA')
+    before.join(timeout=2)
+    assert_that(patch.call_count).is_equal_to(2)
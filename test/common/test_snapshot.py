@@ -0,0 +1,70 @@
+from unittest.mock import MagicMock
+
+from assertpy import assert_that
+
+from rabbitmqbaselibrary.bindings.bindings import Binding, safe_create_bindings, is_present as binding_is_present
+from rabbitmqbaselibrary.common.snapshot import TopologySnapshot
+from rabbitmqbaselibrary.definitions.definitions import get_topology_snapshot
+from rabbitmqbaselibrary.exchanges.exchanges import is_present as exchange_is_present
+from rabbitmqbaselibrary.policies.policies import is_present as policy_is_present
+from rabbitmqbaselibrary.queues.queues import is_present as queue_is_present
+from rabbitmqbaselibrary.users.users import has_permissions, is_present as user_is_present, safe_create_user
+from rabbitmqbaselibrary.vhost.vhost import is_present as vhost_is_present
+from .fixtures import mock_response, fake_broker
+
+
+def broker_definitions() -> dict:
+    return {
+        'vhosts': [{'name': '/'}, {'name': 'EA'}],
+        'users': [{'name': 'admin', 'tags': 'administrator'}],
+        'permissions': [{'user': 'admin', 'vhost': 'EA', 'configure': '.*', 'write': '.*', 'read': '.*'}],
+        'queues': [{'name': 'q-one', 'vhost': 'EA', 'durable': True}],
+        'exchanges': [{'name': 'ex-one', 'vhost': 'EA', 'type': 'topic'}],
+        'bindings': [{'source': 'ex-one', 'vhost': 'EA', 'destination': 'q-one', 'destination_type': 'queue',
+                      'routing_key': '#', 'arguments': {}}],
+        'policies': [{'name': 'ttl', 'vhost': 'EA', 'pattern': '.*'}],
+    }
+
+
+def binding(routing_key: str) -> Binding:
+    return Binding({'source': 'ex-one', 'destination': 'q-one', 'destination_type': 'queue',
+                    'routing_key': routing_key})
+
+
+def test_should_answer_is_present_without_requests(mocker: MagicMock) -> None:
+    patch = mocker.patch('requests.get')
+    snapshot = TopologySnapshot(broker_definitions())
+    broker = fake_broker()
+    assert_that(vhost_is_present(broker=broker, vhost='%2F', snapshot=snapshot)).is_true()
+    assert_that(user_is_present(broker=broker, name='admin', snapshot=snapshot)).is_true()
+    assert_that(has_permissions(broker=broker, vhost='EA', user='admin', snapshot=snapshot)).is_true()
+    assert_that(queue_is_present(broker=broker, vhost='EA', name='q-one', snapshot=snapshot)).is_true()
+    assert_that(queue_is_present(broker=broker, vhost='EB', name='q-one', snapshot=snapshot)).is_false()
+    assert_that(exchange_is_present(broker=broker, vhost='EA', name='ex-one', snapshot=snapshot)).is_true()
+    assert_that(policy_is_present(broker=broker, vhost='EA', name='other', snapshot=snapshot)).is_false()
+    assert_that(binding_is_present(broker=broker, vhost='EA', binding=binding('#'), snapshot=snapshot)).is_true()
+    patch.assert_not_called()
+
+
+def test_should_index_single_vhost_definitions(mocker: MagicMock) -> None:
+    definitions = broker_definitions()
+    for item in definitions['queues']:
+        del item['vhost']
+    patch = mocker.patch('requests.get', return_value=mock_response(definitions))
+    snapshot = get_topology_snapshot(broker=fake_broker(), vhost='EA')
+    patch.assert_called_with(url='https://fake-broker/api/definitions/EA', auth=('guest', 'guest'))
+    assert_that(snapshot.contains('queues', {'vhost': 'EA', 'name': 'q-one'})).is_true()
+    assert_that(snapshot.find('queues', {'vhost': 'EA', 'name': 'q-one'})).contains_entry({'durable': True})
+
+
+def test_should_keep_snapshot_current_on_safe_create(mocker: MagicMock) -> None:
+    post = mocker.patch('requests.post', return_value=mock_response({}))
+    put = mocker.patch('requests.put', return_value=mock_response({}))
+    snapshot = TopologySnapshot(broker_definitions())
+    created = safe_create_bindings(broker=fake_broker(), vhost='EA', bindings=[binding('#'), binding('a'), binding('a')],
+                                   snapshot=snapshot)
+    assert_that([b.routing_key for b in created]).is_equal_to(['a'])
+    post.assert_called_once()
+    safe_create_user(broker=fake_broker(), name='reader', pass_flag=True, snapshot=snapshot)
+    assert_that(snapshot.contains('users', {'name': 'reader'})).is_true()
+    put.assert_called_once()
@@ -0,0 +1,51 @@
+import json
+import os
+from typing import List
+
+from assertpy import assert_that, fail
+
+from rabbitmqbaselibrary.common.compression import dump_json_file
+from rabbitmqbaselibrary.common.streaming import iter_definitions, iter_definitions_file
+
+
+def definitions() -> dict:
+    return {
+        'rabbit_version': '3.8.9',
+        'queues': [{'name': 'q-{}'.format(i), 'arguments': {'x-max-length': i}} for i in range(5)],
+        'exchanges': [],
+        'global_parameters': [{'name': 'cluster_name', 'value': 'rémi'}],
+        'priority': 12345,
+        'bindings': [{'source': 'ex', 'destination': 'q-0', 'routing_key': '[{,}]'}],
+    }
+
+
+def split(text: bytes, size: int) -> List[bytes]:
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def expected() -> list:
+    return [(kind, item) for kind, items in definitions().items() if isinstance(items, list) for item in items]
+
+
+def test_should_yield_resources_whatever_the_chunking() -> None:
+    text = json.dumps(definitions(), indent=2).encode('utf-8')
+    for size in [1, 2, 7, 64, len(text)]:
+        assert_that(list(iter_definitions(split(text, size)))).is_equal_to(expected())
+
+
+def test_should_accept_empty_document() -> None:
+    assert_that(list(iter_definitions(['{ }']))).is_empty()
+
+
+def test_should_raise_on_truncated_document() -> None:
+    try:
+        list(iter_definitions(split(json.dumps(definitions()).encode('utf-8'), 5)[:-3]))
+        fail('it should raise exception')
+    except ValueError as e:
+        assert_that(str(e)).is_not_empty()
+
+
+def test_should_stream_compressed_file(tmpdir: str) -> None:
+    path = os.path.join(tmpdir, 'definitions.json.gz')
+    dump_json_file(path, definitions())
+    assert_that(list(iter_definitions_file(path))).is_equal_to(expected())
@@ -2,6 +2,7 @@ import os
 
 from assertpy import assert_that, fail
 
+from rabbitmqbaselibrary.common.compression import dump_json_file
 from rabbitmqbaselibrary.common.exceptions import TemplateException
 from rabbitmqbaselibrary.common.templates import Template
 
@@ -49,3 +50,9 @@ def test_should_raise_exception_when_load_existing_template_but_bad_params() ->
         fail('it should raise exception')
     except TemplateException as e:
         assert_that(e.message).contains('in template policies/example')
+
+
+def test_should_load_compressed_template(tmpdir: str) -> None:
+    os.makedirs(os.path.join(tmpdir, 'policies'))
+    dump_json_file(os.path.join(tmpdir, 'policies/packed.json.gz'), {'pattern': '.*'})
+    assert_that(Template(basename=str(tmpdir)).load_template('policies/packed')).is_equal_to({'pattern': '.*'})
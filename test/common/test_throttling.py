@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import time
+from typing import List
+from unittest.mock import MagicMock
+
+import requests
+from assertpy import assert_that, fail
+
+from rabbitmqbaselibrary.common.client import BrokerClient
+from rabbitmqbaselibrary.common.exceptions import ServerErrorException
+from rabbitmqbaselibrary.common.throttling import RetryPolicy, AdaptiveLimiter, AsyncAdaptiveLimiter, limiter_for
+from rabbitmqbaselibrary.queues.queues import get_queues, delete_queue
+from rabbitmqbaselibrary.bindings.bindings import Binding, create_binding
+from .fixtures import mock_response, mock_bad_response_with_status, fake_broker
+
+
+def test_should_bound_backoff_with_jitter() -> None:
+    policy = RetryPolicy(retries=5, backoff=0.1, max_backoff=0.3)
+    delays = [policy.delay(attempt) for attempt in range(5) for _ in range(20)]
+    assert_that(min(delays)).is_greater_than_or_equal_to(0)
+    assert_that(max(delays)).is_less_than_or_equal_to(0.3)
+
+
+def test_should_retry_only_idempotent_verbs() -> None:
+    policy = RetryPolicy(retries=2)
+    assert_that(policy.should_retry('GET', 0, 503)).is_true()
+    assert_that(policy.should_retry('delete', 1, 500)).is_true()
+    assert_that(policy.should_retry('GET', 2, 503)).is_false()
+    assert_that(policy.should_retry('POST', 0, 503)).is_false()
+    assert_that(policy.should_retry('GET', 0, 404)).is_false()
+
+
+def test_should_grow_additively_and_shrink_multiplicatively() -> None:
+    limiter = AdaptiveLimiter(initial=4, minimum=1, maximum=6, latency_target=1.0)
+    for _ in range(40):
+        limiter.acquire()
+        limiter.release(latency=0.01, failed=False)
+    assert_that(limiter.limit).is_equal_to(6)
+    limiter.acquire()
+    limiter.release(latency=0.01, failed=True)
+    assert_that(limiter.limit).is_equal_to(3)
+    limiter = AdaptiveLimiter(initial=4, minimum=1, maximum=6, latency_target=1.0)
+    limiter.acquire()
+    limiter.release(latency=5.0, failed=False)
+    assert_that(limiter.limit).is_equal_to(2)
+
+
+def test_should_shrink_once_per_congestion_window() -> None:
+    limiter = AdaptiveLimiter(initial=8, maximum=8)
+    for _ in range(4):
+        limiter.acquire()
+    time.sleep(0.01)
+    for _ in range(4):
+        limiter.release(latency=0.005, failed=True)
+    assert_that(limiter.limit).is_equal_to(4)
+    limiter.acquire()
+    limiter.release(latency=0.0, failed=True)
+    assert_that(limiter.limit).is_equal_to(2)
+
+
+def test_should_not_hold_large_endpoints_to_latency_target() -> None:
+    limiter = AdaptiveLimiter(initial=4, latency_target=1.0)
+    limiter.acquire()
+    limiter.release(latency=30.0, failed=False, url='https://fake-broker/api/definitions/EA')
+    assert_that(limiter.limit).is_equal_to(4)
+
+
+def test_should_limit_async_callers() -> None:
+    limiter = AsyncAdaptiveLimiter(initial=2, maximum=2)
+    peak: List[int] = [0]
+
+    async def call() -> None:
+        await limiter.acquire()
+        peak[0] = max(peak[0], limiter.in_flight)
+        await asyncio.sleep(0.01)
+        await limiter.release(latency=0.01, failed=False)
+
+    async def scenario() -> None:
+        await asyncio.gather(*[call() for _ in range(6)])
+
+    asyncio.run(scenario())
+    assert_that(peak[0]).is_equal_to(2)
+    assert_that(limiter.in_flight).is_equal_to(0)
+
+
+def test_should_block_callers_above_limit() -> None:
+    limiter = AdaptiveLimiter(initial=1, maximum=1)
+    limiter.acquire()
+    entered: List[bool] = []
+
+    def enter() -> None:
+        limiter.acquire()
+        entered.append(True)
+
+    worker = threading.Thread(target=enter)
+    worker.start()
+    time.sleep(0.05)
+    assert_that(entered).is_empty()
+    limiter.release(latency=0.01, failed=False)
+    worker.join(timeout=1)
+    assert_that(entered).is_length(1)
+
+
+def test_should_share_limiter_per_host() -> None:
+    assert_that(limiter_for('host-a')).is_same_as(limiter_for('host-a'))
+    assert_that(limiter_for('host-a')).is_not_same_as(limiter_for('host-b'))
+
+
+def test_should_retry_get_until_success(mocker: MagicMock) -> None:
+    mocker.patch('time.sleep')
+    responses = [mock_bad_response_with_status(503), requests.ConnectionError('reset'), mock_response([{'name': 'one'}])]
+    patch = mocker.patch('requests.Session.request', side_effect=responses)
+    client = BrokerClient(fake_broker(), retry=RetryPolicy(retries=3), limiter=AdaptiveLimiter())
+    assert_that(get_queues(broker=client, vhost='EA')).is_equal_to(['one'])
+    assert_that(patch.call_count).is_equal_to(3)
+    assert_that(client.session.limiter.in_flight).is_equal_to(0)  # type: ignore
+
+
+def test_should_give_up_after_retries(mocker: MagicMock) -> None:
+    mocker.patch('time.sleep')
+    patch = mocker.patch('requests.Session.request', return_value=mock_bad_response_with_status(500))
+    client = BrokerClient(fake_broker(), retry=RetryPolicy(retries=2))
+    try:
+        delete_queue(broker=client, vhost='EA', name='one')
+        fail('it should raise exception')
+    except ServerErrorException as e:
+        assert_that(e.url).is_equal_to('https://fake-broker/api/queues/EA/one')
+    assert_that(patch.call_count).is_equal_to(3)
+
+
+def test_should_not_retry_post(mocker: MagicMock) -> None:
+    patch = mocker.patch('requests.Session.request', return_value=mock_bad_response_with_status(503))
+    client = BrokerClient(fake_broker(), retry=RetryPolicy(retries=3))
+    binding = Binding({'source': 's', 'destination': 'd', 'destination_type': 'queue', 'routing_key': 'r'})
+    try:
+        create_binding(broker=client, vhost='EA', binding=binding)
+        fail('it should raise exception')
+    except Exception as e:
+        assert_that(e.args[0]).is_equal_to(503)
+    patch.assert_called_once()
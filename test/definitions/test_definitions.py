@@ -1,9 +1,16 @@
+import os
+from typing import Any, List, Set
 from unittest.mock import MagicMock
 
 from assertpy import assert_that, fail
 
+from rabbitmqbaselibrary.common.cache import TopologyCache
+from rabbitmqbaselibrary.common.client import BrokerClient
 from rabbitmqbaselibrary.common.exceptions import NotFoundException, BadRequest
-from rabbitmqbaselibrary.definitions.definitions import get_definitions, load_definitions
+from rabbitmqbaselibrary.common.keys import content_hash
+from rabbitmqbaselibrary.definitions.definitions import get_definitions, load_definitions, load_definitions_chunked, \
+    load_definitions_if_changed, read_definitions, split_definitions, stream_definitions
+from rabbitmqbaselibrary.history.history import History
 from ..common.fixtures import mock_response, mock_bad_response_with_status, fake_broker
 
 
@@ -58,3 +65,102 @@ def test_should_raise_exception_when_load_definitions_but_400(mocker: MagicMock)
         assert_that(e.url).is_equal_to('https://fake-broker/api/definitions/test')
     patch.assert_called_with(url='https://fake-broker/api/definitions/test',
                              auth=('guest', 'guest'), json=get_definition_example())
+
+
+def large_definitions() -> dict:
+    return {
+        'rabbit_version': '3.8.9',
+        'policies': [{'name': 'ttl', 'pattern': '.*', 'definition': {'message-ttl': 1000}}],
+        'bindings': [{'source': 'ex', 'destination': 'q-{}'.format(i), 'destination_type': 'queue'} for i in range(3)],
+        'queues': [{'name': 'q-{}'.format(i), 'durable': True} for i in range(3)],
+        'exchanges': [{'name': 'ex', 'type': 'topic'}],
+    }
+
+
+def test_should_split_definitions_by_dependency_order() -> None:
+    phases = split_definitions(large_definitions(), chunk_size=2)
+    assert_that([[c.kind for c in chunks] for chunks in phases]).is_equal_to(
+        [['exchanges', 'queues', 'queues'], ['bindings', 'bindings'], ['policies']])
+    assert_that(phases[0][2].definitions).is_equal_to({'queues': [{'name': 'q-2', 'durable': True}]})
+    assert_that([c.id for c in phases[1]]).is_equal_to([c.id for c in split_definitions(large_definitions(), 2)[1]])
+
+
+def test_should_load_chunks_and_report_progress(mocker: MagicMock) -> None:
+    patch = mocker.patch('requests.post', return_value=mock_response([]))
+    reported: List[int] = []
+    done = load_definitions_chunked(broker=fake_broker(), vhost='test', definitions=large_definitions(),
+                                    chunk_size=2, progress=lambda chunk, count, total: reported.append(count))
+    assert_that(done).is_length(6)
+    assert_that(reported).is_equal_to([1, 2, 3, 4, 5, 6])
+    assert_that(patch.call_args_list[-1][1]['json']).is_equal_to({'policies': large_definitions()['policies']})
+    assert_that(patch.call_args_list[-1][1]['url']).is_equal_to('https://fake-broker/api/definitions/test')
+
+
+def test_should_resume_after_failed_chunk(mocker: MagicMock) -> None:
+    def post(**kwargs: Any) -> Any:
+        return mock_bad_response_with_status(400) if 'bindings' in kwargs['json'] else mock_response([])
+
+    patch = mocker.patch('requests.post', side_effect=post)
+    done: Set[str] = set()
+    try:
+        load_definitions_chunked(broker=fake_broker(), vhost=None, definitions=large_definitions(),
+                                 chunk_size=2, completed=done)
+        fail('it should raise exception')
+    except BadRequest as e:
+        assert_that(e.url).is_equal_to('https://fake-broker/api/definitions')
+    assert_that(done).is_length(3)
+    assert_that(patch.call_count).is_equal_to(5)
+    patch.side_effect = None
+    patch.return_value = mock_response([])
+    load_definitions_chunked(broker=fake_broker(), vhost=None, definitions=large_definitions(),
+                             chunk_size=2, completed=done)
+    assert_that(done).is_length(6)
+    assert_that(patch.call_count).is_equal_to(8)
+
+
+def test_should_hash_definitions_regardless_of_order() -> None:
+    definitions = large_definitions()
+    shuffled = dict(reversed(list(definitions.items())))
+    shuffled['queues'] = list(reversed(definitions['queues']))
+    assert_that(content_hash(shuffled)).is_equal_to(content_hash(definitions))
+    shuffled['queues'][0] = dict(shuffled['queues'][0], durable=False)
+    assert_that(content_hash(shuffled)).is_not_equal_to(content_hash(definitions))
+
+
+def test_should_skip_upload_of_unchanged_definitions(mocker: MagicMock, tmpdir: str) -> None:
+    totals = {'queues': 3, 'exchanges': 8}
+
+    def get(**kwargs: Any) -> Any:
+        resource = kwargs['url'].split('/')[4]
+        return mock_response([{'name': 'ttl'}] if resource == 'policies' else {'total_count': totals[resource]})
+
+    mocker.patch('requests.get', side_effect=get)
+    post = mocker.patch('requests.post', return_value=mock_response([]))
+    history = History(hist_path=str(tmpdir), db_name=os.path.join(tmpdir, 'history.db'))
+    for _ in range(2):
+        load_definitions_if_changed(broker=fake_broker(), vhost='test', definitions=large_definitions(), history=history)
+    assert_that(post.call_count).is_equal_to(1)
+    totals['queues'] = 2
+    assert_that(load_definitions_if_changed(broker=fake_broker(), vhost='test', definitions=large_definitions(),
+                                            history=history)).is_true()
+    assert_that(post.call_count).is_equal_to(2)
+
+
+def test_should_stream_definitions(mocker: MagicMock) -> None:
+    response: Any = mock_response(None)
+    response.iter_content.return_value = [b'{"queues": [{"name": "q-', b'one"}, {"name": "q-two"}]}']
+    patch = mocker.patch('requests.get', return_value=response)
+    result = list(stream_definitions(broker=fake_broker(), vhost='test'))
+    assert_that(result).is_equal_to([('queues', {'name': 'q-one'}), ('queues', {'name': 'q-two'})])
+    patch.assert_called_with(url='https://fake-broker/api/definitions/test', auth=('guest', 'guest'), stream=True)
+    response.close.assert_called_once()
+
+
+def test_should_read_definitions_from_stream_without_caching(mocker: MagicMock) -> None:
+    response: Any = mock_response(None)
+    response.iter_content.return_value = [b'{"rabbit_version": "3.8", "queues": [{"name": "q-one"}], "bindings": []}']
+    patch = mocker.patch('requests.Session.request', return_value=response)
+    client = BrokerClient(fake_broker(), cache=TopologyCache())
+    for _ in range(2):
+        assert_that(read_definitions(broker=client, vhost='test')).is_equal_to({'queues': [{'name': 'q-one'}]})
+    assert_that(patch.call_count).is_equal_to(2)
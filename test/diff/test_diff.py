@@ -0,0 +1,48 @@
+from typing import Any
+from unittest.mock import MagicMock
+
+from assertpy import assert_that
+
+from rabbitmqbaselibrary.diff.diff import compare, diff_definitions
+from ..common.fixtures import mock_response, fake_broker
+
+
+def staging() -> dict:
+    return {
+        'queues': [{'name': 'q-one', 'durable': True, 'arguments': {'x-max-length': 10}},
+                   {'name': 'q-old', 'durable': True, 'arguments': {}}],
+        'bindings': [{'source': 'ex', 'destination': 'q-one', 'destination_type': 'queue', 'routing_key': '#',
+                      'arguments': {}}],
+    }
+
+
+def prod() -> dict:
+    return {
+        'queues': [{'name': 'q-new', 'durable': True, 'arguments': {}},
+                   {'name': 'q-one', 'durable': True, 'arguments': {'x-max-length': 20}}],
+        'bindings': [{'source': 'ex', 'destination': 'q-one', 'destination_type': 'queue', 'routing_key': '#',
+                      'arguments': {}}],
+    }
+
+
+def test_should_report_added_removed_and_changed_fields() -> None:
+    entries = list(diff_definitions(left=staging(), right=prod()))
+    assert_that([(e.status, e.kind, e.name) for e in entries]).is_equal_to(
+        [('changed', 'queues', 'q-one'), ('removed', 'queues', 'q-old'), ('added', 'queues', 'q-new')])
+    assert_that(entries[0].fields).is_equal_to({'arguments': ({'x-max-length': 10}, {'x-max-length': 20})})
+
+
+def test_should_find_nothing_in_identical_definitions() -> None:
+    assert_that(list(diff_definitions(left=staging(), right=staging()))).is_empty()
+
+
+def test_should_fetch_both_brokers(mocker: MagicMock) -> None:
+    def get(**kwargs: Any) -> Any:
+        return mock_response(prod() if 'prod-broker' in kwargs['url'] else staging())
+
+    patch = mocker.patch('requests.get', side_effect=get)
+    right = dict(fake_broker(), host='prod-broker')
+    entries = list(compare(left_broker=fake_broker(), right_broker=right, vhost='EA', kinds=['bindings']))
+    assert_that(entries).is_empty()
+    assert_that(sorted(c[1]['url'] for c in patch.call_args_list)).is_equal_to(
+        ['https://fake-broker/api/definitions/EA', 'https://prod-broker/api/definitions/EA'])
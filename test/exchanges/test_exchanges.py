@@ -3,9 +3,12 @@ from unittest.mock import MagicMock
 from assertpy import assert_that, fail
 
 from rabbitmqbaselibrary.common.exceptions import NotFoundException, ServerErrorException, Unauthorised, BadRequest
-from rabbitmqbaselibrary.exchanges.exchanges import get_exchanges, is_present, create_exchange, delete_exchange
+from rabbitmqbaselibrary.exchanges.exchanges import get_exchanges, is_present, create_exchange, delete_exchange, \
+    list_exchanges, ExchangeRecord
 from ..common.fixtures import mock_response, fake_broker, mock_bad_response_with_status
 
+LISTING = {'columns': 'name', 'disable_stats': 'true'}
+
 
 def test_should_get_existing_exchanges(mocker: MagicMock) -> None:
     response = mock_response([{'name': 'one'}, {'name': 'two'}])
@@ -13,9 +16,41 @@ def test_should_get_existing_exchanges(mocker: MagicMock) -> None:
     broker = fake_broker()
     exchanges = get_exchanges(broker=broker, vhost='EA')
     assert_that(exchanges).is_equal_to(['one', 'two'])
-    assert_that(is_present(broker=broker, vhost='EA', name='one')).is_true()
     patch.assert_called_with(
-        url='https://fake-broker/api/exchanges/EA', auth=('guest', 'guest'))
+        url='https://fake-broker/api/exchanges/EA', auth=('guest', 'guest'), params=LISTING)
+
+
+def test_should_look_up_single_exchange_when_is_present(mocker: MagicMock) -> None:
+    patch = mocker.patch('requests.get', return_value=mock_response({'name': 'one'}))
+    assert_that(is_present(broker=fake_broker(), vhost='EA', name='one')).is_true()
+    patch.assert_called_with(
+        url='https://fake-broker/api/exchanges/EA/one', auth=('guest', 'guest'), params={'columns': 'name'})
+
+
+def test_should_return_false_when_is_present_but_404(mocker: MagicMock) -> None:
+    patch = mocker.patch('requests.get', return_value=mock_bad_response_with_status(404))
+    assert_that(is_present(broker=fake_broker(), vhost='EA', name='one')).is_false()
+    patch.assert_called_with(
+        url='https://fake-broker/api/exchanges/EA/one', auth=('guest', 'guest'), params={'columns': 'name'})
+
+
+def test_should_raise_exception_when_is_present_but_500(mocker: MagicMock) -> None:
+    mocker.patch('requests.get', return_value=mock_bad_response_with_status(500))
+    try:
+        is_present(broker=fake_broker(), vhost='EA', name='one')
+        fail('it should raise exception')
+    except ServerErrorException as e:
+        assert_that(e.url).is_equal_to('https://fake-broker/api/exchanges/EA/one')
+
+
+def test_should_list_exchanges_as_compact_records(mocker: MagicMock) -> None:
+    response = mock_response([{'name': 'one', 'type': 'topic', 'durable': True, 'auto_delete': False,
+                               'internal': False}])
+    patch = mocker.patch('requests.get', return_value=response)
+    result = list_exchanges(broker=fake_broker(), vhost='EA')
+    assert_that(result).is_equal_to([ExchangeRecord('one', 'topic', True, False, False)])
+    patch.assert_called_with(url='https://fake-broker/api/exchanges/EA', auth=('guest', 'guest'), params={
+        'columns': 'name,type,durable,auto_delete,internal', 'disable_stats': 'true'})
 
 
 def test_should_raise_exception_when_get_exchanges_but_404(mocker: MagicMock) -> None:
@@ -27,7 +62,7 @@ def test_should_raise_exception_when_get_exchanges_but_404(mocker: MagicMock) ->
     except NotFoundException as e:
         assert_that(e.url).is_equal_to('https://fake-broker/api/exchanges/EA')
     patch.assert_called_with(
-        url='https://fake-broker/api/exchanges/EA', auth=('guest', 'guest'))
+        url='https://fake-broker/api/exchanges/EA', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_raise_exception_when_get_exchanges_but_500(mocker: MagicMock) -> None:
@@ -39,7 +74,7 @@ def test_should_raise_exception_when_get_exchanges_but_500(mocker: MagicMock) ->
     except ServerErrorException as e:
         assert_that(e.url).is_equal_to('https://fake-broker/api/exchanges/EA')
     patch.assert_called_with(
-        url='https://fake-broker/api/exchanges/EA', auth=('guest', 'guest'))
+        url='https://fake-broker/api/exchanges/EA', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_raise_exception_when_get_exchanges_but_401(mocker: MagicMock) -> None:
@@ -51,7 +86,7 @@ def test_should_raise_exception_when_get_exchanges_but_401(mocker: MagicMock) ->
     except Unauthorised as e:
         assert_that(e.url).is_equal_to('https://fake-broker/api/exchanges/EA')
     patch.assert_called_with(
-        url='https://fake-broker/api/exchanges/EA', auth=('guest', 'guest'))
+        url='https://fake-broker/api/exchanges/EA', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_raise_exception_when_get_exchanges_but_teapot(mocker: MagicMock) -> None:
@@ -63,7 +98,7 @@ def test_should_raise_exception_when_get_exchanges_but_teapot(mocker: MagicMock)
     except Exception as e:
         assert_that(e.args[0]).is_equal_to(418)
     patch.assert_called_with(
-        url='https://fake-broker/api/exchanges/EA', auth=('guest', 'guest'))
+        url='https://fake-broker/api/exchanges/EA', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_create_exchange(mocker: MagicMock) -> None:
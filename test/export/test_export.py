@@ -0,0 +1,63 @@
+import gzip
+import json
+import os
+from typing import Any
+from unittest.mock import MagicMock
+
+from assertpy import assert_that, fail
+
+from rabbitmqbaselibrary.common.cache import TopologyCache
+from rabbitmqbaselibrary.common.client import BrokerClient
+from rabbitmqbaselibrary.export.export import export_vhosts, read_shard, restore_vhost
+from ..common.fixtures import mock_response, fake_broker
+
+
+def patch_broker(mocker: MagicMock) -> MagicMock:
+    def get(**kwargs: Any) -> Any:
+        if kwargs['url'].endswith('/api/vhosts'):
+            return mock_response([{'name': '/'}, {'name': 'EA'}])
+        return mock_response({'queues': [{'name': kwargs['url'].split('/')[-1]}]})
+
+    return mocker.patch('requests.get', side_effect=get)
+
+
+def test_should_export_one_shard_per_vhost_with_manifest(mocker: MagicMock, tmpdir: str) -> None:
+    patch = patch_broker(mocker)
+    manifest = export_vhosts(broker=fake_broker(), path=str(tmpdir))
+    assert_that(sorted(os.listdir(tmpdir))).is_equal_to(['%2F.json.gz', 'EA.json.gz', 'manifest.json'])
+    assert_that(manifest['vhosts']['/']).contains_entry({'file': '%2F.json.gz'}, {'resources': 1})
+    assert_that([c[1]['url'] for c in patch.call_args_list]).contains('https://fake-broker/api/definitions/%2F')
+    assert_that(read_shard(path=str(tmpdir), vhost='EA')).is_equal_to({'queues': [{'name': 'EA'}]})
+
+
+def test_should_restore_single_vhost_from_its_shard(mocker: MagicMock, tmpdir: str) -> None:
+    patch_broker(mocker)
+    export_vhosts(broker=fake_broker(), path=str(tmpdir), vhosts=['EA'], compression=None)
+    post = mocker.patch('requests.post', return_value=mock_response([]))
+    restore_vhost(broker=fake_broker(), path=str(tmpdir), vhost='EA')
+    post.assert_called_with(url='https://fake-broker/api/definitions/EA', auth=('guest', 'guest'),
+                            json={'queues': [{'name': 'EA'}]})
+
+
+def test_should_refuse_tampered_shard(mocker: MagicMock, tmpdir: str) -> None:
+    patch_broker(mocker)
+    export_vhosts(broker=fake_broker(), path=str(tmpdir), vhosts=['EA'], compression=None)
+    with open(os.path.join(tmpdir, 'EA.json'), 'w') as f:
+        json.dump({'queues': []}, f)
+    try:
+        read_shard(path=str(tmpdir), vhost='EA')
+        fail('it should raise exception')
+    except ValueError as e:
+        assert_that(str(e)).contains('EA.json')
+
+
+def test_should_stream_shards_past_the_cache(mocker: MagicMock, tmpdir: str) -> None:
+    response: Any = mock_response(None)
+    response.iter_content.return_value = [b'{"queues": [{"name": "q-', b'one"}, {"name": "q-two"}]}', b'\n']
+    mocker.patch('requests.Session.request', return_value=response)
+    cache = TopologyCache()
+    manifest = export_vhosts(broker=BrokerClient(fake_broker(), cache=cache), path=str(tmpdir), vhosts=['EA'])
+    assert_that(manifest['vhosts']['EA']['resources']).is_equal_to(2)
+    assert_that(cache).is_length(0)
+    with gzip.open(os.path.join(str(tmpdir), 'EA.json.gz'), 'rb') as f:
+        assert_that(f.read()).is_equal_to(b'{"queues": [{"name": "q-one"}, {"name": "q-two"}]}\n')
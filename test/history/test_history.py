@@ -55,3 +55,11 @@ def test_should_create_record(mocker: MagicMock) -> None:
     with patch('{}.open'.format('rabbitmqbaselibrary.history.history'), m):
         history.save_report(report=report, input_data='test', env='test')
     assert_that(m.call_args_list).is_length(2)
+
+
+def test_should_remember_applied_definitions(tmpdir: str) -> None:
+    history = History(hist_path=str(tmpdir), db_name=os.path.join(tmpdir, 'history.db'))
+    assert_that(history.get_applied_definitions(broker='fake-broker', vhost='EA')).is_none()
+    history.save_applied_definitions(broker='fake-broker', vhost='EA', content_hash='a', fingerprint='1:7:0')
+    history.save_applied_definitions(broker='fake-broker', vhost='EA', content_hash='b', fingerprint='2:7:0')
+    assert_that(history.get_applied_definitions(broker='fake-broker', vhost='EA')).is_equal_to(('b', '2:7:0'))
@@ -0,0 +1,39 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from assertpy import assert_that
+
+from rabbitmqbaselibrary.common.exceptions import CodecNotFound
+from rabbitmqbaselibrary.messages.codecs import CODECS, Codec, codec_for, decode, encode, get_codec, register_codec
+
+
+def test_should_decode_with_the_codec_named_by_the_properties() -> None:
+    assert_that(decode(MagicMock(body=b'{"n": 1}', properties={'content_type': 'application/json'}))) \
+        .is_equal_to({'n': 1})
+    assert_that(decode(MagicMock(body=b'\x00\x01', properties={'content_type': 'application/octet-stream'}))) \
+        .is_equal_to(b'\x00\x01')
+    assert_that(decode(MagicMock(body=b'{"n": 1}', properties={}))).is_equal_to({'n': 1})
+
+
+def test_should_round_trip_json_and_raw() -> None:
+    assert_that(json.loads(encode({'n': 1}))).is_equal_to({'n': 1})
+    assert_that(encode('text', codec='raw')).is_equal_to(b'text')
+    assert_that(get_codec('msgpack').properties()).is_equal_to({'content_type': 'application/msgpack',
+                                                                'content_encoding': 'binary'})
+
+
+def test_should_reject_unknown_codecs() -> None:
+    with pytest.raises(CodecNotFound):
+        get_codec('yaml')
+    with pytest.raises(CodecNotFound):
+        codec_for('text/yaml')
+
+
+def test_should_decode_with_a_registered_codec() -> None:
+    register_codec(Codec(name='upper', content_type='text/plain', content_encoding='utf-8',
+                         encode=lambda body: body.upper(), decode=lambda body: body.decode('utf-8').lower()))
+    try:
+        assert_that(decode(MagicMock(body=b'HI', properties={'content_type': 'text/plain'}))).is_equal_to('hi')
+    finally:
+        del CODECS['upper']
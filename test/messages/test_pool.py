@@ -0,0 +1,111 @@
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from assertpy import assert_that
+
+from rabbitmqbaselibrary.common.exceptions import PoolExhausted
+from rabbitmqbaselibrary.messages.messages import AmqpSenderConsumer, build_conn_string
+from rabbitmqbaselibrary.messages.pool import ChannelPool
+
+CONN_STRING = build_conn_string(host='fake-broker', vhost='EA', name='guest', passwd='guest')
+OTHER_CONN_STRING = build_conn_string(host='fake-broker', vhost='EB', name='guest', passwd='guest')
+
+
+def new_connection(*args: Any) -> MagicMock:
+    connection = MagicMock(closed=False)
+    connection.channel.side_effect = lambda: MagicMock(closed=False)
+    return connection
+
+
+@pytest.fixture
+def connections(mocker: MagicMock) -> MagicMock:
+    return mocker.patch('rabbitpy.Connection', side_effect=new_connection)
+
+
+def test_should_reuse_connection_and_channels_per_conn_string(connections: MagicMock) -> None:
+    with ChannelPool() as pool:
+        with pool.channel(CONN_STRING) as first:
+            pass
+        with pool.channel(CONN_STRING) as second:
+            assert_that(second).is_same_as(first)
+            with pool.channel(CONN_STRING) as third:
+                assert_that(third).is_not_same_as(first)
+        pool.acquire(OTHER_CONN_STRING)
+        assert_that(connections.call_count).is_equal_to(2)
+        assert_that(len(pool)).is_equal_to(2)
+    for call in connections.call_args_list:
+        assert_that(call.args[0]).is_in(CONN_STRING, OTHER_CONN_STRING)
+
+
+def test_should_replace_closed_channels_and_connections(connections: MagicMock) -> None:
+    pool = ChannelPool()
+    channel = pool.acquire(CONN_STRING)
+    pool.release(channel)
+    channel.closed = True
+    replacement = pool.acquire(CONN_STRING)
+    assert_that(replacement).is_not_same_as(channel)
+    pool.release(replacement)
+    pool.connection(CONN_STRING).closed = True
+    pool.acquire(CONN_STRING)
+    assert_that(connections.call_count).is_equal_to(2)
+
+
+def test_should_raise_when_no_channel_is_free(connections: MagicMock) -> None:
+    pool = ChannelPool(max_connections=1, max_channels=1, timeout=0.05)
+    pool.acquire(CONN_STRING)
+    with pytest.raises(PoolExhausted):
+        pool.acquire(CONN_STRING)
+    with pytest.raises(PoolExhausted):
+        pool.acquire(OTHER_CONN_STRING)
+
+
+def test_should_close_least_recently_used_connection_to_make_room(connections: MagicMock) -> None:
+    pool = ChannelPool(max_connections=1)
+    pool.release(pool.acquire(CONN_STRING))
+    first = pool.connection(CONN_STRING)
+    pool.acquire(OTHER_CONN_STRING)
+    first.close.assert_called_once()
+    assert_that(len(pool)).is_equal_to(1)
+
+
+def test_should_evict_idle_channels_and_connections(connections: MagicMock) -> None:
+    pool = ChannelPool(idle_timeout=0)
+    channel = pool.acquire(CONN_STRING)
+    connection = pool.connection(CONN_STRING)
+    assert_that(pool.evict_idle()).is_equal_to(0)
+    pool.release(channel)
+    assert_that(pool.evict_idle()).is_equal_to(2)
+    channel.close.assert_called_once()
+    connection.close.assert_called_once()
+    assert_that(len(pool)).is_equal_to(0)
+
+
+def test_should_close_pool_and_refuse_new_channels(connections: MagicMock) -> None:
+    pool = ChannelPool()
+    channel = pool.acquire(CONN_STRING)
+    connection = pool.connection(CONN_STRING)
+    pool.close()
+    connection.close.assert_called_once()
+    pool.release(channel)
+    with pytest.raises(ValueError):
+        pool.acquire(CONN_STRING)
+
+
+def test_should_share_pooled_connection_between_senders(connections: MagicMock, mocker: MagicMock) -> None:
+    mocker.patch('rabbitpy.AMQP')
+    with ChannelPool() as pool:
+        with AmqpSenderConsumer(CONN_STRING, pool=pool):
+            pass
+        with AmqpSenderConsumer(CONN_STRING, pool=pool):
+            pass
+        assert_that(connections.call_count).is_equal_to(1)
+        pool.connection(CONN_STRING).close.assert_not_called()
+
+
+def test_should_close_own_connection(mocker: MagicMock) -> None:
+    connection = mocker.patch('rabbitpy.Connection').return_value
+    mocker.patch('rabbitpy.AMQP')
+    with AmqpSenderConsumer(CONN_STRING):
+        pass
+    connection.close.assert_called_once()
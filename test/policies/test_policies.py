@@ -3,7 +3,7 @@ from unittest.mock import MagicMock
 from assertpy import assert_that, fail
 
 from rabbitmqbaselibrary.common.exceptions import NotFoundException, ServerErrorException, BadRequest, Unauthorised
-from rabbitmqbaselibrary.policies.policies import get_policies, create_policy, delete_policy
+from rabbitmqbaselibrary.policies.policies import get_policies, create_policy, delete_policy, is_present
 from ..common.fixtures import mock_response, fake_broker, mock_bad_response_with_status
 
 
@@ -16,6 +16,18 @@ def test_should_provide_trivial_policies_when_get_policies(mocker: MagicMock) ->
     assert_that(result).is_length(2).contains_only('one', 'two')
 
 
+def test_should_look_up_single_policy_when_is_present(mocker: MagicMock) -> None:
+    patch = mocker.patch('requests.get', return_value=mock_response({'name': 'one'}))
+    assert_that(is_present(broker=fake_broker(), vhost='EA', name='one')).is_true()
+    patch.assert_called_with(
+        url='https://fake-broker/api/policies/EA/one', auth=('guest', 'guest'), params={'columns': 'name'})
+
+
+def test_should_return_false_when_is_present_but_404(mocker: MagicMock) -> None:
+    mocker.patch('requests.get', return_value=mock_bad_response_with_status(404))
+    assert_that(is_present(broker=fake_broker(), vhost='EA', name='one')).is_false()
+
+
 def test_should_raise_exception_when_get_policies_but_unknown_vhost(mocker: MagicMock) -> None:
     response = mock_bad_response_with_status(404)
     mocker.patch('requests.get', return_value=response)
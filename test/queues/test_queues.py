@@ -3,9 +3,12 @@ from unittest.mock import MagicMock
 from assertpy import assert_that, fail
 
 from rabbitmqbaselibrary.common.exceptions import NotFoundException, Unauthorised, ServerErrorException, BadRequest
-from rabbitmqbaselibrary.queues.queues import get_queues, is_present, create_queue, delete_queue
+from rabbitmqbaselibrary.queues.queues import get_queues, is_present, create_queue, delete_queue, list_queues, \
+    QueueRecord
 from ..common.fixtures import mock_response, mock_bad_response_with_status, fake_broker
 
+LISTING = {'columns': 'name', 'disable_stats': 'true'}
+
 
 def test_should_get_existing_queues(mocker: MagicMock) -> None:
     response = mock_response([{'name': 'one'}, {'name': 'two'}])
@@ -13,9 +16,43 @@ def test_should_get_existing_queues(mocker: MagicMock) -> None:
     broker = fake_broker()
     exchanges = get_queues(broker=broker, vhost='EA')
     assert_that(exchanges).is_equal_to(['one', 'two'])
-    assert_that(is_present(broker=broker, vhost='EA', name='one')).is_true()
     patch.assert_called_with(
-        url='https://fake-broker/api/queues/EA', auth=('guest', 'guest'))
+        url='https://fake-broker/api/queues/EA', auth=('guest', 'guest'), params=LISTING)
+
+
+def test_should_look_up_single_queue_when_is_present(mocker: MagicMock) -> None:
+    patch = mocker.patch('requests.get', return_value=mock_response({'name': 'one'}))
+    assert_that(is_present(broker=fake_broker(), vhost='EA', name='one')).is_true()
+    patch.assert_called_with(
+        url='https://fake-broker/api/queues/EA/one', auth=('guest', 'guest'), params={'columns': 'name'})
+
+
+def test_should_return_false_when_is_present_but_404(mocker: MagicMock) -> None:
+    patch = mocker.patch('requests.get', return_value=mock_bad_response_with_status(404))
+    assert_that(is_present(broker=fake_broker(), vhost='EA', name='one')).is_false()
+    patch.assert_called_with(
+        url='https://fake-broker/api/queues/EA/one', auth=('guest', 'guest'), params={'columns': 'name'})
+
+
+def test_should_raise_exception_when_is_present_but_500(mocker: MagicMock) -> None:
+    mocker.patch('requests.get', return_value=mock_bad_response_with_status(500))
+    try:
+        is_present(broker=fake_broker(), vhost='EA', name='one')
+        fail('it should raise exception')
+    except ServerErrorException as e:
+        assert_that(e.url).is_equal_to('https://fake-broker/api/queues/EA/one')
+
+
+def test_should_list_queues_as_compact_records(mocker: MagicMock) -> None:
+    response = mock_response([{'name': 'one', 'durable': True, 'auto_delete': False, 'type': 'classic',
+                               'messages': 3, 'messages_ready': 2, 'messages_unacknowledged': 1}])
+    patch = mocker.patch('requests.get', return_value=response)
+    result = list_queues(broker=fake_broker(), vhost='EA')
+    assert_that(result).is_equal_to([QueueRecord('one', True, False, 'classic', 3, 2, 1)])
+    assert_that(result[0].messages_ready).is_equal_to(2)
+    patch.assert_called_with(url='https://fake-broker/api/queues/EA', auth=('guest', 'guest'), params={
+        'columns': 'name,durable,auto_delete,type,messages,messages_ready,messages_unacknowledged',
+        'disable_stats': 'true', 'enable_queue_totals': 'true'})
 
 
 def test_should_raise_exception_when_get_queues_but_404(mocker: MagicMock) -> None:
@@ -27,7 +64,7 @@ def test_should_raise_exception_when_get_queues_but_404(mocker: MagicMock) -> No
     except NotFoundException as e:
         assert_that(e.url).is_equal_to('https://fake-broker/api/queues/EA')
     patch.assert_called_with(
-        url='https://fake-broker/api/queues/EA', auth=('guest', 'guest'))
+        url='https://fake-broker/api/queues/EA', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_raise_exception_when_get_queues_but_401(mocker: MagicMock) -> None:
@@ -39,7 +76,7 @@ def test_should_raise_exception_when_get_queues_but_401(mocker: MagicMock) -> No
     except Unauthorised as e:
         assert_that(e.url).is_equal_to('https://fake-broker/api/queues/EA')
     patch.assert_called_with(
-        url='https://fake-broker/api/queues/EA', auth=('guest', 'guest'))
+        url='https://fake-broker/api/queues/EA', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_raise_exception_when_get_queues_but_500(mocker: MagicMock) -> None:
@@ -51,7 +88,7 @@ def test_should_raise_exception_when_get_queues_but_500(mocker: MagicMock) -> No
     except ServerErrorException as e:
         assert_that(e.url).is_equal_to('https://fake-broker/api/queues/EA')
     patch.assert_called_with(
-        url='https://fake-broker/api/queues/EA', auth=('guest', 'guest'))
+        url='https://fake-broker/api/queues/EA', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_raise_exception_when_get_queues_but_teapot(mocker: MagicMock) -> None:
@@ -63,7 +100,7 @@ def test_should_raise_exception_when_get_queues_but_teapot(mocker: MagicMock) ->
     except Exception as e:
         assert_that(e.args[0]).is_equal_to(418)
     patch.assert_called_with(
-        url='https://fake-broker/api/queues/EA', auth=('guest', 'guest'))
+        url='https://fake-broker/api/queues/EA', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_create_queue(mocker: MagicMock) -> None:
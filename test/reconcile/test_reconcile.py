@@ -0,0 +1,117 @@
+import copy
+import os
+from typing import Any, Callable, List, Tuple
+from unittest.mock import MagicMock
+
+from assertpy import assert_that
+
+from rabbitmqbaselibrary.history.history import History
+from rabbitmqbaselibrary.reconcile.reconcile import diff, reconcile, sync
+from ..common.fixtures import mock_response, fake_broker
+
+
+def current() -> dict:
+    return {
+        'exchanges': [{'name': 'ex-one', 'vhost': 'EA', 'type': 'topic', 'durable': True, 'auto_delete': False,
+                       'internal': False, 'arguments': {}}],
+        'queues': [{'name': 'q-one', 'vhost': 'EA', 'durable': True, 'auto_delete': False,
+                    'arguments': {'x-queue-type': 'classic'}}],
+        'bindings': [{'source': 'ex-one', 'vhost': 'EA', 'destination': 'q-one', 'destination_type': 'queue',
+                      'routing_key': '#', 'arguments': {}}],
+        'policies': [{'name': 'ttl', 'vhost': 'EA', 'pattern': '.*', 'apply-to': 'queues',
+                      'definition': {'message-ttl': 1000}, 'priority': 0}],
+    }
+
+
+def recorder(calls: List[Tuple[str, str]], method: str, payload: Any = None) -> Callable[..., Any]:
+    def record(**kwargs: Any) -> Any:
+        calls.append((method, kwargs['url']))
+        return mock_response(payload if payload is not None else {})
+    return record
+
+
+def patch_http(mocker: MagicMock, calls: List[Tuple[str, str]], bindings: Any = None) -> None:
+    def get(**kwargs: Any) -> Any:
+        calls.append(('GET', kwargs['url']))
+        return mock_response(bindings if '/api/bindings/' in kwargs['url'] else current())
+
+    mocker.patch('requests.get', side_effect=get)
+    for method in ['put', 'post', 'delete']:
+        mocker.patch('requests.{}'.format(method), side_effect=recorder(calls, method.upper()))
+
+
+def test_should_only_fetch_definitions_when_nothing_changed(mocker: MagicMock) -> None:
+    calls: List[Tuple[str, str]] = []
+    patch_http(mocker, calls)
+    desired = current()
+    for kind in desired.values():
+        for item in kind:
+            del item['vhost']
+    plan = reconcile(broker=fake_broker(), vhost='EA', desired=desired, prune=True)
+    assert_that(plan.is_empty()).is_true()
+    assert_that(calls).is_equal_to([('GET', 'https://fake-broker/api/definitions/EA')])
+
+
+def test_should_create_missing_and_update_changed_policies(mocker: MagicMock) -> None:
+    calls: List[Tuple[str, str]] = []
+    patch_http(mocker, calls)
+    desired = current()
+    desired['queues'].append({'name': 'q-two', 'durable': True})
+    desired['bindings'].append({'source': 'ex-one', 'destination': 'q-two', 'destination_type': 'queue',
+                                'routing_key': 'two', 'arguments': {}})
+    desired['policies'][0]['definition'] = {'message-ttl': 2000}
+    plan = reconcile(broker=fake_broker(), vhost='EA', desired=desired)
+    assert_that(plan.summary()).is_equal_to({'create queues': 1, 'create bindings': 1, 'update policies': 1})
+    assert_that(calls[1:]).is_equal_to([('PUT', 'https://fake-broker/api/queues/EA/q-two'),
+                                        ('POST', 'https://fake-broker/api/bindings/EA/e/ex-one/q/q-two'),
+                                        ('PUT', 'https://fake-broker/api/policies/EA/ttl')])
+
+
+def test_should_prune_only_when_asked(mocker: MagicMock) -> None:
+    calls: List[Tuple[str, str]] = []
+    patch_http(mocker, calls, bindings=[dict(current()['bindings'][0], properties_key='%23')])
+    desired = {'exchanges': current()['exchanges'], 'queues': current()['queues']}
+    assert_that(diff(desired=desired, current=current())).is_length(0)
+    plan = reconcile(broker=fake_broker(), vhost='EA', desired=desired, prune=True)
+    assert_that(plan.summary()).is_equal_to({'delete policies': 1, 'delete bindings': 1})
+    assert_that(calls[2:]).is_equal_to([('DELETE', 'https://fake-broker/api/policies/EA/ttl'),
+                                        ('DELETE', 'https://fake-broker/api/bindings/EA/e/ex-one/q/q-one/%23')])
+
+
+def test_should_report_conflicts_unless_recreating() -> None:
+    desired = copy.deepcopy(current())
+    desired['queues'][0]['arguments'] = {'x-queue-type': 'quorum'}
+    plan = diff(desired=desired, current=current())
+    assert_that(plan).is_length(0)
+    assert_that([c.name for c in plan.conflicts]).is_equal_to(['q-one'])
+    plan = diff(desired=desired, current=current(), recreate=True)
+    assert_that([(c.action, c.name) for c in plan]).is_equal_to([('recreate', 'q-one'), ('create', 'ex-one->q-one')])
+
+
+def test_should_sync_from_stored_snapshot_while_fingerprint_matches(mocker: MagicMock, tmpdir: str) -> None:
+    calls: List[Tuple[str, str]] = []
+    totals = {'queues': 1, 'exchanges': 8}
+
+    def get(**kwargs: Any) -> Any:
+        calls.append(('GET', kwargs['url']))
+        resource = kwargs['url'].split('/')[4]
+        if resource == 'definitions':
+            return mock_response(current())
+        return mock_response([{'name': 'ttl'}] if resource == 'policies' else {'total_count': totals[resource]})
+
+    mocker.patch('requests.get', side_effect=get)
+    for method in ['put', 'post', 'delete']:
+        mocker.patch('requests.{}'.format(method), side_effect=recorder(calls, method.upper()))
+    history = History(hist_path=str(tmpdir), db_name=os.path.join(tmpdir, 'history.db'))
+    desired = current()
+    assert_that(sync(broker=fake_broker(), vhost='EA', desired=desired, history=history)).is_length(0)
+    assert_that(calls).contains(('GET', 'https://fake-broker/api/definitions/EA'))
+    del calls[:]
+    desired['policies'][0]['priority'] = 5
+    assert_that(sync(broker=fake_broker(), vhost='EA', desired=desired, history=history)).is_length(1)
+    assert_that([c for c in calls if c[0] != 'GET']).is_equal_to([('PUT', 'https://fake-broker/api/policies/EA/ttl')])
+    assert_that(calls).does_not_contain(('GET', 'https://fake-broker/api/definitions/EA'))
+    del calls[:]
+    totals['queues'] = 2
+    assert_that(sync(broker=fake_broker(), vhost='EA', desired=desired, history=history)).is_length(1)
+    assert_that(calls).contains(('GET', 'https://fake-broker/api/definitions/EA'))
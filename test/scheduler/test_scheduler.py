@@ -0,0 +1,92 @@
+import threading
+import time
+from typing import Any, Callable, List
+from unittest.mock import MagicMock
+
+from assertpy import assert_that, fail
+
+from rabbitmqbaselibrary.bindings.bindings import Binding
+from rabbitmqbaselibrary.scheduler.scheduler import ProvisioningPlan, SkippedStep
+from ..common.fixtures import mock_response, mock_bad_response_with_status, fake_broker
+
+
+def recorder(calls: List[str], delay: float = 0.0) -> Callable[..., Any]:
+    def record(**kwargs: Any) -> Any:
+        time.sleep(delay)
+        calls.append(kwargs['url'])
+        return mock_response({})
+    return record
+
+
+def binding() -> Binding:
+    return Binding({'source': 'ex-one', 'destination': 'q-one', 'destination_type': 'queue', 'routing_key': '#',
+                    'arguments': {}})
+
+
+def test_should_run_bindings_after_their_exchange_and_queue(mocker: MagicMock) -> None:
+    calls: List[str] = []
+    mocker.patch('requests.put', side_effect=recorder(calls, delay=0.02))
+    mocker.patch('requests.post', side_effect=recorder(calls))
+    plan = ProvisioningPlan(fake_broker())
+    plan.binding('EA', binding())
+    plan.queue('EA', 'q-one', {'durable': True})
+    plan.exchange('EA', 'ex-one', {'type': 'topic'})
+    report = plan.run(max_workers=4)
+    assert_that(report.ok).is_true()
+    assert_that(calls[-1]).is_equal_to('https://fake-broker/api/bindings/EA/e/ex-one/q/q-one')
+    assert_that(report.critical_path()).is_length(2)
+    assert_that(report.critical_path()[-1]).starts_with('binding:EA/ex-one')
+
+
+def test_should_run_independent_steps_in_parallel() -> None:
+    barrier = threading.Barrier(3, timeout=2)
+    plan = ProvisioningPlan(fake_broker())
+    for name in ['a', 'b', 'c']:
+        plan.add(name, barrier.wait)
+    report = plan.run(max_workers=3)
+    assert_that(report.ok).is_true()
+    assert_that(report.elapsed).is_less_than(2)
+
+
+def test_should_skip_dependents_of_failed_step(mocker: MagicMock) -> None:
+    mocker.patch('requests.get', return_value=mock_bad_response_with_status(404))
+    mocker.patch('requests.put', return_value=mock_bad_response_with_status(500))
+    post = mocker.patch('requests.post')
+    plan = ProvisioningPlan(fake_broker())
+    plan.vhost('EA')
+    plan.queue('EA', 'q-one', {})
+    plan.exchange('EA', 'ex-one', {})
+    plan.binding('EA', binding())
+    report = plan.run()
+    assert_that(report.failed()).is_length(4)
+    skipped = [r.error for r in report.failed() if isinstance(r.error, SkippedStep)]
+    assert_that([e.failed for e in skipped]).is_equal_to(['vhost:EA'] * 3)
+    post.assert_not_called()
+
+
+def test_should_reject_cycles_and_duplicates() -> None:
+    plan = ProvisioningPlan(fake_broker())
+    plan.add('a', lambda: None, depends=['b'])
+    plan.add('b', lambda: None, depends=['a'])
+    try:
+        plan.add('a', lambda: None)
+        fail('it should raise exception')
+    except ValueError as e:
+        assert_that(str(e)).contains('already in plan')
+    try:
+        plan.run()
+        fail('it should raise exception')
+    except ValueError as e:
+        assert_that(str(e)).contains('cycle')
+
+
+def test_should_keep_step_results_and_bindings_differing_by_arguments() -> None:
+    plan = ProvisioningPlan(fake_broker())
+    plan.add('user:one', lambda: 'generated-password')
+    assert_that(plan.run().results['user:one'].result).is_equal_to('generated-password')
+    plan = ProvisioningPlan(fake_broker())
+    headers = [Binding({'source': 'ex-one', 'destination': 'q-one', 'destination_type': 'queue', 'routing_key': '',
+                        'arguments': {'x-match': 'all', 'kind': kind}}) for kind in ['a', 'b']]
+    step_ids = [plan.binding('EA', b) for b in headers]
+    assert_that(step_ids[0]).is_not_equal_to(step_ids[1])
+    assert_that(plan.binding('EA', binding())).ends_with('/#')
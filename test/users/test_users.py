@@ -5,16 +5,27 @@ from assertpy import assert_that, fail
 from rabbitmqbaselibrary.common.exceptions import Unauthorised, ServerErrorException, NotFoundException, \
     NotValidPermissions, BadRequest, UserAlreadyExists
 from rabbitmqbaselibrary.users.users import get_users, create_user, AUTOGENERATED, delete_user, add_permissions, \
-    delete_permissions, get_permissions, is_present, safe_create_user
+    delete_permissions, get_permissions, is_present, safe_create_user, list_users, UserRecord
 from ..common.fixtures import mock_response, mock_bad_response_with_status, fake_broker
 
+LISTING = {'columns': 'name'}
+
 
 def test_should_get_existing_users(mocker: MagicMock) -> None:
     response = mock_response([{'name': 'one-s'}, {'name': 'one-d'}])
     patch = mocker.patch('requests.get', return_value=response)
     result = get_users(broker=fake_broker())
     assert_that(result).is_equal_to(['one-s', 'one-d'])
-    patch.assert_called_with(url='https://fake-broker/api/users', auth=('guest', 'guest'))
+    patch.assert_called_with(url='https://fake-broker/api/users', auth=('guest', 'guest'), params=LISTING)
+
+
+def test_should_list_users_as_compact_records(mocker: MagicMock) -> None:
+    response = mock_response([{'name': 'one-s', 'tags': 'administrator'}])
+    patch = mocker.patch('requests.get', return_value=response)
+    result = list_users(broker=fake_broker())
+    assert_that(result).is_equal_to([UserRecord('one-s', 'administrator')])
+    patch.assert_called_with(url='https://fake-broker/api/users', auth=('guest', 'guest'),
+                             params={'columns': 'name,tags'})
 
 
 def test_should_raise_exception_when_get_users_but_401(mocker: MagicMock) -> None:
@@ -24,7 +35,7 @@ def test_should_raise_exception_when_get_users_but_401(mocker: MagicMock) -> Non
         get_users(broker=fake_broker())
     except Unauthorised as e:
         assert_that(e.url).is_equal_to('https://fake-broker/api/users')
-    patch.assert_called_with(url='https://fake-broker/api/users', auth=('guest', 'guest'))
+    patch.assert_called_with(url='https://fake-broker/api/users', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_raise_exception_when_get_users_but_500(mocker: MagicMock) -> None:
@@ -34,7 +45,7 @@ def test_should_raise_exception_when_get_users_but_500(mocker: MagicMock) -> Non
         get_users(broker=fake_broker())
     except ServerErrorException as e:
         assert_that(e.url).is_equal_to('https://fake-broker/api/users')
-    patch.assert_called_with(url='https://fake-broker/api/users', auth=('guest', 'guest'))
+    patch.assert_called_with(url='https://fake-broker/api/users', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_raise_exception_when_get_users_but_teapot(mocker: MagicMock) -> None:
@@ -44,7 +55,7 @@ def test_should_raise_exception_when_get_users_but_teapot(mocker: MagicMock) ->
         get_users(broker=fake_broker())
     except Exception as e:
         assert_that(e.args[0]).is_equal_to(418)
-    patch.assert_called_with(url='https://fake-broker/api/users', auth=('guest', 'guest'))
+    patch.assert_called_with(url='https://fake-broker/api/users', auth=('guest', 'guest'), params=LISTING)
 
 
 def test_should_create_user(mocker: MagicMock) -> None:
@@ -28,14 +28,16 @@ def test_should_raise_exception_when_get_vhost_but_500(mocker: MagicMock) -> Non
 
 
 def test_is_present_positive(mocker: MagicMock) -> None:
-    response = mock_response([{'name': 'test'}, {'name': 'test1'}])
-    mocker.patch('requests.get', return_value=response)
+    response = mock_response({'name': 'test1'})
+    patch = mocker.patch('requests.get', return_value=response)
     a = is_present(fake_broker(), vhost='test1')
     assert_that(a).is_true()
+    patch.assert_called_with(url='https://fake-broker/api/vhosts/test1', auth=('guest', 'guest'),
+                             params={'columns': 'name'})
 
 
 def test_is_present_negative(mocker: MagicMock) -> None:
-    response = mock_response([{'name': 'test1'}, {'name': 'test2'}])
+    response = mock_bad_response_with_status(404)
     mocker.patch('requests.get', return_value=response)
     a = is_present(fake_broker(), vhost='test')
     assert_that(a).is_false()
@@ -52,7 +54,7 @@ def test_should_raise_exception_when_create_vhost_but_already_exists(mocker: Mag
 
 
 def test_should_create_vhost(mocker: MagicMock) -> None:
-    response_get = mock_response([{'name': 'test1'}])
+    response_get = mock_bad_response_with_status(404)
     response_put = mock_response({})
     mocker.patch('requests.get', return_value=response_get)
     patch = mocker.patch('requests.put', return_value=response_put)
@@ -64,7 +66,7 @@ def test_should_create_vhost(mocker: MagicMock) -> None:
 
 
 def test_should_raise_exception_when_create_vhost_but_401(mocker: MagicMock) -> None:
-    response_get = mock_response([{'name': 'test2'}])
+    response_get = mock_bad_response_with_status(404)
     response_put = mock_bad_response_with_status(401)
     mocker.patch('requests.get', return_value=response_get)
     mocker.patch('requests.put', return_value=response_put)
@@ -76,7 +78,7 @@ def test_should_raise_exception_when_create_vhost_but_401(mocker: MagicMock) ->
 
 
 def test_should_raise_exception_when_create_vhost_but_500(mocker: MagicMock) -> None:
-    response_get = mock_response([{'name': 'test1'}])
+    response_get = mock_bad_response_with_status(404)
     response_put = mock_bad_response_with_status(500)
     mocker.patch('requests.get', return_value=response_get)
     patch = mocker.patch('requests.put', return_value=response_put)
@@ -101,7 +103,7 @@ def test_should_delete_vhost(mocker: MagicMock) -> None:
 
 
 def test_should_raise_exception_when_delete_vhost_but_it_doesnt_exist(mocker: MagicMock) -> None:
-    response_get = mock_response([{'name': 'test'}])
+    response_get = mock_bad_response_with_status(404)
     response_delete = mock_response({})
     mocker.patch('requests.get', return_value=response_get)
     patch = mocker.patch('requests.delete', return_value=response_delete)